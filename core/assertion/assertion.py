@@ -1,6 +1,8 @@
 from core.http.response import response_handler
 from utils.jsonpath import jsonpath
+from utils.xpath import iter_xpath
 from requests import Response
+from xml.etree import ElementTree as ETree
 import re
 from utils.logger import logger
 
@@ -28,13 +30,14 @@ def assert_body_value(response: Response, exp: str, expected_value: str) -> None
     """
     断言响应体中的值是否符合预期。
 
-    支持两种模式：
+    支持三种模式：
     1. 字符串响应：使用正则表达式匹配
     2. JSON响应：使用JSONPath表达式提取值
+    3. XML响应：使用XPath表达式提取节点文本或属性
 
     Args:
         response: HTTP响应对象
-        exp: 正则表达式或JSONPath表达式
+        exp: 正则表达式、JSONPath表达式或XPath表达式
         expected_value: 期望的值
 
     Returns:
@@ -62,6 +65,14 @@ def assert_body_value(response: Response, exp: str, expected_value: str) -> None
         assert actual_value == expected_value, f"提取值 '{actual_value}' 不等于期望值 '{expected_value}'"
         logger.info(f"JSON响应断言成功: 提取值={actual_value}")
     
+    elif isinstance(value, ETree.Element):
+        # XML响应，使用XPath提取值，找到第一个匹配节点即停止
+        logger.debug("响应为XML类型，使用XPath提取值")
+        actual_value = next(iter_xpath(value, exp), None)
+        assert actual_value is not None, f"XPath '{exp}' 未找到任何匹配的值"
+        assert actual_value == str(expected_value), f"节点值 '{actual_value}' 不等于期望值 '{expected_value}'"
+        logger.info(f"XML响应断言成功: 节点值={actual_value}")
+    
     else:
         error_msg = f"不支持的响应类型: {type(value)}"
         logger.error(error_msg)
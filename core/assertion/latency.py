@@ -0,0 +1,203 @@
+import math
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from data.providers.yaml_reader import write_yaml, yaml_reader
+from utils import config_reader
+from utils.logger import logger
+from utils.path import PROJECT_ROOT
+
+
+def percentile(samples: List[float], p: float) -> float:
+    """
+    计算百分位数（线性插值）
+
+    Args:
+        samples: 样本列表，不要求有序
+        p: 百分位，取值范围 0-100
+
+    Returns:
+        float: 百分位数
+
+    Raises:
+        ValueError: 样本为空时
+    """
+    if not samples:
+        raise ValueError("样本为空，无法计算百分位数")
+    ordered = sorted(samples)
+    rank = (len(ordered) - 1) * p / 100
+    low = math.floor(rank)
+    high = math.ceil(rank)
+    if low == high:
+        return ordered[low]
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+@dataclass(frozen=True)
+class LatencyStats:
+    """单个用例的耗时统计（秒）"""
+
+    count: int
+    p50: float
+    p95: float
+    max: float
+    mean: float
+
+    @classmethod
+    def from_samples(cls, samples: List[float]) -> "LatencyStats":
+        return cls(
+            count=len(samples),
+            p50=percentile(samples, 50),
+            p95=percentile(samples, 95),
+            max=max(samples),
+            mean=sum(samples) / len(samples),
+        )
+
+
+class LatencyRecorder:
+    """按用例ID记录每次执行的耗时"""
+
+    def __init__(self):
+        self._samples: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, case_id: str, seconds: float) -> None:
+        """记录一次执行耗时"""
+        with self._lock:
+            self._samples.setdefault(case_id, []).append(seconds)
+
+    def stats(self, case_id: str) -> Optional[LatencyStats]:
+        """获取用例耗时统计，没有样本时返回None"""
+        samples = self._samples.get(case_id)
+        if not samples:
+            return None
+        return LatencyStats.from_samples(samples)
+
+    def all_stats(self) -> Dict[str, LatencyStats]:
+        """获取全部用例的耗时统计"""
+        return {case_id: LatencyStats.from_samples(samples) for case_id, samples in self._samples.items() if samples}
+
+    def pop(self, case_id: str) -> List[float]:
+        """取出并移除用例的全部样本"""
+        with self._lock:
+            return self._samples.pop(case_id, [])
+
+    def extend(self, case_id: str, samples: List[float]) -> None:
+        """合并其他节点记录的样本"""
+        if not samples:
+            return
+        with self._lock:
+            self._samples.setdefault(case_id, []).extend(samples)
+
+    def clear(self) -> None:
+        """清空全部样本"""
+        with self._lock:
+            self._samples.clear()
+
+
+def assert_latency(case_id: str, stats: LatencyStats, thresholds: Optional[Dict[str, float]]) -> None:
+    """
+    断言用例耗时满足SLO阈值
+
+    Args:
+        case_id: 用例ID
+        stats: 用例耗时统计
+        thresholds: 阈值配置，如 {"p50": 0.2, "p95": 0.5}，单位秒
+
+    Returns:
+        None: 如果断言失败会抛出AssertionError
+    """
+    if not thresholds:
+        return
+    failures = []
+    for metric, limit in thresholds.items():
+        actual = getattr(stats, metric, None)
+        if actual is None:
+            raise ValueError(f"不支持的耗时指标: {metric}")
+        if actual > float(limit):
+            failures.append(f"{metric}={actual:.3f}秒 超过阈值 {float(limit):.3f}秒")
+    if failures:
+        raise AssertionError(f"用例 {case_id} 耗时SLO断言失败（{stats.count} 次执行）: " + "; ".join(failures))
+    logger.info(f"用例 {case_id} 耗时SLO断言成功: p50={stats.p50:.3f}秒, p95={stats.p95:.3f}秒")
+
+
+class LatencyBaseline:
+    """历史耗时基线
+
+    基线文件为YAML格式，以用例ID为键保存历史的耗时统计。
+    比较时当前指标超过 基线 * (1 + regression_margin) 且绝对增量超过 min_delta 视为性能回退。
+    """
+
+    def __init__(
+        self,
+        file_path: str | Path,
+        regression_margin: float = 0.2,
+        min_delta: float = 0.05,
+        metric: str = "p95",
+    ):
+        self.file_path = Path(file_path)
+        self.regression_margin = regression_margin
+        self.min_delta = min_delta
+        self.metric = metric
+        self._baseline: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        if self.file_path.exists():
+            self._baseline = yaml_reader(str(self.file_path)) or {}
+            logger.info(f"加载耗时基线: {self.file_path}，共 {len(self._baseline)} 个用例")
+        else:
+            logger.warning(f"耗时基线文件不存在，将不进行回退比较: {self.file_path}")
+
+    @classmethod
+    def from_config(cls) -> Optional["LatencyBaseline"]:
+        """根据配置文件中的 Latency 配置创建基线，未配置基线文件时返回None"""
+        config = config_reader.get_latency_config()
+        file_path = config.get("baseline_file")
+        if not file_path:
+            return None
+        file_path = Path(file_path)
+        if not file_path.is_absolute():
+            file_path = PROJECT_ROOT / file_path
+        return cls(
+            file_path,
+            regression_margin=float(config.get("regression_margin", 0.2)),
+            min_delta=float(config.get("min_delta", 0.05)),
+            metric=config.get("metric", "p95"),
+        )
+
+    def get(self, case_id: str) -> Optional[Dict[str, Any]]:
+        """获取用例的基线数据"""
+        return self._baseline.get(case_id)
+
+    def check_regression(self, case_id: str, stats: LatencyStats) -> None:
+        """
+        与基线比较，耗时回退超过允许范围时抛出AssertionError
+
+        Args:
+            case_id: 用例ID
+            stats: 本次运行的耗时统计
+        """
+        baseline = self.get(case_id)
+        if not baseline or baseline.get(self.metric) is None:
+            logger.debug(f"用例 {case_id} 没有耗时基线，跳过回退比较")
+            return
+        expected = float(baseline[self.metric])
+        actual = getattr(stats, self.metric)
+        limit = expected * (1 + self.regression_margin)
+        if actual > limit and actual - expected > self.min_delta:
+            raise AssertionError(
+                f"用例 {case_id} 耗时回退: {self.metric}={actual:.3f}秒，"
+                f"基线={expected:.3f}秒，允许上限={limit:.3f}秒"
+            )
+        logger.debug(f"用例 {case_id} 耗时未回退: {self.metric}={actual:.3f}秒，基线={expected:.3f}秒")
+
+    def update(self, all_stats: Dict[str, LatencyStats]) -> None:
+        """使用本次运行的统计更新基线"""
+        with self._lock:
+            for case_id, stats in all_stats.items():
+                self._baseline[case_id] = {key: round(value, 6) for key, value in asdict(stats).items()}
+
+    def save(self) -> bool:
+        """将基线写回文件"""
+        self.file_path.parent.mkdir(parents=True, exist_ok=True)
+        return write_yaml(str(self.file_path), self._baseline)
@@ -0,0 +1,134 @@
+"""
+断言运算符模块
+提供断言计划使用的比较运算符，每个运算符接收实际值和期望值并返回布尔结果
+"""
+
+from typing import Any, Callable, Dict, Tuple
+
+
+Operator = Callable[[Any, Any], bool]
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+# type运算符支持的类型名称
+TYPE_NAMES: Dict[str, Tuple[type, ...]] = {
+    "str": (str,),
+    "string": (str,),
+    "int": (int,),
+    "integer": (int,),
+    "float": (float,),
+    "number": (int, float),
+    "bool": (bool,),
+    "boolean": (bool,),
+    "list": (list,),
+    "array": (list,),
+    "dict": (dict,),
+    "object": (dict,),
+    "null": (type(None),),
+    "none": (type(None),),
+}
+
+
+def _compare(actual: Any, expected: Any, compare: Callable[[Any, Any], bool]) -> bool:
+    """执行比较，类型不兼容时视为断言失败而不是抛出TypeError"""
+    try:
+        return compare(actual, expected)
+    except TypeError:
+        return False
+
+
+def op_type(actual: Any, expected: str) -> bool:
+    """实际值的类型是否为期望的类型名称"""
+    types = TYPE_NAMES[expected.lower()]
+    if isinstance(actual, bool) and bool not in types:
+        return False
+    return isinstance(actual, types)
+
+
+def op_between(actual: Any, expected: Any) -> bool:
+    """实际值是否位于闭区间 [min, max] 内，端点为None表示不限制"""
+    low, high = expected
+    if not _is_number(actual):
+        return False
+    return (low is None or actual >= low) and (high is None or actual <= high)
+
+
+def op_contains(actual: Any, expected: Any) -> bool:
+    """实际值（字符串、列表或字典）是否包含期望值"""
+    if isinstance(actual, str):
+        return isinstance(expected, str) and expected in actual
+    if isinstance(actual, (list, dict)):
+        return expected in actual
+    return False
+
+
+def op_length(actual: Any, expected: Any) -> bool:
+    """实际值的长度是否等于期望值，期望值为 [min, max] 时按区间判断"""
+    try:
+        size = len(actual)
+    except TypeError:
+        return False
+    if isinstance(expected, (list, tuple)):
+        return op_between(size, expected)
+    return size == expected
+
+
+def is_subset(expected: Any, actual: Any) -> bool:
+    """
+    判断期望结构是否为实际结构的子集
+
+    字典要求期望中的每个键都存在于实际值中且值递归满足子集关系；
+    列表要求期望中的每个元素都能在实际列表中找到满足子集关系的元素；
+    其他类型要求相等。
+    """
+    if isinstance(expected, dict):
+        if not isinstance(actual, dict):
+            return False
+        return all(key in actual and is_subset(value, actual[key]) for key, value in expected.items())
+    if isinstance(expected, list):
+        if not isinstance(actual, list):
+            return False
+        return all(any(is_subset(item, candidate) for candidate in actual) for item in expected)
+    return expected == actual
+
+
+OPERATORS: Dict[str, Operator] = {
+    "eq": lambda actual, expected: actual == expected,
+    "ne": lambda actual, expected: actual != expected,
+    "gt": lambda actual, expected: _compare(actual, expected, lambda a, e: a > e),
+    "ge": lambda actual, expected: _compare(actual, expected, lambda a, e: a >= e),
+    "lt": lambda actual, expected: _compare(actual, expected, lambda a, e: a < e),
+    "le": lambda actual, expected: _compare(actual, expected, lambda a, e: a <= e),
+    "between": op_between,
+    "contains": op_contains,
+    "not_contains": lambda actual, expected: not op_contains(actual, expected),
+    "in": lambda actual, expected: _compare(actual, expected, lambda a, e: a in e),
+    "not_in": lambda actual, expected: _compare(actual, expected, lambda a, e: a not in e),
+    "length": op_length,
+    "type": op_type,
+    "schema_subset": lambda actual, expected: is_subset(expected, actual),
+}
+
+
+def validate_expected(operator: str, expected: Any) -> None:
+    """
+    在编译阶段校验期望值与运算符是否匹配
+
+    Raises:
+        ValueError: 运算符不存在或期望值格式不正确时
+    """
+    if operator not in OPERATORS:
+        raise ValueError(f"不支持的断言运算符: {operator}")
+    if operator == "between" and not (isinstance(expected, (list, tuple)) and len(expected) == 2):
+        raise ValueError(f"between 运算符的期望值必须为 [min, max]: {expected}")
+    if operator in ("in", "not_in") and not isinstance(expected, (list, tuple, str, dict)):
+        raise ValueError(f"{operator} 运算符的期望值必须为列表: {expected}")
+    if operator == "length" and not (
+        isinstance(expected, int) or (isinstance(expected, (list, tuple)) and len(expected) == 2)
+    ):
+        raise ValueError(f"length 运算符的期望值必须为整数或 [min, max]: {expected}")
+    if operator == "type" and (not isinstance(expected, str) or expected.lower() not in TYPE_NAMES):
+        raise ValueError(f"type 运算符的期望值必须为 {sorted(TYPE_NAMES)} 之一: {expected}")
@@ -0,0 +1,364 @@
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Pattern
+from xml.etree import ElementTree as ETree
+from jsonpath_ng import JSONPath
+from requests import Response
+from core.assertion.operators import OPERATORS, Operator, validate_expected
+from core.assertion.schema import SchemaValidator, get_validator, validate
+from core.assertion.tabular import TableCheck, compile_table_check
+from core.http.response import is_xml_response, response_handler
+from utils.jsonpath import compile_jsonpath, iter_compiled
+from utils.xpath import XPathExpr, compile_xpath, iter_xpath, iter_xpath_stream
+from utils.logger import logger
+
+
+# 未解析的响应体占位符，用于区分"尚未解析"和"解析结果为None"
+_UNPARSED = object()
+
+# XML响应体超过该大小（字节）且尚未解析时，XPath断言使用增量解析并在找到目标后停止
+XML_STREAMING_THRESHOLD = 512 * 1024
+
+
+class ResponseContext:
+    """断言上下文
+
+    在一次断言计划执行期间共享同一个响应对象和解析后的响应体，
+    保证响应体只会被解析一次。
+    """
+
+    def __init__(self, response: Response):
+        self.response = response
+        self._body: Any = _UNPARSED
+
+    @property
+    def body(self) -> Any:
+        """惰性解析并缓存响应体"""
+        if self._body is _UNPARSED:
+            self._body = response_handler(self.response)
+        return self._body
+
+    def can_stream_xml(self) -> bool:
+        """响应体尚未解析且为大体积XML时，可以使用增量解析"""
+        return (
+            self._body is _UNPARSED
+            and is_xml_response(self.response)
+            and len(self.response.content) >= XML_STREAMING_THRESHOLD
+        )
+
+
+def response_seconds(response: Response) -> float:
+    """返回响应总耗时（秒），优先使用HTTPClient记录的总耗时"""
+    total_elapsed = getattr(response, "total_elapsed", None)
+    if total_elapsed is not None:
+        return total_elapsed
+    return response.elapsed.total_seconds()
+
+
+@dataclass(frozen=True)
+class AssertionFailure:
+    """单条断言失败信息"""
+
+    index: int
+    exp: Optional[str]
+    expected: Any
+    actual: Any
+    message: str
+
+    def __str__(self) -> str:
+        return f"[{self.index}] {self.message}"
+
+
+# 未找到匹配值时的占位符
+_MISSING = object()
+
+# 多个匹配值时的判定方式
+QUANTIFIERS = ("first", "any", "all", "none")
+
+
+@dataclass(frozen=True)
+class AssertionCheck:
+    """编译后的单条断言
+
+    Attributes:
+        index: 断言在用例 exception 列表中的序号
+        asset_type: 断言类型，status_code、body、header、response_time、schema 或 table
+        exp: 原始表达式（body为正则/JSONPath，header为响应头名称，schema为schema文件路径，table为记录数组的JSONPath）
+        operator: 运算符名称
+        expected: 类型化后的期望值
+        quantifier: 多个匹配值时的判定方式，first/any/all/none
+        predicate: 运算符对应的判定函数
+        regex: 预编译的正则表达式（字符串响应使用）
+        json_path: 预编译的JSONPath表达式（JSON响应使用）
+        xpath: 预编译的XPath表达式（XML响应使用）
+        validator: 编译后的JSON Schema校验函数（schema断言使用）
+        table: 编译后的列检查（table断言使用）
+    """
+
+    index: int
+    asset_type: str
+    exp: Optional[str]
+    operator: str
+    expected: Any
+    quantifier: str = "first"
+    predicate: Operator = OPERATORS["eq"]
+    regex: Optional[Pattern[str]] = None
+    json_path: Optional[JSONPath] = None
+    xpath: Optional[XPathExpr] = None
+    validator: Optional[SchemaValidator] = None
+    table: Optional[TableCheck] = None
+
+    def evaluate(self, context: ResponseContext) -> Optional[AssertionFailure]:
+        """执行断言，成功返回None，失败返回失败信息"""
+        if self.asset_type == "status_code":
+            return self._check_value(context.response.status_code, "状态码")
+
+        if self.asset_type == "response_time":
+            return self._check_value(response_seconds(context.response), "响应耗时(秒)")
+
+        if self.asset_type == "header":
+            actual = context.response.headers.get(self.exp)
+            if actual is None:
+                return self._fail(None, f"响应头 '{self.exp}' 不存在")
+            return self._check_value(actual, f"响应头 '{self.exp}'")
+
+        if self.xpath is not None and self.xpath.streamable and context.can_stream_xml():
+            try:
+                return self._check_values(
+                    iter_xpath_stream(context.response.content, self.xpath), self._text_expected(), "节点值"
+                )
+            except ETree.ParseError as e:
+                return self._fail(None, f"XML响应解析失败: {e}")
+
+        body = context.body
+        if self.asset_type == "schema":
+            error = validate(self.validator, body)
+            if error is None:
+                return None
+            return self._fail(None, f"响应体不符合Schema '{self.exp}': {error}")
+
+        if self.asset_type == "table":
+            if not isinstance(body, (dict, list)):
+                return self._fail(None, f"表格断言只支持JSON响应，实际响应类型: {type(body)}")
+            records = next(iter_compiled(self.json_path, body), _MISSING)
+            if records is _MISSING:
+                return self._fail(None, f"表达式 '{self.exp}' 未找到任何匹配的值")
+            error = self.table.evaluate(records)
+            return None if error is None else self._fail(None, error)
+
+        if isinstance(body, str):
+            if self.regex is None:
+                return self._fail(None, f"表达式 '{self.exp}' 不是合法的正则表达式")
+            values = (match.group() for match in self.regex.finditer(body))
+            return self._check_values(values, self._text_expected(), "匹配值")
+
+        if isinstance(body, (dict, list)):
+            if self.json_path is None:
+                return self._fail(None, f"表达式 '{self.exp}' 不是合法的JSONPath表达式")
+            return self._check_values(iter_compiled(self.json_path, body), self.expected, "提取值")
+
+        if isinstance(body, ETree.Element):
+            if self.xpath is None:
+                return self._fail(None, f"表达式 '{self.exp}' 不是合法的XPath表达式")
+            return self._check_values(iter_xpath(body, self.xpath), self._text_expected(), "节点值")
+
+        return self._fail(None, f"不支持的响应类型: {type(body)}")
+
+    def _text_expected(self) -> Any:
+        """正则与XPath提取的值均为字符串，相等比较时将期望值转换为字符串"""
+        if self.operator in ("eq", "ne") and self.expected is not None:
+            return str(self.expected)
+        return self.expected
+
+    def _check_value(self, actual: Any, label: str) -> Optional[AssertionFailure]:
+        if self.predicate(actual, self.expected):
+            return None
+        return self._fail(actual, f"{label} {actual!r} 不满足 {self.operator} {self.expected!r}")
+
+    def _check_values(self, values: Iterator[Any], expected: Any, label: str) -> Optional[AssertionFailure]:
+        """按判定方式对匹配值迭代器求值，满足结论后立即停止迭代"""
+        predicate = self.predicate
+        if self.quantifier == "first":
+            actual = next(values, _MISSING)
+            if actual is _MISSING:
+                return self._fail(None, f"表达式 '{self.exp}' 未找到任何匹配的值")
+            if predicate(actual, expected):
+                return None
+            return self._fail(actual, f"{label} {actual!r} 不满足 {self.operator} {expected!r}")
+
+        if self.quantifier == "any":
+            if any(predicate(actual, expected) for actual in values):
+                return None
+            return self._fail(None, f"表达式 '{self.exp}' 没有任何匹配值满足 {self.operator} {expected!r}")
+
+        if self.quantifier == "none":
+            for actual in values:
+                if predicate(actual, expected):
+                    return self._fail(actual, f"{label} {actual!r} 不应满足 {self.operator} {expected!r}")
+            return None
+
+        # all：至少存在一个匹配值，且全部满足
+        matched = False
+        for actual in values:
+            matched = True
+            if not predicate(actual, expected):
+                return self._fail(actual, f"{label} {actual!r} 不满足 {self.operator} {expected!r}")
+        if not matched:
+            return self._fail(None, f"表达式 '{self.exp}' 未找到任何匹配的值")
+        return None
+
+    def _fail(self, actual: Any, message: str) -> AssertionFailure:
+        return AssertionFailure(self.index, self.exp, self.expected, actual, message)
+
+
+@dataclass(frozen=True)
+class AssertionPlan:
+    """断言计划
+
+    由用例的 exception 列表一次性编译得到，可在多次执行之间复用。
+    执行时对同一个解析后的响应体依次运行全部断言，并汇总所有失败（软断言）。
+    """
+
+    checks: tuple[AssertionCheck, ...] = field(default_factory=tuple)
+
+    def evaluate(self, response: Response) -> List[AssertionFailure]:
+        """执行全部断言并返回失败列表"""
+        context = ResponseContext(response)
+        failures: List[AssertionFailure] = []
+        for check in self.checks:
+            failure = check.evaluate(context)
+            if failure is not None:
+                logger.warning(f"断言失败: {failure}")
+                failures.append(failure)
+        logger.info(f"断言计划执行完成，共 {len(self.checks)} 条断言，失败 {len(failures)} 条")
+        return failures
+
+    def assert_all(self, response: Response) -> None:
+        """执行全部断言，存在失败时一次性抛出包含所有失败信息的AssertionError"""
+        failures = self.evaluate(response)
+        if failures:
+            details = "\n".join(str(failure) for failure in failures)
+            raise AssertionError(f"共 {len(failures)} 条断言失败:\n{details}")
+
+
+def _compile_regex(exp: str) -> Optional[Pattern[str]]:
+    try:
+        return re.compile(exp)
+    except re.error:
+        return None
+
+
+def _compile_json_path(exp: str) -> Optional[JSONPath]:
+    if not exp.startswith("$"):
+        return None
+    try:
+        return compile_jsonpath(exp)
+    except Exception as e:
+        logger.warning(f"JSONPath表达式编译失败: {exp}, 错误: {e}")
+        return None
+
+
+# 各断言类型的默认运算符
+_DEFAULT_OPERATORS = {"response_time": "lt"}
+
+
+def _compile_xpath(exp: str) -> Optional[XPathExpr]:
+    if not exp or exp.startswith("$"):
+        return None
+    try:
+        return compile_xpath(exp)
+    except ValueError:
+        return None
+
+
+def compile_check(index: int, item: Dict[str, Any]) -> AssertionCheck:
+    """
+    将 exception 列表中的一行编译为断言
+
+    Args:
+        index: 断言序号
+        item: 断言配置，包含 asset_type、exp（正则、JSONPath或XPath）、excpect_value，
+            可选 operator（默认eq）与 match（多个匹配值的判定方式，默认first）
+
+    Returns:
+        AssertionCheck: 编译后的断言
+
+    Raises:
+        ValueError: 断言类型、运算符或期望值不合法时
+    """
+    asset_type = item.get("asset_type") or "body"
+    exp = item.get("exp")
+    expected = item.get("excpect_value")
+    operator = str(item.get("operator") or _DEFAULT_OPERATORS.get(asset_type, "eq")).lower()
+    quantifier = str(item.get("match") or "first").lower()
+
+    if quantifier not in QUANTIFIERS:
+        raise ValueError(f"第 {index} 条断言的 match 不合法: {quantifier}，可选值为 {QUANTIFIERS}")
+
+    if asset_type == "status_code" and operator in ("eq", "ne"):
+        try:
+            expected = int(expected)
+        except (TypeError, ValueError):
+            raise ValueError(f"第 {index} 条断言的状态码期望值不合法: {expected}")
+
+    validate_expected(operator, expected)
+    predicate = OPERATORS[operator]
+
+    if asset_type in ("status_code", "response_time"):
+        return AssertionCheck(index, asset_type, exp, operator, expected, predicate=predicate)
+
+    if asset_type == "schema":
+        if not exp:
+            raise ValueError(f"第 {index} 条断言缺少Schema文件路径")
+        return AssertionCheck(index, asset_type, str(exp), "schema", None, validator=get_validator(exp))
+
+    if asset_type == "table":
+        json_path = _compile_json_path(str(exp or ""))
+        if json_path is None:
+            raise ValueError(f"第 {index} 条表格断言的 exp 必须是合法的JSONPath表达式: {exp}")
+        return AssertionCheck(
+            index,
+            asset_type,
+            str(exp),
+            "table",
+            expected,
+            json_path=json_path,
+            table=compile_table_check(index, expected, item.get("rows")),
+        )
+
+    if asset_type == "header":
+        if not exp:
+            raise ValueError(f"第 {index} 条断言缺少响应头名称")
+        return AssertionCheck(index, asset_type, str(exp), operator, expected, predicate=predicate)
+
+    if asset_type != "body":
+        raise ValueError(f"第 {index} 条断言的类型不支持: {asset_type}")
+
+    exp = str(exp) if exp is not None else ""
+    return AssertionCheck(
+        index,
+        asset_type,
+        exp,
+        operator,
+        expected,
+        quantifier=quantifier,
+        predicate=predicate,
+        regex=_compile_regex(exp),
+        json_path=_compile_json_path(exp),
+        xpath=_compile_xpath(exp),
+    )
+
+
+def compile_assertions(exception: Optional[List[Dict[str, Any]]]) -> AssertionPlan:
+    """
+    将用例的 exception 列表编译为断言计划
+
+    Args:
+        exception: 用例中的断言配置列表
+
+    Returns:
+        AssertionPlan: 可重复执行的断言计划
+    """
+    checks = tuple(compile_check(index, item) for index, item in enumerate(exception or []))
+    logger.debug(f"断言计划编译完成，共 {len(checks)} 条断言")
+    return AssertionPlan(checks)
@@ -0,0 +1,146 @@
+import hashlib
+import json
+import re
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+from data.providers.yaml_reader import yaml_reader
+from utils.logger import logger
+from utils.path import PROJECT_ROOT
+
+
+SchemaValidator = Callable[[Any], Any]
+
+# 按schema内容哈希缓存编译后的校验函数
+_VALIDATOR_CACHE: Dict[str, SchemaValidator] = {}
+# 按文件路径缓存schema内容哈希，避免重复读取文件
+_FILE_CACHE: Dict[Path, tuple[float, str]] = {}
+_LOCK = threading.Lock()
+
+
+def schema_hash(schema: Dict[str, Any]) -> str:
+    """计算schema内容的哈希值，键顺序不同但内容相同的schema得到相同的哈希"""
+    canonical = json.dumps(schema, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def resolve_schema_path(schema_path: str | Path) -> Path:
+    """解析schema文件路径，相对路径以项目根目录为基准"""
+    path = Path(schema_path)
+    if not path.is_absolute():
+        path = PROJECT_ROOT / path
+    return path
+
+
+def load_schema(schema_path: str | Path) -> Dict[str, Any]:
+    """
+    读取schema文件，支持 .json / .yaml / .yml
+
+    Raises:
+        FileNotFoundError: 文件不存在时
+        ValueError: 文件格式不支持或内容不是对象时
+    """
+    path = resolve_schema_path(schema_path)
+    if not path.exists():
+        error_msg = f"Schema文件不存在: {path}"
+        logger.error(error_msg)
+        raise FileNotFoundError(error_msg)
+
+    suffix = path.suffix.lower()
+    if suffix == ".json":
+        with open(path, "r", encoding="utf-8") as f:
+            schema = json.load(f)
+    elif suffix in (".yaml", ".yml"):
+        schema = yaml_reader(str(path))
+    else:
+        raise ValueError(f"不支持的Schema文件类型: {suffix}")
+
+    if not isinstance(schema, dict):
+        raise ValueError(f"Schema文件内容必须为对象: {path}")
+    return schema
+
+
+def compile_schema(schema: Dict[str, Any]) -> SchemaValidator:
+    """
+    将schema编译为校验函数，相同内容的schema只编译一次
+
+    Args:
+        schema: JSON Schema
+
+    Returns:
+        SchemaValidator: 校验函数，校验失败时抛出 fastjsonschema.JsonSchemaValueException
+
+    Raises:
+        ValueError: schema定义不合法时（如未知的type、无法解析的$ref、不合法的正则）
+    """
+    key = schema_hash(schema)
+    validator = _VALIDATOR_CACHE.get(key)
+    if validator is not None:
+        return validator
+
+    import fastjsonschema
+
+    with _LOCK:
+        validator = _VALIDATOR_CACHE.get(key)
+        if validator is None:
+            logger.debug(f"编译JSON Schema: {key[:12]}")
+            try:
+                validator = fastjsonschema.compile(schema)
+            except (fastjsonschema.JsonSchemaDefinitionException, re.error) as e:
+                raise ValueError(f"JSON Schema定义不合法: {e}") from e
+            _VALIDATOR_CACHE[key] = validator
+    return validator
+
+
+def get_validator(schema_path: str | Path) -> SchemaValidator:
+    """
+    获取schema文件对应的校验函数
+
+    文件未修改时直接复用缓存，文件内容相同的不同路径共享同一个校验函数。
+
+    Raises:
+        FileNotFoundError: 文件不存在时
+        ValueError: 文件格式不支持或schema定义不合法时，错误信息包含文件路径
+    """
+    path = resolve_schema_path(schema_path)
+    mtime = path.stat().st_mtime if path.exists() else -1.0
+    cached = _FILE_CACHE.get(path)
+    if cached is not None and cached[0] == mtime and cached[1] in _VALIDATOR_CACHE:
+        return _VALIDATOR_CACHE[cached[1]]
+
+    schema = load_schema(path)
+    try:
+        validator = compile_schema(schema)
+    except ValueError as e:
+        logger.error(f"Schema文件 {path} 不合法: {e}")
+        raise ValueError(f"Schema文件 {path} 不合法: {e}") from e
+    _FILE_CACHE[path] = (mtime, schema_hash(schema))
+    logger.info(f"Schema校验函数已就绪: {path}")
+    return validator
+
+
+def validate(validator: SchemaValidator, data: Any) -> Optional[str]:
+    """
+    使用校验函数校验数据
+
+    Returns:
+        Optional[str]: 校验通过返回None，否则返回包含出错位置的错误信息，如 $.items[1].id must be integer
+    """
+    import fastjsonschema
+
+    try:
+        validator(data)
+        return None
+    except fastjsonschema.JsonSchemaValueException as e:
+        message = e.message
+        # fastjsonschema以 data 表示根节点，转换为与断言表达式一致的JSONPath写法
+        if e.name and message.startswith(e.name) and e.name.startswith("data"):
+            message = "$" + message[len("data"):]
+        return message
+
+
+def clear_schema_cache() -> None:
+    """清除schema缓存，用于测试或schema更新后"""
+    with _LOCK:
+        _VALIDATOR_CACHE.clear()
+        _FILE_CACHE.clear()
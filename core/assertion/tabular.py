@@ -0,0 +1,246 @@
+"""
+表格断言
+将JSONPath选中的记录数组按列一次性转换为NumPy数组，再对整列执行向量化检查，
+适合对返回大量记录的接口断言排序、唯一性、取值范围、求和与空值数量等整体属性。
+
+用例中的写法：
+
+    - asset_type: table
+      exp: $.data.items
+      rows: 100
+      excpect_value:
+        id: {unique: true, sorted: asc, nulls: 0}
+        price: {min: 0, max: 1000, sum: 12345.6, tolerance: 0.01}
+"""
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, List, Optional, Sequence
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+# 支持的列检查
+COLUMN_CHECKS = ("sorted", "unique", "min", "max", "sum", "tolerance", "nulls")
+# sorted 的可选值
+SORT_ORDERS = ("asc", "desc")
+
+
+def _numpy():
+    # NumPy 是可选依赖，只在执行表格断言时导入
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError("表格断言需要安装numpy: pip install 'api-test[tabular]'") from e
+    return numpy
+
+
+@dataclass(frozen=True)
+class ColumnCheck:
+    """
+    单列的检查配置
+
+    Attributes:
+        column: 列名，即记录中的字段名
+        sorted: 排序方向，asc / desc，为None时不检查
+        unique: 是否要求非空值唯一
+        min: 非空值的下限（包含）
+        max: 非空值的上限（包含）
+        sum: 非空值之和的期望值
+        tolerance: 求和允许的绝对误差
+        nulls: 空值（字段缺失或为null）的期望数量
+    """
+
+    column: str
+    sorted: Optional[str] = None
+    unique: bool = False
+    min: Optional[float] = None
+    max: Optional[float] = None
+    sum: Optional[float] = None
+    tolerance: float = 1e-9
+    nulls: Optional[int] = None
+
+    def evaluate(self, column: "Column") -> List[str]:
+        """执行检查，返回失败信息列表"""
+        np = _numpy()
+        values = column.values
+        failures: List[str] = []
+        label = f"列 '{self.column}'"
+
+        if self.nulls is not None and column.nulls != self.nulls:
+            failures.append(f"{label} 空值数量为 {column.nulls}，期望 {self.nulls}")
+
+        if self.sorted is not None and values.size > 1:
+            try:
+                ordered = values[1:] >= values[:-1] if self.sorted == "asc" else values[1:] <= values[:-1]
+            except TypeError:
+                failures.append(f"{label} 的值类型不一致，无法比较顺序")
+            else:
+                if not ordered.all():
+                    position = int(np.argmin(ordered))
+                    previous, current = values[position:position + 2].tolist()
+                    failures.append(
+                        f"{label} 未按 {self.sorted} 排序: 第 {position} 个非空值 {previous!r}，"
+                        f"第 {position + 1} 个非空值 {current!r}"
+                    )
+
+        if self.unique and values.size > 1:
+            try:
+                uniques, counts = np.unique(values, return_counts=True)
+            except TypeError:
+                failures.append(f"{label} 的值类型不一致，无法检查唯一性")
+            else:
+                duplicated = uniques[counts > 1]
+                if duplicated.size:
+                    failures.append(f"{label} 存在 {duplicated.size} 个重复值，例如 {duplicated[:5].tolist()}")
+
+        if self.min is not None or self.max is not None or self.sum is not None:
+            if not column.numeric:
+                failures.append(f"{label} 不是数值列，无法检查 min/max/sum")
+                return failures
+            if self.min is not None and values.size and values.min() < self.min:
+                failures.append(f"{label} 最小值 {values.min().item()!r} 小于下限 {self.min!r}")
+            if self.max is not None and values.size and values.max() > self.max:
+                failures.append(f"{label} 最大值 {values.max().item()!r} 大于上限 {self.max!r}")
+            if self.sum is not None:
+                total = values.sum().item()
+                if abs(total - self.sum) > self.tolerance:
+                    failures.append(f"{label} 求和为 {total!r}，期望 {self.sum!r}±{self.tolerance!r}")
+        return failures
+
+
+def _value_kind(value: Any) -> str:
+    """值的类型，整数与浮点数同属 number，bool 单独区分，避免被当作 0/1 参与比较"""
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, (int, float)):
+        return "number"
+    return type(value).__name__
+
+
+# 可以按列检查的值类型
+_SCALAR_KINDS = frozenset({"number", "bool", "str"})
+
+
+@dataclass(frozen=True)
+class Column:
+    """
+    按列转换后的数据
+
+    Attributes:
+        values: 非空值组成的NumPy数组
+        nulls: 空值数量
+        numeric: 是否为数值列
+    """
+
+    values: "np.ndarray"
+    nulls: int
+    numeric: bool
+
+    @classmethod
+    def from_records(cls, records: Sequence[Any], column: str) -> "Column":
+        """
+        从记录数组中取出一列并转换为NumPy数组
+
+        Raises:
+            TypeError: 值不是标量（数组、对象）时，或非空值的类型不一致时，如数值与字符串混合（NumPy会将整列静默转换为字符串）
+        """
+        np = _numpy()
+        raw = [record.get(column) if isinstance(record, dict) else None for record in records]
+        present = [value for value in raw if value is not None]
+        kinds = {_value_kind(value) for value in present}
+        # 长度不同的数组无法组成NumPy数组，长度相同时会生成二维数组，按列检查都没有意义
+        nested = kinds - _SCALAR_KINDS
+        if nested:
+            raise TypeError(f"列 '{column}' 包含非标量值: {', '.join(sorted(nested))}，无法按列检查")
+        if len(kinds) > 1:
+            raise TypeError(f"列 '{column}' 的值类型不一致: {', '.join(sorted(kinds))}，无法按列检查")
+        values = np.asarray(present) if present else np.asarray([], dtype=np.float64)
+        if values.dtype == object:
+            # 整数与浮点数混合等情况统一转换为浮点数，仍无法转换时保留为对象数组
+            try:
+                values = values.astype(np.float64)
+            except (TypeError, ValueError):
+                pass
+        return cls(values, len(raw) - len(present), values.dtype.kind in "iuf")
+
+
+@dataclass(frozen=True)
+class TableCheck:
+    """
+    编译后的表格断言
+
+    Attributes:
+        columns: 各列的检查配置
+        rows: 期望的记录数，为None时不检查
+    """
+
+    columns: tuple[ColumnCheck, ...]
+    rows: Optional[int] = None
+
+    def evaluate(self, records: Any) -> Optional[str]:
+        """对记录数组执行全部列检查，全部通过返回None，否则返回合并后的失败信息"""
+        if not isinstance(records, list):
+            return f"表达式选中的值不是数组: {type(records).__name__}"
+        failures: List[str] = []
+        if self.rows is not None and len(records) != self.rows:
+            failures.append(f"记录数为 {len(records)}，期望 {self.rows}")
+        # 每列只转换一次，同一列的多个检查共享转换结果
+        for check in self.columns:
+            try:
+                column = Column.from_records(records, check.column)
+            except TypeError as e:
+                failures.append(str(e))
+                continue
+            failures.extend(check.evaluate(column))
+        return "; ".join(failures) if failures else None
+
+
+def compile_table_check(index: int, expected: Any, rows: Any = None) -> TableCheck:
+    """
+    编译表格断言配置
+
+    Args:
+        index: 断言序号
+        expected: 列名到列检查配置的字典
+        rows: 期望的记录数
+
+    Raises:
+        ValueError: 配置不合法时
+    """
+    if not isinstance(expected, dict) or not expected:
+        raise ValueError(f"第 {index} 条表格断言的 excpect_value 必须是列名到检查配置的字典")
+    columns = []
+    for column, config in expected.items():
+        if not isinstance(config, dict):
+            raise ValueError(f"第 {index} 条表格断言中列 '{column}' 的检查配置必须是字典")
+        unknown = set(config) - set(COLUMN_CHECKS)
+        if unknown:
+            raise ValueError(f"第 {index} 条表格断言中列 '{column}' 的检查不支持: {sorted(unknown)}，可选值为 {COLUMN_CHECKS}")
+        order = config.get("sorted")
+        if order is True:
+            order = "asc"
+        elif order is False:
+            order = None
+        if order is not None and order not in SORT_ORDERS:
+            raise ValueError(f"第 {index} 条表格断言中列 '{column}' 的 sorted 不合法: {order}，可选值为 {SORT_ORDERS}")
+        try:
+            columns.append(
+                ColumnCheck(
+                    column=str(column),
+                    sorted=order,
+                    unique=bool(config.get("unique", False)),
+                    min=_optional_number(config.get("min")),
+                    max=_optional_number(config.get("max")),
+                    sum=_optional_number(config.get("sum")),
+                    tolerance=float(config.get("tolerance", 1e-9)),
+                    nulls=None if config.get("nulls") is None else int(config["nulls"]),
+                )
+            )
+        except (TypeError, ValueError):
+            raise ValueError(f"第 {index} 条表格断言中列 '{column}' 的数值配置不合法: {config}")
+    return TableCheck(tuple(columns), None if rows is None else int(rows))
+
+
+def _optional_number(value: Any) -> Optional[float]:
+    return None if value is None else float(value)
@@ -0,0 +1,196 @@
+"""
+认证令牌管理
+按host配置登录用例，首次请求该host时执行登录并缓存令牌，过期前复用；
+多个线程同时发现令牌过期时只有一个线程执行登录，其余线程等待并复用新令牌。
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+from requests import PreparedRequest, Response
+from utils import config_reader
+from utils.jsonpath import jsonpath
+from utils.logger import logger
+
+
+# 执行登录用例并返回响应的函数，由HTTPClient提供，登录请求本身不注入令牌
+LoginSender = Callable[[Dict[str, Any]], Response]
+
+
+class AuthError(RuntimeError):
+    """登录失败或无法从登录响应中提取令牌"""
+
+
+def _origin(url: str) -> str:
+    """返回 scheme://host[:port]，作为令牌的作用范围"""
+    parts = urlsplit(url)
+    return f"{parts.scheme.lower()}://{parts.netloc.lower()}"
+
+
+@dataclass(frozen=True)
+class AuthConfig:
+    """
+    单个host的认证配置，对应配置文件 Host 项下的 auth
+
+    Attributes:
+        host: host名称
+        origin: host的 scheme://host[:port]
+        login: 登录用例，格式与数据文件中的用例相同
+        token_path: 从登录响应中提取令牌的JSONPath
+        expires_path: 从登录响应中提取有效期（秒）的JSONPath，为空时使用 expires_in
+        expires_in: 默认有效期（秒）
+        refresh_margin: 提前刷新的秒数，避免令牌在请求途中过期
+        header: 注入令牌的请求头
+        scheme: 令牌前缀，为空时只写入令牌本身
+    """
+
+    host: str
+    origin: str
+    login: Dict[str, Any]
+    token_path: str
+    expires_path: Optional[str] = None
+    expires_in: float = 3600.0
+    refresh_margin: float = 30.0
+    header: str = "Authorization"
+    scheme: str = "Bearer"
+
+    @classmethod
+    def from_host(cls, host_item: Dict[str, Any]) -> Optional["AuthConfig"]:
+        """
+        根据 Host 配置项创建认证配置，未配置 auth 时返回None
+
+        Raises:
+            ValueError: auth 缺少 login 或 token_path 时
+        """
+        auth = host_item.get("auth")
+        if not auth:
+            return None
+        name = host_item.get("name", "")
+        if not auth.get("login") or not auth.get("token_path"):
+            raise ValueError(f"host '{name}' 的auth配置缺少 login 或 token_path")
+        return cls(
+            host=name,
+            origin=_origin(host_item.get("url", "")),
+            login=auth["login"],
+            token_path=auth["token_path"],
+            expires_path=auth.get("expires_path"),
+            expires_in=float(auth.get("expires_in", 3600)),
+            refresh_margin=float(auth.get("refresh_margin", 30)),
+            header=auth.get("header", "Authorization"),
+            scheme=auth.get("scheme", "Bearer"),
+        )
+
+
+@dataclass(frozen=True)
+class Token:
+    """已获取的令牌"""
+
+    value: str
+    expires_at: float
+
+    def valid(self, margin: float = 0.0) -> bool:
+        return time.monotonic() + margin < self.expires_at
+
+
+class TokenProvider:
+    """单个host的令牌提供者，令牌过期时单线程刷新"""
+
+    def __init__(self, config: AuthConfig):
+        self.config = config
+        self.logins = 0
+        self._token: Optional[Token] = None
+        self._lock = threading.Lock()
+
+    def get_token(self, login: LoginSender) -> str:
+        """
+        返回有效令牌，没有令牌或即将过期时执行登录
+
+        Raises:
+            AuthError: 登录失败时
+        """
+        token = self._token
+        if token is not None and token.valid(self.config.refresh_margin):
+            return token.value
+        with self._lock:
+            # 等待锁期间其他线程可能已经刷新
+            token = self._token
+            if token is None or not token.valid(self.config.refresh_margin):
+                token = self._fetch(login)
+                self._token = token
+        return token.value
+
+    def invalidate(self, value: str) -> None:
+        """服务端拒绝令牌时丢弃该令牌，已被其他线程刷新时不处理"""
+        with self._lock:
+            if self._token is not None and self._token.value == value:
+                logger.info(f"host '{self.config.host}' 的令牌被拒绝，下次请求时重新登录")
+                self._token = None
+
+    def _fetch(self, login: LoginSender) -> Token:
+        config = self.config
+        logger.info(f"host '{config.host}' 开始登录获取令牌")
+        response = login(config.login)
+        self.logins += 1
+        if not response.ok:
+            raise AuthError(f"host '{config.host}' 登录失败，状态码: {response.status_code}")
+        try:
+            body = response.json()
+        except ValueError as e:
+            raise AuthError(f"host '{config.host}' 登录响应不是JSON: {e}") from e
+
+        values = jsonpath(body, config.token_path)
+        if not values or values[0] in (None, ""):
+            raise AuthError(f"host '{config.host}' 登录响应中未找到令牌: {config.token_path}")
+        expires_in = config.expires_in
+        if config.expires_path:
+            expires = jsonpath(body, config.expires_path)
+            if expires and expires[0] is not None:
+                expires_in = float(expires[0])
+        logger.info(f"host '{config.host}' 登录成功，令牌有效期 {expires_in:.0f}秒")
+        return Token(str(values[0]), time.monotonic() + expires_in)
+
+
+class TokenManager:
+    """按请求URL的host注入认证令牌"""
+
+    def __init__(self, configs: List[AuthConfig]):
+        self.providers: Dict[str, TokenProvider] = {config.origin: TokenProvider(config) for config in configs}
+
+    @classmethod
+    def from_config(cls) -> Optional["TokenManager"]:
+        """根据配置文件 Host 项下的 auth 配置创建，没有host配置auth时返回None"""
+        hosts = config_reader.get_config().get("Host") or []
+        configs = [config for config in (AuthConfig.from_host(item) for item in hosts) if config]
+        if not configs:
+            return None
+        logger.info(f"启用令牌管理: {[config.host for config in configs]}")
+        return cls(configs)
+
+    def provider_for(self, url: str) -> Optional[TokenProvider]:
+        return self.providers.get(_origin(url))
+
+    def apply(self, prepared_request: PreparedRequest, login: LoginSender) -> Optional[str]:
+        """
+        为请求注入令牌，返回注入的令牌，请求的host未配置认证时返回None
+
+        用例显式设置了令牌（请求头的值不只是前缀）时保留用例的值，用于测试无效令牌等场景。
+        """
+        provider = self.provider_for(prepared_request.url)
+        if provider is None:
+            return None
+        config = provider.config
+        current = (prepared_request.headers.get(config.header) or "").strip()
+        if current and current != config.scheme:
+            return None
+        token = provider.get_token(login)
+        prepared_request.headers[config.header] = f"{config.scheme} {token}" if config.scheme else token
+        return token
+
+    def reject(self, prepared_request: PreparedRequest, token: str) -> None:
+        """令牌被服务端拒绝（401）时调用，丢弃该令牌并移除请求中的令牌，之后可以重新 apply"""
+        provider = self.provider_for(prepared_request.url)
+        if provider is not None:
+            provider.invalidate(token)
+            prepared_request.headers.pop(provider.config.header, None)
@@ -0,0 +1,198 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+from requests import PreparedRequest, Response
+from utils import config_reader
+from utils.logger import logger
+
+
+# 参与缓存键计算的请求头，不同取值的请求不能共享缓存
+_VARY_HEADERS = ("accept", "accept-encoding", "accept-language", "authorization", "cookie")
+
+
+@dataclass
+class CacheEntry:
+    """缓存条目"""
+
+    key: str
+    host: str
+    response: Response
+    size: int
+    expires_at: float
+    etag: Optional[str]
+    last_modified: Optional[str]
+
+    @property
+    def fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+    @property
+    def revalidatable(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+    def clone(self) -> Response:
+        """返回共享响应体和解析结果的浅拷贝，避免各用例修改同一个响应对象的属性，from_cache 属性标记为True"""
+        response = Response.__new__(Response)
+        response.__dict__.update(self.response.__dict__)
+        response.from_cache = True
+        return response
+
+
+class ResponseCache:
+    """安全方法（GET/HEAD）的响应缓存
+
+    按host分别维护LRU队列，每个host缓存的响应体总字节数不超过 max_bytes。
+    条目在 ttl 秒内直接命中；过期后如果响应带有 ETag 或 Last-Modified，
+    会发送条件请求重新验证，服务端返回304时继续复用缓存的响应及其解析结果。
+    """
+
+    def __init__(self, ttl: float = 60.0, max_bytes: int = 64 * 1024 * 1024, methods: tuple[str, ...] = ("GET", "HEAD")):
+        """
+        Args:
+            ttl: 缓存有效期（秒）
+            max_bytes: 每个host缓存的最大字节数
+            methods: 允许缓存的请求方法
+        """
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.methods = tuple(method.upper() for method in methods)
+        self._stores: Dict[str, OrderedDict[str, CacheEntry]] = {}
+        self._sizes: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        # 每次 lookup 恰好计入以下三项之一：新鲜条目直接命中、没有条目或过期且无法重新验证、过期后发送条件请求
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        # 条件请求中服务端返回304、继续复用缓存响应的次数
+        self.revalidated = 0
+        logger.debug(f"ResponseCache初始化完成，ttl={ttl}秒, max_bytes={max_bytes}")
+
+    @classmethod
+    def from_config(cls) -> Optional["ResponseCache"]:
+        """根据配置文件中的 Cache 配置创建缓存，未启用时返回None"""
+        config = config_reader.get_config().get("Cache") or {}
+        if not config.get("enabled"):
+            return None
+        return cls(
+            ttl=float(config.get("ttl", 60)),
+            max_bytes=int(config.get("max_bytes", 64 * 1024 * 1024)),
+            methods=tuple(config.get("methods", ("GET", "HEAD"))),
+        )
+
+    def is_cacheable(self, request: PreparedRequest) -> bool:
+        """只缓存不带请求体的安全方法请求"""
+        return request.method.upper() in self.methods and not request.body
+
+    @staticmethod
+    def make_key(request: PreparedRequest) -> str:
+        """根据请求方法、完整URL及影响响应内容的请求头生成缓存键"""
+        parts = [request.method.upper(), request.url]
+        for name in _VARY_HEADERS:
+            value = request.headers.get(name)
+            if value is not None:
+                parts.append(f"{name}:{value}")
+        return hashlib.sha1("\n".join(parts).encode("utf-8")).hexdigest()
+
+    def lookup(self, request: PreparedRequest) -> Optional[CacheEntry]:
+        """
+        查找缓存条目，找到时将其移动到LRU队尾
+
+        Returns:
+            Optional[CacheEntry]: 新鲜的条目，或过期但可以重新验证的条目；
+                没有条目或条目过期且不带 ETag/Last-Modified 时返回None，计为未命中
+        """
+        host = urlsplit(request.url).netloc
+        key = self.make_key(request)
+        with self._lock:
+            store = self._stores.get(host)
+            entry = store.get(key) if store else None
+            if entry is not None and entry.fresh:
+                self.hits += 1
+            elif entry is not None and entry.revalidatable:
+                self.revalidations += 1
+            else:
+                self.misses += 1
+                return None
+            store.move_to_end(key)
+            return entry
+
+    def add_conditional_headers(self, request: PreparedRequest, entry: CacheEntry) -> None:
+        """为过期条目的重新验证请求添加条件请求头"""
+        if entry.etag:
+            request.headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            request.headers["If-Modified-Since"] = entry.last_modified
+
+    def refresh(self, entry: CacheEntry, response: Response) -> Response:
+        """服务端返回304时刷新条目有效期，并返回缓存的响应"""
+        with self._lock:
+            entry.expires_at = time.monotonic() + self.ttl
+            entry.etag = response.headers.get("ETag") or entry.etag
+            entry.last_modified = response.headers.get("Last-Modified") or entry.last_modified
+            self.revalidated += 1
+        logger.debug(f"缓存重新验证成功(304): {entry.response.url}")
+        return entry.clone()
+
+    def store(self, request: PreparedRequest, response: Response) -> None:
+        """缓存成功的响应，超出字节上限时按LRU淘汰"""
+        if response.status_code != 200:
+            return
+        cache_control = response.headers.get("Cache-Control", "").lower()
+        if "no-store" in cache_control:
+            logger.debug(f"响应声明no-store，不缓存: {request.url}")
+            return
+
+        size = len(response.content)
+        if size > self.max_bytes:
+            logger.debug(f"响应体超过缓存上限，不缓存: {request.url} ({size} 字节)")
+            return
+
+        host = urlsplit(request.url).netloc
+        key = self.make_key(request)
+        entry = CacheEntry(
+            key=key,
+            host=host,
+            response=response,
+            size=size,
+            expires_at=time.monotonic() + self.ttl,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+        with self._lock:
+            store = self._stores.setdefault(host, OrderedDict())
+            old = store.pop(key, None)
+            if old is not None:
+                self._sizes[host] -= old.size
+            store[key] = entry
+            self._sizes[host] = self._sizes.get(host, 0) + size
+            while self._sizes[host] > self.max_bytes and store:
+                _, evicted = store.popitem(last=False)
+                self._sizes[host] -= evicted.size
+                logger.debug(f"缓存超过上限，淘汰: {evicted.response.url}")
+
+    def stats(self) -> Dict[str, int]:
+        """返回命中、未命中、重新验证及304次数"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidations": self.revalidations,
+                "revalidated": self.revalidated,
+            }
+
+    def size(self, host: Optional[str] = None) -> int:
+        """返回指定host或全部host缓存的响应体总字节数"""
+        if host is not None:
+            return self._sizes.get(host, 0)
+        return sum(self._sizes.values())
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._stores.clear()
+            self._sizes.clear()
+        logger.info("响应缓存已清空")
@@ -1,12 +1,29 @@
-from typing import Any, Dict, Literal, Optional
-from requests import Request, Response, Session
+from typing import Any, Dict, Iterable, Literal, Optional
+from requests import PreparedRequest, Request, Response, Session
+from requests.adapters import HTTPAdapter
+from requests.utils import rewind_body
 import time
+from core.http.auth import TokenManager
+from core.http.cache import ResponseCache
+from core.http.recorder import Cassette
+from core.http.template import RequestTemplate, set_json_body
+from core.http.transport import Http2Transport, create_transport
+from utils import config_reader
 from utils.logger import logger
+from utils.serializer import JsonSerializer, get_serializer
 
 
 type MethodType = Literal["GET", "POST", "PUT", "DELETE", "PATCH", "HEAD", "OPTIONS"]
 
 
+def _replayable(prepared_request: PreparedRequest) -> bool:
+    """请求体能否再次发送：没有请求体、bytes/str，或准备请求时记录了初始位置的文件对象"""
+    body = prepared_request.body
+    if body is None or isinstance(body, (bytes, str)):
+        return True
+    return isinstance(getattr(prepared_request, "_body_position", None), int)
+
+
 class HTTPClient:
     """HTTP请求发送工具类
 
@@ -14,13 +31,47 @@ class HTTPClient:
     使用Session来管理连接，提高请求效率。
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        cache: Optional[ResponseCache] = None,
+        recorder: Optional[Cassette] = None,
+        pool_maxsize: Optional[int] = None,
+        serializer: Optional[JsonSerializer] = None,
+        auth: Optional[TokenManager] = None,
+        transport: Optional[str | Http2Transport] = None,
+    ):
         """初始化SendRequest实例
 
         创建一个requests.Session对象用于管理HTTP连接。
+
+        Args:
+            cache (Optional[ResponseCache], optional): GET等安全方法的响应缓存，为None时不缓存. Defaults to None.
+            recorder (Optional[Cassette], optional): 请求录制/回放，回放模式下不发送网络请求. Defaults to None.
+            pool_maxsize (Optional[int], optional): 每个host保持的最大连接数，多线程并发时应不小于线程数，
+                为None时使用requests的默认值. Defaults to None.
+            serializer (Optional[JsonSerializer], optional): JSON请求体的序列化函数，为None时按配置文件选择. Defaults to None.
+            auth (Optional[TokenManager], optional): 按host自动登录并注入令牌，为None时不注入. Defaults to None.
+            transport (Optional[str | Http2Transport], optional): 传输方式，http1 使用requests连接池，
+                h2 使用HTTP/2多路复用，为None时按配置文件 Http.transport 选择. Defaults to None.
         """
         self.__session = Session()
-        logger.debug("HTTPClient初始化完成")
+        if pool_maxsize:
+            adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize)
+            self.__session.mount("http://", adapter)
+            self.__session.mount("https://", adapter)
+        self.cache = cache
+        self.recorder = recorder
+        self.serializer = serializer or get_serializer()
+        self.auth = auth
+        if transport is None or isinstance(transport, str):
+            http_config = config_reader.get_config().get("Http") or {}
+            transport = create_transport(transport or http_config.get("transport", "http1"), http_config)
+        # 为None时使用requests的Session发送
+        self.transport = transport
+        logger.debug(
+            f"HTTPClient初始化完成，响应缓存: {'启用' if cache else '未启用'}，录制模式: {recorder.mode if recorder else '未启用'}，"
+            f"传输: {'h2' if transport else 'http1'}"
+        )
 
     def send_request(
         self,
@@ -35,6 +86,7 @@ class HTTPClient:
         hooks: Optional[Any] = None,
         json: Optional[Dict[str, Any]] = None,
         timeout: int = 10,
+        use_cache: bool = True,
     ) -> Response:
         """发送HTTP请求
 
@@ -50,36 +102,227 @@ class HTTPClient:
             hooks (Optional[Any], optional): 回调函数. Defaults to None.
             json (Optional[Dict[str, Any]], optional): JSON格式的请求体数据. Defaults to None.
             timeout (int, optional): 请求超时时间（秒）. Defaults to 10.
+            use_cache (bool, optional): 是否使用响应缓存，测试缓存行为本身的用例应传False. Defaults to True.
 
         Returns:
-            Response: HTTP响应对象，包含响应状态码、响应头和响应体等信息
+            Response: HTTP响应对象，包含响应状态码、响应头和响应体等信息，
+            total_elapsed 属性记录了包含请求准备和响应体下载在内的总耗时（秒），
+            命中响应缓存（包括304重新验证）时 from_cache 属性为True
         """
         logger.info(f"开始发送HTTP请求: {method} {url}")
         logger.debug(f"请求参数 - headers: {headers}, params: {params}, data: {data}, json: {json}, files: {files}, timeout: {timeout}")
         
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         try:
-            request = Request(
-                method=method,
-                url=url,
-                headers=headers,
-                files=files,
-                data=data,
-                params=params,
-                json=json,
-                cookies=cookies,
-                hooks=hooks,
-                auth=auth,
-            )
-            prepared_request = request.prepare()
-            response = self.__session.send(prepared_request, timeout=timeout)
-            
-            elapsed_time = time.time() - start_time
-            logger.info(f"HTTP请求完成: {method} {url} - 状态码: {response.status_code}, 耗时: {elapsed_time:.3f}秒")
-            
-            return response
+            prepared_request = self._prepare(method, url, headers, files, data, params, auth, cookies, hooks, json)
+            return self._finish(prepared_request, timeout, use_cache, start_time)
         except Exception as e:
-            elapsed_time = time.time() - start_time
+            elapsed_time = time.perf_counter() - start_time
             logger.error(f"HTTP请求失败: {method} {url} - 错误: {e}, 耗时: {elapsed_time:.3f}秒")
             raise
+
+    def _prepare(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        files: Optional[Any] = None,
+        data: Optional[Any] = None,
+        params: Optional[Dict[str, Any]] = None,
+        auth: Optional[Any] = None,
+        cookies: Optional[Any] = None,
+        hooks: Optional[Any] = None,
+        json: Optional[Any] = None,
+    ) -> PreparedRequest:
+        # 只有json请求体时由可替换的序列化函数编码，其余情况与requests行为一致
+        encode_json = json is not None and not data and not files
+        prepared_request = Request(
+            method=method,
+            url=url,
+            headers=headers,
+            files=files,
+            data=data,
+            params=params,
+            json=None if encode_json else json,
+            cookies=cookies,
+            hooks=hooks,
+            auth=auth,
+        ).prepare()
+        if encode_json:
+            set_json_body(prepared_request, self.serializer(json))
+        return prepared_request
+
+    def create_template(
+        self,
+        method: MethodType,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        data: Optional[Any] = None,
+        json: Optional[Any] = None,
+        dynamic: Iterable[str] = (),
+    ) -> RequestTemplate:
+        """创建请求模板，不变的部分只准备一次，参见 RequestTemplate"""
+        return RequestTemplate(method, url, headers, params, data, json, dynamic, self.serializer)
+
+    def send_template(
+        self,
+        template: RequestTemplate,
+        url: Optional[str] = None,
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        data: Optional[Any] = None,
+        json: Optional[Any] = None,
+        timeout: int = 10,
+        use_cache: bool = True,
+    ) -> Response:
+        """使用请求模板发送请求，只重新处理模板中声明为动态的部分
+
+        Args:
+            template (RequestTemplate): 请求模板
+            url, headers, params, data, json: 本次发送的动态部分，未在模板中声明为动态的会被忽略
+            timeout (int, optional): 请求超时时间（秒）. Defaults to 10.
+            use_cache (bool, optional): 是否使用响应缓存. Defaults to True.
+
+        Returns:
+            Response: HTTP响应对象，total_elapsed 属性记录了包含请求准备在内的总耗时（秒），
+            命中响应缓存时 from_cache 属性为True
+        """
+        start_time = time.perf_counter()
+        try:
+            prepared_request = template.prepare(url=url, headers=headers, params=params, data=data, json=json)
+            logger.info(f"开始发送HTTP请求: {prepared_request.method} {prepared_request.url}")
+            return self._finish(prepared_request, timeout, use_cache, start_time)
+        except Exception as e:
+            elapsed_time = time.perf_counter() - start_time
+            logger.error(f"HTTP请求失败: {template.method} {url or template.url} - 错误: {e}, 耗时: {elapsed_time:.3f}秒")
+            raise
+
+    def _finish(self, prepared_request: PreparedRequest, timeout: int, use_cache: bool, start_time: float) -> Response:
+        """发送已准备好的请求并记录总耗时"""
+        response = self._send(prepared_request, timeout, use_cache)
+        elapsed_time = time.perf_counter() - start_time
+        response.total_elapsed = elapsed_time
+        logger.info(
+            f"HTTP请求完成: {prepared_request.method} {prepared_request.url} - "
+            f"状态码: {response.status_code}, 耗时: {elapsed_time:.3f}秒"
+        )
+        return response
+
+    def connection_stats(self) -> Dict[str, int]:
+        """
+        返回连接池统计，用于长时间运行时检查连接是否持续增长
+
+        Returns:
+            Dict[str, int]: pools 为连接池数量（每个host一个），connections 为当前打开的连接数（空闲与使用中），
+            idle 为当前空闲可复用的连接数
+        """
+        if self.transport is not None:
+            return self.transport.connection_stats()
+        stats = {"pools": 0, "connections": 0, "idle": 0}
+        adapters = {id(adapter): adapter for adapter in self.__session.adapters.values()}
+        for adapter in adapters.values():
+            pools = getattr(getattr(adapter, "poolmanager", None), "pools", None)
+            if pools is None:
+                continue
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is None or pool.pool is None:
+                    continue
+                stats["pools"] += 1
+                # 队列中未建立的连接以None占位，被服务端关闭的连接对象仍在队列中但没有socket；
+                # num_connections 是累计创建数，重连时会持续增长，不能用于判断连接泄漏
+                idle = sum(1 for conn in list(pool.pool.queue) if conn is not None and getattr(conn, "sock", None) is not None)
+                in_use = max(0, pool.pool.maxsize - pool.pool.qsize())
+                stats["connections"] += idle + in_use
+                stats["idle"] += idle
+        return stats
+
+    def close(self) -> None:
+        """关闭连接池"""
+        self.__session.close()
+        if self.transport is not None:
+            self.transport.close()
+
+    def _send(self, prepared_request: PreparedRequest, timeout: int, use_cache: bool) -> Response:
+        """
+        发送已准备好的请求，启用令牌管理时注入令牌，令牌被拒绝（401）时重新登录并重试一次
+
+        请求体为生成器、MultipartEncoder等只能读取一次的流时，第一次发送后已被消耗，
+        只作废令牌（下一个请求重新登录）而不重试，返回401响应；可以回到初始位置的文件对象会先回退再重试。
+        """
+        if self.auth is None:
+            return self._dispatch(prepared_request, timeout, use_cache)
+
+        def login(case_data: Dict[str, Any]) -> Response:
+            return self._login(case_data, timeout)
+
+        token = self.auth.apply(prepared_request, login)
+        response = self._dispatch(prepared_request, timeout, use_cache)
+        if token is not None and response.status_code == 401:
+            self.auth.reject(prepared_request, token)
+            if not _replayable(prepared_request):
+                logger.warning(f"令牌被拒绝，请求体无法重新发送，不重试: {prepared_request.method} {prepared_request.url}")
+                return response
+            logger.warning(f"令牌被拒绝，重新登录后重试: {prepared_request.method} {prepared_request.url}")
+            response.close()
+            if self.auth.apply(prepared_request, login) is not None:
+                if prepared_request.body is not None and not isinstance(prepared_request.body, (bytes, str)):
+                    rewind_body(prepared_request)
+                response = self._dispatch(prepared_request, timeout, use_cache)
+        return response
+
+    def _login(self, case_data: Dict[str, Any], timeout: int) -> Response:
+        """执行令牌管理配置的登录用例，不注入令牌、不使用响应缓存"""
+        # 用例模型依赖变量替换和请求体处理，只在需要登录时导入
+        from data.case import Case
+
+        request = Case.from_dict(case_data).render()
+        try:
+            prepared_request = self._prepare(
+                request.method,
+                request.url,
+                headers=request.headers,
+                files=request.files,
+                data=request.data,
+                params=request.params,
+                json=request.json,
+            )
+            return self._dispatch(prepared_request, timeout, use_cache=False)
+        finally:
+            request.close()
+
+    def _dispatch(self, prepared_request: PreparedRequest, timeout: int, use_cache: bool) -> Response:
+        """发送已准备好的请求，回放模式下直接返回录制的响应，录制模式下记录实际响应"""
+        if self.recorder is not None and self.recorder.replaying:
+            return self.recorder.replay(prepared_request)
+        response = self._send_cached(prepared_request, timeout, use_cache)
+        if self.recorder is not None:
+            self.recorder.record(prepared_request, response)
+        return response
+
+    def _send_cached(self, prepared_request: PreparedRequest, timeout: int, use_cache: bool) -> Response:
+        """发送请求，启用缓存时优先复用缓存的响应"""
+        cache = self.cache if use_cache else None
+        if cache is None or not cache.is_cacheable(prepared_request):
+            return self._transport_send(prepared_request, timeout)
+
+        entry = cache.lookup(prepared_request)
+        if entry is not None and entry.fresh:
+            logger.info(f"命中响应缓存: {prepared_request.method} {prepared_request.url}")
+            return entry.clone()
+        if entry is not None and entry.revalidatable:
+            logger.debug(f"缓存已过期，发送条件请求重新验证: {prepared_request.url}")
+            cache.add_conditional_headers(prepared_request, entry)
+
+        response = self._transport_send(prepared_request, timeout)
+        if entry is not None and response.status_code == 304:
+            return cache.refresh(entry, response)
+        cache.store(prepared_request, response)
+        return response
+
+    def _transport_send(self, prepared_request: PreparedRequest, timeout: int) -> Response:
+        if self.transport is not None:
+            return self.transport.send(prepared_request, timeout)
+        return self.__session.send(prepared_request, timeout=timeout)
@@ -0,0 +1,139 @@
+import base64
+import hashlib
+import json
+import threading
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Dict, List
+from requests import PreparedRequest, Response
+from requests.structures import CaseInsensitiveDict
+from utils.logger import logger
+
+
+# 可选的录制模式
+RECORD_MODES = ("record", "replay")
+
+
+class RecordingNotFoundError(LookupError):
+    """回放模式下录制文件中没有匹配的请求"""
+
+
+def request_key(request: PreparedRequest) -> str:
+    """
+    根据请求方法、完整URL和请求体生成录制键
+
+    请求头不参与计算，避免token等每次运行都不同的值导致无法回放；
+    multipart等流式请求体每次的分隔符不同，也不参与计算。
+    """
+    parts = [request.method.upper(), request.url]
+    body = request.body
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    if isinstance(body, bytes):
+        parts.append(hashlib.sha1(body).hexdigest())
+    return hashlib.sha1("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+def _dump_response(key: str, request: PreparedRequest, response: Response) -> Dict[str, Any]:
+    return {
+        "key": key,
+        "method": request.method,
+        "url": request.url,
+        "status_code": response.status_code,
+        "reason": response.reason,
+        "headers": dict(response.headers),
+        "encoding": response.encoding,
+        "elapsed": response.elapsed.total_seconds(),
+        "body": base64.b64encode(response.content).decode("ascii"),
+    }
+
+
+def _load_response(record: Dict[str, Any], request: PreparedRequest) -> Response:
+    response = Response()
+    response.status_code = record["status_code"]
+    response.reason = record.get("reason")
+    response.headers = CaseInsensitiveDict(record.get("headers") or {})
+    response.encoding = record.get("encoding")
+    response.url = record.get("url", request.url)
+    response.elapsed = timedelta(seconds=record.get("elapsed", 0.0))
+    response._content = base64.b64decode(record.get("body", ""))
+    response.request = request
+    return response
+
+
+class Cassette:
+    """请求录制与回放
+
+    record 模式下把每个真实响应追加写入JSONL格式的录制文件；
+    replay 模式下按录制键返回录制的响应，不发送网络请求。
+    同一请求录制了多次时按录制顺序依次回放，超出次数后重复返回最后一次的响应。
+    """
+
+    def __init__(self, path: str | Path, mode: str = "replay"):
+        """
+        Args:
+            path: 录制文件路径
+            mode: record 录制 / replay 回放
+
+        Raises:
+            ValueError: 模式不支持时
+            FileNotFoundError: 回放模式下录制文件不存在时
+        """
+        if mode not in RECORD_MODES:
+            raise ValueError(f"不支持的录制模式: {mode}，可选值为 {RECORD_MODES}")
+        self.path = Path(path)
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._records: Dict[str, List[Dict[str, Any]]] = {}
+        self._positions: Dict[str, int] = {}
+        self._file = None
+
+        if mode == "replay":
+            if not self.path.exists():
+                raise FileNotFoundError(f"录制文件不存在: {self.path}")
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        self._records.setdefault(record["key"], []).append(record)
+            logger.info(f"加载录制文件: {self.path}，共 {sum(map(len, self._records.values()))} 个响应")
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "w", encoding="utf-8")
+            logger.info(f"录制响应到: {self.path}")
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def record(self, request: PreparedRequest, response: Response) -> None:
+        """追加录制一个响应"""
+        if self._file is None:
+            return
+        line = json.dumps(_dump_response(request_key(request), request, response), ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def replay(self, request: PreparedRequest) -> Response:
+        """
+        返回录制的响应
+
+        Raises:
+            RecordingNotFoundError: 没有匹配的录制时
+        """
+        key = request_key(request)
+        with self._lock:
+            records = self._records.get(key)
+            if not records:
+                raise RecordingNotFoundError(f"录制文件中没有匹配的请求: {request.method} {request.url}")
+            position = self._positions.get(key, 0)
+            self._positions[key] = position + 1
+            record = records[min(position, len(records) - 1)]
+        logger.debug(f"回放录制的响应: {request.method} {request.url}")
+        return _load_response(record, request)
+
+    def close(self) -> None:
+        if self._file is not None and not self._file.closed:
+            self._file.close()
+            logger.info(f"录制文件已保存: {self.path}")
@@ -2,6 +2,7 @@ from typing import Dict
 from xml.etree import ElementTree as ETree
 from requests import Response, JSONDecodeError
 from utils.logger import logger
+from utils.profiler import profiler
 
 
 def __parse_json(response: Response) -> Dict | None:
@@ -20,14 +21,19 @@ def __parse_json(response: Response) -> Dict | None:
 
 
 
+# XML响应的Content-Type
+XML_CONTENT_TYPES = ("application/xml", "text/xml", "application/soap+xml")
+
+
 def __parse_xml(response: Response) -> ETree.Element | None:
     """
     解析响应的XML数据并返回解析结果。
+    直接解析原始字节，由XML声明决定编码，避免先解码为字符串再重新编码。
     如果解析失败，则返回None。
     """
     logger.debug("开始解析XML响应")
     try:
-        xml_element = ETree.fromstring(response.text)
+        xml_element = ETree.fromstring(response.content)
         logger.info("XML响应解析成功")
         return xml_element
     except ETree.ParseError as e:
@@ -36,10 +42,26 @@ def __parse_xml(response: Response) -> ETree.Element | None:
 
 
 
+def get_content_type(response: Response) -> str:
+    """返回响应的媒体类型（小写，不含charset等参数），没有Content-Type时返回空字符串"""
+    content_type_header = response.headers.get("content-type", "")
+    return content_type_header.split(";")[0].strip().lower()
+
+
+def is_xml_response(response: Response) -> bool:
+    """判断响应是否为XML类型"""
+    return get_content_type(response) in XML_CONTENT_TYPES
+
+
+# 解析结果缓存在响应对象上的属性名，缓存命中的响应会共享同一份解析结果
+PARSED_BODY_ATTR = "parsed_body"
+
+
 def response_handler(response: Response) -> Dict | ETree.Element | str | bytes | int | None:
     """
     根据响应的内容类型处理响应数据并返回处理结果。
     可能的返回值类型为JSON字典、XML元素、纯文本字符串或原始字节流。
+    同一个响应对象只会解析一次。
 
     Args:
     - response: requests.Response对象，表示HTTP响应。
@@ -47,14 +69,25 @@ def response_handler(response: Response) -> Dict | ETree.Element | str | bytes |
     Returns:
     - Union[Dict, ET.Element, str, bytes]: 处理后的响应数据，类型可能是字典、XML元素、字符串或字节流。
     """
+    if PARSED_BODY_ATTR in response.__dict__:
+        logger.debug("使用已缓存的响应解析结果")
+        return response.__dict__[PARSED_BODY_ATTR]
+
+    with profiler.stage("parse"):
+        result = __handle(response)
+    response.__dict__[PARSED_BODY_ATTR] = result
+    return result
+
+
+def __handle(response: Response) -> Dict | ETree.Element | str | bytes | int | None:
+    """按Content-Type解析响应体"""
     logger.debug(f"开始处理响应，状态码: {response.status_code}")
     
-    content_type_header = response.headers.get("content-type", "")
-    if not content_type_header:
+    content_type = get_content_type(response)
+    if not content_type:
         logger.warning("响应头中未找到Content-Type，返回状态码")
         return response.status_code
 
-    content_type = content_type_header.split(";")[0].strip().lower()
     logger.debug(f"响应Content-Type: {content_type}")
 
     match content_type:
@@ -63,7 +96,7 @@ def response_handler(response: Response) -> Dict | ETree.Element | str | bytes |
             if result is None:
                 logger.warning("JSON解析失败，返回None")
             return result
-        case "application/xml" | "text/xml":
+        case "application/xml" | "text/xml" | "application/soap+xml":
             result = __parse_xml(response)
             if result is None:
                 logger.warning("XML解析失败，返回None")
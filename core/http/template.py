@@ -0,0 +1,112 @@
+from typing import Any, Dict, Iterable, Optional
+from requests import PreparedRequest, Request
+from requests.utils import check_header_validity
+from utils.serializer import JsonSerializer, get_serializer
+
+
+# 模板中可以在每次发送时替换的请求部分
+TEMPLATE_FIELDS = ("url", "headers", "params", "data", "json")
+
+
+def set_json_body(prepared: PreparedRequest, body: Optional[bytes]) -> None:
+    """设置已编码的JSON请求体及对应的 Content-Type / Content-Length"""
+    prepared.body = body
+    if body is None:
+        prepared.headers.pop("Content-Length", None)
+        prepared.prepare_content_length(None)
+        return
+    if "Content-Type" not in prepared.headers:
+        prepared.headers["Content-Type"] = "application/json"
+    prepared.headers["Content-Length"] = str(len(body))
+
+
+class RequestTemplate:
+    """预先准备好的请求模板
+
+    创建时对不变的部分（方法、URL、请求头、请求参数、请求体）执行一次 requests 的 prepare，
+    JSON请求体使用可替换的序列化函数编码一次；每次发送时拷贝准备好的请求，
+    只重新处理声明为动态的部分，省去重复的URL解析、请求头合并与请求体编码。
+    """
+
+    __slots__ = ("method", "url", "params", "data", "json", "dynamic", "serializer", "_base")
+
+    def __init__(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        data: Any = None,
+        json: Any = None,
+        dynamic: Iterable[str] = (),
+        serializer: Optional[JsonSerializer] = None,
+    ):
+        """
+        Args:
+            method: 请求方法
+            url: 请求URL，动态URL时作为默认值
+            headers: 不变的请求头
+            params: URL参数
+            data: 表单数据，不支持文件和流式请求体
+            json: JSON请求体
+            dynamic: 每次发送时可替换的部分，取值见 TEMPLATE_FIELDS
+            serializer: JSON序列化函数，为None时使用全局配置
+
+        Raises:
+            ValueError: dynamic 中包含不支持的部分时
+        """
+        self.dynamic = frozenset(dynamic)
+        unknown = self.dynamic - set(TEMPLATE_FIELDS)
+        if unknown:
+            raise ValueError(f"请求模板不支持的动态部分: {sorted(unknown)}，可选值为 {TEMPLATE_FIELDS}")
+        self.method = method
+        self.url = url
+        self.params = params
+        self.data = data
+        self.json = json
+        self.serializer = serializer or get_serializer()
+
+        base = Request(
+            method=method,
+            url=url,
+            headers=None if "headers" in self.dynamic else headers,
+            params=params,
+            data=data,
+        ).prepare()
+        if not data and json is not None:
+            set_json_body(base, self.serializer(json))
+        self._base = base
+
+    def prepare(
+        self,
+        url: Optional[str] = None,
+        headers: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        data: Any = None,
+        json: Any = None,
+    ) -> PreparedRequest:
+        """
+        生成一次发送用的请求，只处理声明为动态的部分，未声明为动态的参数会被忽略
+
+        Returns:
+            PreparedRequest: 新的请求对象，可以安全地修改
+        """
+        dynamic = self.dynamic
+        prepared = self._base.copy()
+        if "url" in dynamic or "params" in dynamic:
+            prepared.prepare_url(
+                url if "url" in dynamic and url else self.url,
+                params if "params" in dynamic else self.params,
+            )
+        if "headers" in dynamic and headers:
+            for name, value in headers.items():
+                check_header_validity((name, value))
+                prepared.headers[name] = value
+        if "data" in dynamic or "json" in dynamic:
+            body_data = data if "data" in dynamic else self.data
+            body_json = json if "json" in dynamic else self.json
+            if body_data:
+                prepared.prepare_body(body_data, None)
+            else:
+                set_json_body(prepared, None if body_json is None else self.serializer(body_json))
+        return prepared
@@ -0,0 +1,167 @@
+"""
+HTTP/2传输
+requests只支持HTTP/1.1，同一host的并发请求各占一个连接。HTTP/2传输基于httpx，在少量连接上多路复用并发请求，
+响应转换为 requests.Response，响应处理、断言、缓存与录制回放无需区分传输方式。
+"""
+
+from typing import TYPE_CHECKING, Any, Dict, Optional
+from requests import ConnectionError as RequestsConnectionError
+from requests import PreparedRequest, Response, Timeout
+from requests.cookies import cookiejar_from_dict
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from utils.logger import logger
+
+if TYPE_CHECKING:
+    import httpx
+
+
+# 可选的传输方式，http1 为requests连接池
+TRANSPORTS = ("http1", "h2")
+
+# HTTP/2禁止逐跳请求头，连接由httpx管理，发送前移除
+_HOP_BY_HOP_HEADERS = frozenset({"connection", "keep-alive", "proxy-connection", "transfer-encoding", "upgrade"})
+
+# 读取流式请求体的块大小
+_READ_CHUNK_SIZE = 64 * 1024
+
+
+def _httpx():
+    # httpx 与 h2 是可选依赖，只在使用HTTP/2传输时导入
+    try:
+        import httpx
+        import h2  # noqa: F401
+    except ImportError as e:
+        raise ImportError("HTTP/2传输需要安装httpx与h2: pip install 'api-test[http2]'") from e
+    return httpx
+
+
+def _content(body: Any) -> Any:
+    """
+    将 PreparedRequest.body 转换为httpx可以发送的请求体
+
+    bytes/str 与生成器直接发送；MultipartEncoder、文件等只有 read 方法的流按块读取，
+    Content-Length 请求头已由requests设置，httpx不会改用分块传输。
+    """
+    if body is None or isinstance(body, (bytes, str)) or not hasattr(body, "read"):
+        return body
+
+    def chunks():
+        while True:
+            chunk = body.read(_READ_CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk.encode("utf-8") if isinstance(chunk, str) else chunk
+
+    return chunks()
+
+
+def to_requests_response(response: "httpx.Response", request: PreparedRequest) -> Response:
+    """
+    将httpx响应转换为 requests.Response
+
+    响应体已完整读取，http_version 属性记录实际使用的协议版本（如 HTTP/2）。
+    """
+    converted = Response()
+    converted.status_code = response.status_code
+    converted.reason = response.reason_phrase
+    # httpx 合并同名响应头的方式与requests一致（以逗号分隔）
+    converted.headers = CaseInsensitiveDict(response.headers.items())
+    converted.encoding = get_encoding_from_headers(converted.headers)
+    converted.url = str(response.url)
+    converted.elapsed = response.elapsed
+    converted._content = response.content
+    converted._content_consumed = True
+    converted.cookies = cookiejar_from_dict({cookie.name: cookie.value for cookie in response.cookies.jar})
+    converted.history = [to_requests_response(item, request) for item in response.history]
+    converted.request = request
+    converted.http_version = response.http_version
+    return converted
+
+
+class Http2Transport:
+    """基于httpx的HTTP/2传输
+
+    https 通过ALPN协商协议，服务端不支持HTTP/2时回退到HTTP/1.1；
+    http 默认使用HTTP/1.1，prior_knowledge 为True时直接使用HTTP/2（h2c），用于内网网关或本地服务。
+    """
+
+    def __init__(self, max_connections: int = 10, prior_knowledge: bool = False, verify: bool = True):
+        """
+        Args:
+            max_connections: 最大连接数，HTTP/2下同一host的并发请求复用同一个连接
+            prior_knowledge: 明文http是否直接使用HTTP/2
+            verify: 是否校验https证书
+        """
+        httpx = _httpx()
+        self.prior_knowledge = prior_knowledge
+        self._httpx = httpx
+        # trust_env=False 与直接调用 Session.send 的行为一致，不读取环境变量中的代理配置
+        self._client = httpx.Client(
+            http1=not prior_knowledge,
+            http2=True,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            verify=verify,
+            follow_redirects=True,
+            trust_env=False,
+        )
+        logger.debug(f"Http2Transport初始化完成，max_connections={max_connections}, prior_knowledge={prior_knowledge}")
+
+    def send(self, request: PreparedRequest, timeout: float) -> Response:
+        """
+        发送已准备好的请求
+
+        Raises:
+            requests.Timeout: 请求超时时
+            requests.ConnectionError: 连接失败或协议错误时
+        """
+        httpx = self._httpx
+        outgoing = self._client.build_request(
+            request.method,
+            request.url,
+            headers=[(name, value) for name, value in request.headers.items() if name.lower() not in _HOP_BY_HOP_HEADERS],
+            content=_content(request.body),
+            timeout=timeout,
+        )
+        try:
+            response = self._client.send(outgoing)
+        except httpx.TimeoutException as e:
+            raise Timeout(str(e), request=request) from e
+        except httpx.TransportError as e:
+            raise RequestsConnectionError(str(e), request=request) from e
+        return to_requests_response(response, request)
+
+    def connection_stats(self) -> Dict[str, int]:
+        """返回当前连接数与空闲连接数，pools 固定为1（所有host共享一个连接池）"""
+        pool: Any = getattr(getattr(self._client, "_transport", None), "_pool", None)
+        connections = list(getattr(pool, "connections", []) or [])
+        return {
+            "pools": 1,
+            "connections": len(connections),
+            "idle": sum(1 for conn in connections if conn.is_idle()),
+        }
+
+    def close(self) -> None:
+        self._client.close()
+
+
+def create_transport(name: str, config: Optional[Dict[str, Any]] = None) -> Optional[Http2Transport]:
+    """
+    按名称创建传输，http1 使用requests自身的连接池，返回None
+
+    Args:
+        name: 传输方式，取值见 TRANSPORTS
+        config: 配置文件中的 Http 配置，读取 h2_max_connections 与 h2_prior_knowledge
+
+    Raises:
+        ValueError: 传输方式不支持时
+    """
+    if name not in TRANSPORTS:
+        raise ValueError(f"不支持的传输方式: {name}，可选值为 {TRANSPORTS}")
+    if name == "http1":
+        return None
+    config = config or {}
+    return Http2Transport(
+        max_connections=int(config.get("h2_max_connections", 4)),
+        prior_knowledge=bool(config.get("h2_prior_knowledge", False)),
+    )
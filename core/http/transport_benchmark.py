@@ -0,0 +1,297 @@
+"""
+传输方式基准测试
+在本机启动HTTP/1.1与HTTP/2（h2c）两个替身服务，用相同的并发数分别通过 http1 连接池与 h2 传输发送请求，
+比较吞吐量、耗时分位数以及服务端实际接受的连接数：
+
+    python -m core.http.transport_benchmark --requests 2000 --concurrency 32 --delay 0.01
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from core.assertion.latency import LatencyStats
+from core.http.client import HTTPClient
+from core.http.transport import Http2Transport
+from utils.logger import logger
+
+
+def _response_body(size: int) -> bytes:
+    filler = "x" * max(0, size - 12)
+    return f'{{"data":"{filler}"}}'.encode("ascii")
+
+
+class Http1StandInServer:
+    """HTTP/1.1替身服务，每个请求等待 delay 秒后返回固定的JSON响应，记录接受的连接数"""
+
+    def __init__(self, delay: float = 0.0, body_bytes: int = 512):
+        self.delay = delay
+        self.body = _response_body(body_bytes)
+        self.connections = 0
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                if stand_in.delay:
+                    time.sleep(stand_in.delay)
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(stand_in.body)))
+                self.end_headers()
+                self.wfile.write(stand_in.body)
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+        class Server(ThreadingHTTPServer):
+            daemon_threads = True
+            lock = threading.Lock()
+
+            def process_request(self, request, client_address) -> None:
+                with self.lock:
+                    stand_in.connections += 1
+                super().process_request(request, client_address)
+
+        self._server = Server(("127.0.0.1", 0), Handler)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}/bench"
+
+    def start(self) -> None:
+        threading.Thread(target=self._server.serve_forever, name="h1-stand-in", daemon=True).start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class _H2Protocol(asyncio.Protocol):
+    """单个h2c连接，请求结束后延迟 delay 秒返回响应，按流量控制窗口分块发送响应体"""
+
+    def __init__(self, server: "H2StandInServer"):
+        import h2.config
+        import h2.connection
+
+        self.server = server
+        self.conn = h2.connection.H2Connection(config=h2.config.H2Configuration(client_side=False))
+        self.transport: Optional[asyncio.Transport] = None
+        self.pending: Dict[int, bytes] = {}
+        self.streams: Dict[int, Dict[str, Any]] = {}
+
+    def connection_made(self, transport: asyncio.Transport) -> None:
+        self.transport = transport
+        self.server.connections += 1
+        self.conn.initiate_connection()
+        transport.write(self.conn.data_to_send())
+
+    def data_received(self, data: bytes) -> None:
+        import h2.events
+        import h2.exceptions
+
+        try:
+            events = self.conn.receive_data(data)
+        except h2.exceptions.ProtocolError:
+            self.transport.write(self.conn.data_to_send())
+            self.transport.close()
+            return
+        loop = asyncio.get_running_loop()
+        for event in events:
+            if isinstance(event, h2.events.RequestReceived) and self.server.record:
+                headers = {name.decode(): value.decode() for name, value in event.headers}
+                self.streams[event.stream_id] = {"method": headers.get(":method"), "path": headers.get(":path"), "headers": headers, "body": b""}
+            elif isinstance(event, h2.events.DataReceived):
+                self.conn.acknowledge_received_data(event.flow_controlled_length, event.stream_id)
+                if event.stream_id in self.streams:
+                    self.streams[event.stream_id]["body"] += event.data
+            elif isinstance(event, h2.events.StreamEnded):
+                request = self.streams.pop(event.stream_id, None)
+                if request is not None:
+                    self.server.requests.append(request)
+                loop.call_later(self.server.delay, self._respond, event.stream_id)
+            elif isinstance(event, h2.events.WindowUpdated):
+                self._flush()
+            elif isinstance(event, h2.events.StreamReset):
+                self.pending.pop(event.stream_id, None)
+            elif isinstance(event, h2.events.ConnectionTerminated):
+                self.transport.close()
+        self.transport.write(self.conn.data_to_send())
+
+    def _respond(self, stream_id: int) -> None:
+        if self.transport.is_closing():
+            return
+        body = self.server.body
+        self.conn.send_headers(
+            stream_id,
+            [(":status", "200"), ("content-type", "application/json"), ("content-length", str(len(body)))],
+        )
+        self.pending[stream_id] = body
+        self._flush()
+
+    def _flush(self) -> None:
+        """在流量控制窗口允许的范围内发送待发送的响应体，其余部分等待 WindowUpdated"""
+        for stream_id, remaining in list(self.pending.items()):
+            while remaining:
+                size = min(len(remaining), self.conn.local_flow_control_window(stream_id), self.conn.max_outbound_frame_size)
+                if size <= 0:
+                    break
+                self.conn.send_data(stream_id, remaining[:size], end_stream=size == len(remaining))
+                remaining = remaining[size:]
+            if remaining:
+                self.pending[stream_id] = remaining
+            else:
+                del self.pending[stream_id]
+        self.transport.write(self.conn.data_to_send())
+
+
+class H2StandInServer:
+    """HTTP/2明文（h2c，prior knowledge）替身服务，在后台线程的事件循环中运行，记录接受的连接数
+
+    record 为True时按接收完成的顺序记录每个请求的方法、路径、请求头与请求体，基准测试默认不记录。
+    """
+
+    def __init__(self, delay: float = 0.0, body_bytes: int = 512, record: bool = False):
+        self.delay = delay
+        self.body = _response_body(body_bytes)
+        self.connections = 0
+        self.record = record
+        self.requests: List[Dict[str, Any]] = []
+        self.port = 0
+        self._loop = asyncio.new_event_loop()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._started = threading.Event()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/bench"
+
+    def start(self) -> None:
+        threading.Thread(target=self._run, name="h2-stand-in", daemon=True).start()
+        self._started.wait()
+
+    def stop(self) -> None:
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._server = self._loop.run_until_complete(
+            self._loop.create_server(lambda: _H2Protocol(self), "127.0.0.1", 0)
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._started.set()
+        self._loop.run_forever()
+        self._server.close()
+
+
+@dataclass
+class BenchmarkResult:
+    """
+    一种传输方式的基准测试结果
+
+    Attributes:
+        transport: 传输方式
+        requests: 请求数
+        concurrency: 并发线程数
+        seconds: 总耗时
+        latency: 单个请求的耗时统计
+        connections: 服务端接受的连接数
+        errors: 失败的请求数
+    """
+
+    transport: str
+    requests: int
+    concurrency: int
+    seconds: float
+    latency: LatencyStats
+    connections: int
+    errors: int
+
+    @property
+    def throughput(self) -> float:
+        return self.requests / self.seconds if self.seconds else 0.0
+
+
+def run_benchmark(client: HTTPClient, url: str, requests: int, concurrency: int) -> tuple[float, List[float], int]:
+    """
+    用 concurrency 个线程共发送 requests 个GET请求
+
+    Returns:
+        tuple[float, List[float], int]: (总耗时, 成功请求的耗时, 失败请求数)
+    """
+
+    def send(_: int) -> Optional[float]:
+        try:
+            response = client.send_request("GET", url, use_cache=False)
+            return response.total_elapsed if response.status_code == 200 else None
+        except Exception:
+            return None
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        samples = list(pool.map(send, range(requests)))
+    seconds = time.perf_counter() - start
+    succeeded = [sample for sample in samples if sample is not None]
+    return seconds, succeeded, len(samples) - len(succeeded)
+
+
+def compare_transports(
+    requests: int = 2000,
+    concurrency: int = 32,
+    delay: float = 0.01,
+    body_bytes: int = 512,
+    h2_connections: int = 1,
+) -> List[BenchmarkResult]:
+    """分别对 http1 连接池与 h2 传输执行基准测试，两种传输先各发送少量请求预热"""
+    results = []
+    for name in ("http1", "h2"):
+        if name == "http1":
+            server = Http1StandInServer(delay, body_bytes)
+            client = HTTPClient(transport="http1", pool_maxsize=concurrency)
+        else:
+            server = H2StandInServer(delay, body_bytes)
+            client = HTTPClient(transport=Http2Transport(max_connections=h2_connections, prior_knowledge=True))
+        server.start()
+        try:
+            run_benchmark(client, server.url, min(requests, concurrency), concurrency)
+            seconds, samples, errors = run_benchmark(client, server.url, requests, concurrency)
+        finally:
+            client.close()
+            server.stop()
+        latency = LatencyStats.from_samples(samples) if samples else LatencyStats(0, 0.0, 0.0, 0.0, 0.0)
+        results.append(BenchmarkResult(name, requests, concurrency, seconds, latency, server.connections, errors))
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m core.http.transport_benchmark", description="比较 http1 与 h2 传输")
+    parser.add_argument("--requests", type=int, default=2000, help="每种传输发送的请求数")
+    parser.add_argument("--concurrency", type=int, default=32, help="并发线程数")
+    parser.add_argument("--delay", type=float, default=0.01, help="替身服务每个请求的处理耗时（秒）")
+    parser.add_argument("--body-bytes", type=int, default=512, help="响应体字节数")
+    parser.add_argument("--h2-connections", type=int, default=1, help="h2传输的最大连接数")
+    parser.add_argument("-v", "--verbose", action="store_true", default=False, help="输出每个请求的日志")
+    args = parser.parse_args(argv)
+    if not args.verbose:
+        # 逐个请求的INFO日志会成为瓶颈，基准测试默认只输出警告
+        logger.logger.setLevel(logging.WARNING)
+
+    results = compare_transports(args.requests, args.concurrency, args.delay, args.body_bytes, args.h2_connections)
+    print(f"{'transport':<10}{'req/s':>10}{'p50(ms)':>10}{'p95(ms)':>10}{'max(ms)':>10}{'conns':>7}{'errors':>8}")
+    for result in results:
+        print(
+            f"{result.transport:<10}{result.throughput:>10.0f}{result.latency.p50 * 1000:>10.1f}"
+            f"{result.latency.p95 * 1000:>10.1f}{result.latency.max * 1000:>10.1f}{result.connections:>7}{result.errors:>8}"
+        )
+    return 1 if any(result.errors for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,376 @@
+import json
+import os
+import re
+import shutil
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+from xml.etree import ElementTree as ETree
+from utils.logger import logger
+
+
+@dataclass
+class CaseResult:
+    """单个用例的执行结果
+
+    Attributes:
+        case_id: 用例唯一ID
+        outcome: 执行结果，passed / failed / error / skipped
+        duration: 用例总耗时（秒）
+        source: 用例所在的数据文件
+        name: 用例名称
+        request: 请求摘要，包含 method、url、status_code
+        timings: 各阶段耗时（秒）
+        failures: 断言失败信息列表
+        error: 非断言异常信息
+        worker: 执行该用例的工作进程标识
+        started_at: 开始执行的时间戳
+    """
+
+    case_id: str
+    outcome: str
+    duration: float
+    source: str = ""
+    name: str = ""
+    request: Dict[str, Any] = field(default_factory=dict)
+    timings: Dict[str, float] = field(default_factory=dict)
+    failures: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+    worker: str = ""
+    started_at: float = 0.0
+
+    @property
+    def passed(self) -> bool:
+        return self.outcome == "passed"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CaseResult":
+        return cls(**data)
+
+
+def worker_id() -> str:
+    """返回当前工作进程标识，pytest-xdist下为 gw0/gw1...，否则为空字符串"""
+    return os.environ.get("PYTEST_XDIST_WORKER", "")
+
+
+def worker_path(path: str | Path, worker: Optional[str] = None) -> Path:
+    """
+    为并行工作进程生成独立的报告文件路径，如 report.jsonl -> report.gw0.jsonl
+
+    Args:
+        path: 报告文件路径
+        worker: 工作进程标识，为None时自动获取
+    """
+    path = Path(path)
+    worker = worker_id() if worker is None else worker
+    if not worker:
+        return path
+    return path.with_name(f"{path.stem}.{worker}{path.suffix}")
+
+
+class ResultReporter:
+    """结果报告器基类
+
+    用例执行完成后调用 report 写入结果，缓冲区达到 batch_size 时批量刷新到文件，
+    内存占用与用例总数无关。全部用例完成后调用 close。
+    """
+
+    def __init__(self, path: str | Path, batch_size: int = 100):
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self._buffer: List[str] = []
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def report(self, result: CaseResult) -> None:
+        """写入一个用例的结果"""
+        self._buffer.append(self._format(result))
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """将缓冲区写入文件"""
+        if not self._buffer:
+            return
+        self._write("".join(self._buffer))
+        self._buffer.clear()
+
+    def close(self) -> None:
+        """刷新剩余结果并关闭报告"""
+        self.flush()
+
+    def _format(self, result: CaseResult) -> str:
+        raise NotImplementedError
+
+    def _write(self, text: str) -> None:
+        raise NotImplementedError
+
+    def __enter__(self) -> "ResultReporter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+class JsonlReporter(ResultReporter):
+    """JSONL格式报告，每行一个用例结果"""
+
+    def __init__(self, path: str | Path, batch_size: int = 100):
+        super().__init__(path, batch_size)
+        self._file = open(self.path, "w", encoding="utf-8")
+        logger.info(f"JSONL报告输出到: {self.path}")
+
+    def _format(self, result: CaseResult) -> str:
+        return json.dumps(result.to_dict(), ensure_ascii=False, default=str) + "\n"
+
+    def _write(self, text: str) -> None:
+        self._file.write(text)
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        super().close()
+        self._file.close()
+        logger.info(f"JSONL报告已完成: {self.path}")
+
+
+# xml.sax.saxutils 会连带导入 urllib.request，这里只需要转义，单独实现
+# XML 1.0 不允许出现除 \t \n \r 以外的控制字符（即使转义为字符引用），替换为 #xNN 形式的可读文本
+_XML_ILLEGAL_CHARS = {code: f"#x{code:02X}" for code in (*range(0x00, 0x09), 0x0B, 0x0C, *range(0x0E, 0x20))}
+_XML_TEXT_ESCAPES = str.maketrans({**_XML_ILLEGAL_CHARS, "&": "&amp;", "<": "&lt;", ">": "&gt;"})
+_XML_ATTR_ESCAPES = str.maketrans(
+    {**_XML_ILLEGAL_CHARS, "&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "\n": "&#10;", "\r": "&#13;", "\t": "&#9;"}
+)
+
+
+def _escape(text: str) -> str:
+    """转义XML文本内容，并替换XML中不合法的控制字符"""
+    return text.translate(_XML_TEXT_ESCAPES)
+
+
+def _quoteattr(value: str) -> str:
+    """转义XML属性值并加上双引号，并替换XML中不合法的控制字符"""
+    return f'"{value.translate(_XML_ATTR_ESCAPES)}"'
+
+
+def _testcase_xml(result: CaseResult) -> str:
+    """将用例结果格式化为JUnit testcase元素"""
+    classname = Path(result.source).stem if result.source else "api"
+    name = result.name or result.case_id
+    parts = [f"  <testcase classname={_quoteattr(classname)} name={_quoteattr(name)} time=\"{result.duration:.6f}\">\n"]
+    if result.outcome == "failed":
+        message = result.failures[0] if result.failures else "assertion failed"
+        parts.append(f"    <failure message={_quoteattr(message)}>{_escape(chr(10).join(result.failures))}</failure>\n")
+    elif result.outcome == "error":
+        parts.append(f"    <error message={_quoteattr(result.error or '')}>{_escape(result.error or '')}</error>\n")
+    elif result.outcome == "skipped":
+        parts.append("    <skipped/>\n")
+    if result.request:
+        summary = " ".join(f"{key}={value}" for key, value in result.request.items())
+        parts.append(f"    <system-out>{_escape(summary)}</system-out>\n")
+    parts.append("  </testcase>\n")
+    return "".join(parts)
+
+
+class JUnitXmlReporter(ResultReporter):
+    """JUnit XML格式报告
+
+    testcase元素先增量写入临时文件，close时再写入包含统计信息的testsuite头部，
+    并以流的方式拷贝临时文件内容，整个过程不在内存中保留全部结果。
+    """
+
+    def __init__(self, path: str | Path, suite_name: str = "api-test", batch_size: int = 100):
+        super().__init__(path, batch_size)
+        self.suite_name = suite_name
+        self._part_path = self.path.with_name(self.path.name + ".part")
+        self._part = open(self._part_path, "w", encoding="utf-8")
+        self._counts = {"tests": 0, "failures": 0, "errors": 0, "skipped": 0}
+        self._time = 0.0
+        self._started_at = time.time()
+        logger.info(f"JUnit XML报告输出到: {self.path}")
+
+    def report(self, result: CaseResult) -> None:
+        self._counts["tests"] += 1
+        if result.outcome == "failed":
+            self._counts["failures"] += 1
+        elif result.outcome == "error":
+            self._counts["errors"] += 1
+        elif result.outcome == "skipped":
+            self._counts["skipped"] += 1
+        self._time += result.duration
+        super().report(result)
+
+    def _format(self, result: CaseResult) -> str:
+        return _testcase_xml(result)
+
+    def _write(self, text: str) -> None:
+        self._part.write(text)
+        self._part.flush()
+
+    def close(self) -> None:
+        if self._part.closed:
+            return
+        super().close()
+        self._part.close()
+        with open(self.path, "w", encoding="utf-8") as out, open(self._part_path, "r", encoding="utf-8") as part:
+            out.write(_suite_header(self.suite_name, self._counts, self._time, self._started_at))
+            shutil.copyfileobj(part, out)
+            out.write("</testsuite>\n")
+        self._part_path.unlink()
+        logger.info(f"JUnit XML报告已完成: {self.path}，共 {self._counts['tests']} 个用例")
+
+
+def _suite_header(name: str, counts: Dict[str, int], duration: float, started_at: float) -> str:
+    timestamp = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(started_at))
+    attrs = " ".join(f'{key}="{value}"' for key, value in counts.items())
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>\n'
+        f'<testsuite name={_quoteattr(name)} {attrs} time="{duration:.6f}" timestamp="{timestamp}">\n'
+    )
+
+
+class MultiReporter:
+    """同时写入多个报告"""
+
+    def __init__(self, reporters: Iterable[ResultReporter]):
+        self.reporters = list(reporters)
+
+    def report(self, result: CaseResult) -> None:
+        for reporter in self.reporters:
+            reporter.report(result)
+
+    def close(self) -> None:
+        for reporter in self.reporters:
+            reporter.close()
+
+
+def create_reporter(
+    jsonl_path: Optional[str | Path] = None,
+    junit_path: Optional[str | Path] = None,
+    worker: Optional[str] = None,
+    batch_size: int = 100,
+) -> Optional[MultiReporter]:
+    """
+    根据输出路径创建报告器，并行执行时每个工作进程写入独立文件
+
+    Returns:
+        Optional[MultiReporter]: 没有指定任何输出路径时返回None
+    """
+    reporters: List[ResultReporter] = []
+    if jsonl_path:
+        reporters.append(JsonlReporter(worker_path(jsonl_path, worker), batch_size))
+    if junit_path:
+        reporters.append(JUnitXmlReporter(worker_path(junit_path, worker), batch_size=batch_size))
+    return MultiReporter(reporters) if reporters else None
+
+
+def iter_jsonl_results(path: str | Path) -> Iterable[CaseResult]:
+    """逐行读取JSONL报告"""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield CaseResult.from_dict(json.loads(line))
+
+
+def merge_jsonl(parts: Iterable[str | Path], output: str | Path) -> int:
+    """
+    合并多个工作进程的JSONL报告
+
+    Returns:
+        int: 合并后的用例数
+    """
+    count = 0
+    with open(output, "w", encoding="utf-8") as out:
+        for part in parts:
+            with open(part, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        out.write(line if line.endswith("\n") else line + "\n")
+                        count += 1
+    logger.info(f"JSONL报告合并完成: {output}，共 {count} 个用例")
+    return count
+
+
+def merge_junit(parts: Iterable[str | Path], output: str | Path, suite_name: str = "api-test") -> int:
+    """
+    合并多个工作进程的JUnit XML报告
+
+    第一遍只读取各文件testsuite元素的统计属性，第二遍以iterparse逐个拷贝testcase元素。
+
+    Returns:
+        int: 合并后的用例数
+    """
+    parts = [Path(part) for part in parts]
+    counts = {"tests": 0, "failures": 0, "errors": 0, "skipped": 0}
+    duration = 0.0
+    for part in parts:
+        for _, element in ETree.iterparse(part, events=("start",)):
+            for key in counts:
+                counts[key] += int(element.get(key, 0))
+            duration += float(element.get("time", 0))
+            break
+
+    with open(output, "w", encoding="utf-8") as out:
+        out.write(_suite_header(suite_name, counts, duration, time.time()))
+        for part in parts:
+            for _, element in ETree.iterparse(part, events=("end",)):
+                if element.tag == "testcase":
+                    out.write("  " + ETree.tostring(element, encoding="unicode").strip() + "\n")
+                    element.clear()
+        out.write("</testsuite>\n")
+    logger.info(f"JUnit XML报告合并完成: {output}，共 {counts['tests']} 个用例")
+    return counts["tests"]
+
+
+def worker_parts(path: str | Path) -> List[Path]:
+    """
+    查找pytest-xdist各工作进程写入的报告文件，如 report.jsonl 对应 report.gw0.jsonl、report.gw1.jsonl
+
+    Returns:
+        List[Path]: 按工作进程序号排序的报告文件
+    """
+    path = Path(path)
+    pattern = re.compile(re.escape(path.stem) + r"\.gw(\d+)" + re.escape(path.suffix))
+    parts = []
+    for candidate in path.parent.glob(f"{path.stem}.gw*{path.suffix}"):
+        match = pattern.fullmatch(candidate.name)
+        if match:
+            parts.append((int(match.group(1)), candidate))
+    return [candidate for _, candidate in sorted(parts)]
+
+
+def merge_worker_reports(
+    jsonl_path: Optional[str | Path] = None,
+    junit_path: Optional[str | Path] = None,
+    suite_name: str = "api-test",
+) -> Dict[str, int]:
+    """
+    将各工作进程的报告合并到原路径，合并完成后删除各工作进程的报告文件，
+    避免下次以更少的工作进程执行时合并到过期的结果
+
+    Args:
+        jsonl_path: JSONL报告路径
+        junit_path: JUnit XML报告路径
+        suite_name: 合并后的testsuite名称
+
+    Returns:
+        Dict[str, int]: 报告路径及合并后的用例数，没有工作进程报告的路径不包含在内
+    """
+    merged: Dict[str, int] = {}
+    for path, merge in ((jsonl_path, merge_jsonl), (junit_path, merge_junit)):
+        if not path:
+            continue
+        parts = worker_parts(path)
+        if not parts:
+            continue
+        if merge is merge_junit:
+            merged[str(path)] = merge_junit(parts, path, suite_name)
+        else:
+            merged[str(path)] = merge_jsonl(parts, path)
+        for part in parts:
+            part.unlink()
+    return merged
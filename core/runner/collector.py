@@ -0,0 +1,119 @@
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional
+from core.runner.state import content_hash
+from utils.file import CASE_FILE_SUFFIXES, FileTypeUtil
+from utils.logger import logger
+from utils.path import PROJECT_ROOT, path_util
+
+
+# 默认的用例数据目录
+DEFAULT_CASE_DIR = PROJECT_ROOT / "test_data"
+
+
+@dataclass(frozen=True, slots=True)
+class CaseRef:
+    """用例引用
+
+    只保存定位用例所需的信息，用例数据在执行时再读取。
+
+    Attributes:
+        case_id: 稳定的用例ID，格式为 <数据文件相对路径>::<用例标识>
+        source: 数据文件路径
+        index: 用例在文件中的行号（Excel）或序号（YAML）
+        name: 用例标识，数据中配置了 case_id 时使用该值，否则为行号/序号
+        content_hash: 用例数据的内容哈希，用于判断用例是否变更
+        extracts: 用例是否配置了变量提取，文件内后续用例可能依赖提取的变量
+    """
+
+    case_id: str
+    source: str
+    index: int
+    name: str
+    content_hash: str = ""
+    extracts: bool = False
+
+
+def relative_source(file_path: str | Path, base_dir: Optional[Path] = None) -> str:
+    """返回数据文件相对用例目录的路径（posix格式），不在用例目录下时返回文件名"""
+    path = Path(file_path).resolve()
+    base = (base_dir or DEFAULT_CASE_DIR).resolve()
+    try:
+        return path.relative_to(base).as_posix()
+    except ValueError:
+        return path.name
+
+
+def make_case_id(file_path: str | Path, index: int, case_data: Dict[str, Any], base_dir: Optional[Path] = None) -> str:
+    """
+    生成稳定的用例ID
+
+    数据中配置了 case_id 时使用 <相对路径>::<case_id>，否则使用 <相对路径>::<行号>，
+    只要用例在文件中的位置或显式ID不变，ID就保持不变。
+    """
+    return f"{relative_source(file_path, base_dir)}::{case_name(index, case_data)}"
+
+
+def case_name(index: int, case_data: Dict[str, Any]) -> str:
+    """用例在文件内的标识"""
+    explicit = case_data.get("case_id")
+    return str(explicit) if explicit not in (None, "") else str(index)
+
+
+def is_case_file(file_path: str | Path) -> bool:
+    """判断文件是否为支持的用例数据文件"""
+    return Path(file_path).suffix.lower() in CASE_FILE_SUFFIXES
+
+
+def iter_file_cases(file_path: str | Path, base_dir: Optional[Path] = None) -> Iterator[tuple[CaseRef, Dict[str, Any]]]:
+    """
+    逐个读取数据文件中的用例
+
+    文件内重复的用例标识（如相同的 case_id）从第二次出现起追加 #行号，保证用例ID唯一。
+
+    Returns:
+        Iterator[tuple[CaseRef, Dict[str, Any]]]: (用例引用, 用例数据) 迭代器
+    """
+    source = str(file_path)
+    relative = relative_source(source, base_dir)
+    seen: set[str] = set()
+    for index, case_data in FileTypeUtil.iter_file_cases(source):
+        name = case_name(index, case_data)
+        if name in seen:
+            # 同一文件内重复的 case_id 会导致用例ID与pytest测试项ID重复，后出现的用例追加行号/序号区分
+            logger.warning(f"{relative} 中的用例标识 {name} 重复，第 {index} 个用例的标识改为 {name}#{index}")
+            name = f"{name}#{index}"
+        seen.add(name)
+        ref = CaseRef(
+            f"{relative}::{name}",
+            source,
+            index,
+            name,
+            content_hash(case_data),
+            extracts=bool(case_data.get("variable")),
+        )
+        yield ref, case_data
+
+
+def iter_case_files(start_path: Optional[str | Path] = None) -> Iterator[str]:
+    """按目录和文件名顺序返回用例数据文件路径"""
+    files_by_dir = path_util(start_path, extensions=list(CASE_FILE_SUFFIXES))
+    for file_path in sorted(path for paths in files_by_dir.values() for path in paths):
+        yield file_path
+
+
+def iter_cases(paths: Optional[Iterable[str | Path]] = None, base_dir: Optional[Path] = None) -> Iterator[tuple[CaseRef, Dict[str, Any]]]:
+    """
+    惰性遍历全部用例，文件按顺序逐个读取，同一时间只持有当前用例的数据
+
+    Args:
+        paths: 数据文件或目录列表，为None时使用默认的test_data目录
+        base_dir: 计算相对路径的用例目录
+
+    Returns:
+        Iterator[tuple[CaseRef, Dict[str, Any]]]: (用例引用, 用例数据) 迭代器
+    """
+    for start_path in paths or [None]:
+        for file_path in iter_case_files(start_path):
+            logger.debug(f"开始读取用例文件: {file_path}")
+            yield from iter_file_cases(file_path, base_dir)
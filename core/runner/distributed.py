@@ -0,0 +1,436 @@
+"""
+分布式执行
+协调者收集数据文件，以文件为工作单元分发给多台机器上的工作节点，工作节点在本地执行用例并把结果逐条发回。
+同一文件内的用例依赖前序用例提取的变量，因此文件是最小的分发单位。
+
+协议为TCP上每行一个JSON消息：
+    工作节点 -> 协调者: hello / ready / result / done / failed / heartbeat
+    协调者 -> 工作节点: welcome / unit / shutdown
+
+工作节点空闲时发送 ready 领取下一个工作单元，执行快的节点自然领取更多单元；
+连接断开或超过心跳超时的节点上未完成的单元重新排队；执行超过租约时间的单元在队列为空时
+分配副本给空闲节点，先完成的副本结果生效，其余副本的结果丢弃。
+结果按工作单元的顺序提交到报告器，与单机顺序执行时的报告顺序一致。
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+from core.assertion.latency import LatencyRecorder
+from core.report.reporter import CaseResult, MultiReporter
+from core.runner.collector import DEFAULT_CASE_DIR
+from core.runner.executor import CaseExecutor
+from core.runner.runner import CaseRunner, RunSummary
+from utils.logger import logger
+
+
+PROTOCOL_VERSION = 1
+
+
+def parse_address(address: str) -> Tuple[str, int]:
+    """
+    解析 host:port 格式的地址
+
+    Raises:
+        ValueError: 格式不正确时
+    """
+    host, sep, port = address.rpartition(":")
+    if not sep or not port.isdigit():
+        raise ValueError(f"地址格式应为 host:port: {address}")
+    return host or "127.0.0.1", int(port)
+
+
+def _send_message(sock: socket.socket, lock: threading.Lock, message: Dict[str, Any]) -> None:
+    data = json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n"
+    with lock:
+        sock.sendall(data)
+
+
+def _read_message(reader: BinaryIO) -> Optional[Dict[str, Any]]:
+    """读取一条消息，连接关闭时返回None"""
+    line = reader.readline()
+    if not line:
+        return None
+    return json.loads(line)
+
+
+def _unit_path(file: str, base_dir: Optional[Path]) -> str:
+    """用例目录下的文件使用相对路径，使各节点可以使用不同的检出目录"""
+    path = Path(file).resolve()
+    try:
+        return path.relative_to((base_dir or DEFAULT_CASE_DIR).resolve()).as_posix()
+    except ValueError:
+        return str(path)
+
+
+@dataclass
+class WorkUnit:
+    """
+    工作单元，对应一个数据文件
+
+    Attributes:
+        unit_id: 序号，结果按序号提交
+        source: 协调者上的数据文件路径，提交结果时作为用例的 source，与单机执行一致
+        file: 下发给工作节点的路径，相对用例目录，不在用例目录下时为绝对路径
+        attempts: 已分配的次数
+        running: 正在执行该单元的节点及开始时间
+        done: 是否已有节点完成
+        results: 完成后待提交的结果
+        latency: 完成后待合并的耗时样本
+    """
+
+    unit_id: int
+    source: str
+    file: str
+    attempts: int = 0
+    running: Dict[str, float] = field(default_factory=dict)
+    done: bool = False
+    results: List[CaseResult] = field(default_factory=list)
+    latency: Dict[str, List[float]] = field(default_factory=dict)
+
+
+class Coordinator:
+    """分布式执行的协调者，每个工作节点连接由一个线程处理"""
+
+    def __init__(
+        self,
+        files: Sequence[str],
+        base_dir: Optional[Path] = None,
+        filters: Sequence[str] = (),
+        reporter: Optional[MultiReporter] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        lease_timeout: float = 300.0,
+        heartbeat_timeout: float = 30.0,
+        max_attempts: int = 3,
+        on_result: Optional[Callable[[CaseResult], None]] = None,
+        latency_recorder: Optional[LatencyRecorder] = None,
+    ):
+        """
+        Args:
+            files: 需要执行的数据文件
+            base_dir: 用例目录，工作节点按相对该目录的路径定位文件
+            filters: 用例筛选条件，下发给工作节点
+            reporter: 结果报告器
+            host: 监听地址
+            port: 监听端口，为0时自动分配
+            lease_timeout: 工作单元执行超过该秒数时允许分配副本给空闲节点
+            heartbeat_timeout: 超过该秒数未收到节点消息时视为节点失效
+            max_attempts: 每个工作单元最多分配的次数，超过后记为异常
+            on_result: 每个结果提交后的回调
+            latency_recorder: 合并各节点耗时样本的记录器
+        """
+        self.units = [WorkUnit(index, str(file), _unit_path(file, base_dir)) for index, file in enumerate(files)]
+        self.filters = list(filters)
+        self.reporter = reporter
+        self.lease_timeout = lease_timeout
+        self.heartbeat_timeout = heartbeat_timeout
+        self.max_attempts = max_attempts
+        self.on_result = on_result
+        self.latency_recorder = latency_recorder or LatencyRecorder()
+        self.summary = RunSummary()
+        self._server = socket.create_server((host, port))
+        self._pending: Deque[int] = deque(range(len(self.units)))
+        self._committed = 0
+        self._workers: Dict[str, socket.socket] = {}
+        self._cond = threading.Condition()
+        self._closed = False
+        self._start = time.perf_counter()
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self._server.getsockname()[:2]
+
+    @property
+    def finished(self) -> bool:
+        return self._committed == len(self.units)
+
+    def start(self) -> None:
+        """开始接受工作节点连接"""
+        self._start = time.perf_counter()
+        threading.Thread(target=self._accept_loop, name="coordinator-accept", daemon=True).start()
+        host, port = self.address
+        logger.info(f"协调者已启动: {host}:{port}，共 {len(self.units)} 个工作单元")
+
+    def wait(self, alive: Optional[Callable[[], bool]] = None, poll_interval: float = 1.0) -> RunSummary:
+        """
+        等待全部工作单元完成
+
+        Args:
+            alive: 检查是否还有可能连接的工作节点，返回False且没有已连接节点时停止等待
+            poll_interval: 检查间隔（秒）
+
+        Raises:
+            RuntimeError: 全部工作节点已退出而仍有未完成的工作单元时
+        """
+        with self._cond:
+            while not self.finished:
+                self._cond.wait(poll_interval)
+                if alive is not None and not self._workers and not self.finished and not alive():
+                    raise RuntimeError(f"全部工作节点已退出，仍有 {len(self.units) - self._committed} 个工作单元未完成")
+            self.summary.duration = time.perf_counter() - self._start
+        logger.info(
+            f"分布式执行完成: 共 {self.summary.total} 个用例，通过 {self.summary.passed}，"
+            f"失败 {self.summary.failed}，异常 {self.summary.errors}，耗时 {self.summary.duration:.3f}秒"
+        )
+        return self.summary
+
+    def close(self) -> None:
+        """停止监听，通知仍在等待工作单元的连接退出"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._server.close()
+
+    def _accept_loop(self) -> None:
+        while not self._closed:
+            try:
+                conn, address = self._server.accept()
+            except OSError:
+                break
+            threading.Thread(target=self._serve, args=(conn, address), name=f"coordinator-{address[1]}", daemon=True).start()
+
+    def _register(self, name: str, conn: socket.socket) -> str:
+        with self._cond:
+            worker, suffix = name, 1
+            while worker in self._workers:
+                suffix += 1
+                worker = f"{name}#{suffix}"
+            self._workers[worker] = conn
+        logger.info(f"工作节点已连接: {worker}")
+        return worker
+
+    def _serve(self, conn: socket.socket, address: Tuple[str, int]) -> None:
+        """处理一个工作节点连接"""
+        conn.settimeout(self.heartbeat_timeout)
+        reader = conn.makefile("rb")
+        lock = threading.Lock()
+        worker = None
+        current: Optional[int] = None
+        results: List[CaseResult] = []
+        try:
+            hello = _read_message(reader)
+            if not hello or hello.get("type") != "hello" or hello.get("version") != PROTOCOL_VERSION:
+                logger.warning(f"拒绝不兼容的工作节点连接: {address}, {hello}")
+                return
+            worker = self._register(hello.get("worker") or f"{address[0]}:{address[1]}", conn)
+            _send_message(conn, lock, {"type": "welcome", "worker": worker, "filters": self.filters})
+            while True:
+                message = _read_message(reader)
+                if message is None:
+                    break
+                kind = message.get("type")
+                if kind == "heartbeat":
+                    continue
+                if kind == "ready":
+                    unit = self._next_unit(worker)
+                    if unit is None:
+                        _send_message(conn, lock, {"type": "shutdown"})
+                        break
+                    current, results = unit.unit_id, []
+                    _send_message(conn, lock, {"type": "unit", "unit_id": unit.unit_id, "file": unit.file})
+                elif kind == "result" and message.get("unit_id") == current:
+                    results.append(CaseResult.from_dict(message["result"]))
+                elif kind == "done" and message.get("unit_id") == current:
+                    self._complete(current, worker, results, message.get("latency") or {})
+                    current, results = None, []
+                elif kind == "failed" and message.get("unit_id") == current:
+                    self._fail(current, worker, message.get("error") or "")
+                    current, results = None, []
+        except socket.timeout:
+            logger.warning(f"工作节点 {worker or address} 超过 {self.heartbeat_timeout} 秒无响应，视为失效")
+        except (OSError, ValueError) as e:
+            logger.warning(f"工作节点 {worker or address} 连接异常: {e}")
+        finally:
+            if worker is not None:
+                self._release(worker)
+            reader.close()
+            conn.close()
+
+    def _next_unit(self, worker: str) -> Optional[WorkUnit]:
+        """为节点分配下一个工作单元，全部完成时返回None"""
+        with self._cond:
+            while not self._closed and not self.finished:
+                while self._pending:
+                    unit = self.units[self._pending.popleft()]
+                    if not unit.done:
+                        return self._assign(unit, worker)
+                unit = self._straggler(worker)
+                if unit is not None:
+                    logger.warning(f"工作单元 {unit.file} 执行超过 {self.lease_timeout} 秒，分配副本给 {worker}")
+                    return self._assign(unit, worker)
+                self._cond.wait(min(1.0, self.lease_timeout))
+            return None
+
+    def _assign(self, unit: WorkUnit, worker: str) -> WorkUnit:
+        unit.attempts += 1
+        unit.running[worker] = time.monotonic()
+        logger.debug(f"分配工作单元 {unit.file} 给 {worker}（第 {unit.attempts} 次）")
+        return unit
+
+    def _straggler(self, worker: str) -> Optional[WorkUnit]:
+        """返回执行时间最长且超过租约时间、可以分配副本的工作单元"""
+        now = time.monotonic()
+        candidates = [
+            (now - min(unit.running.values()), unit)
+            for unit in self.units
+            if not unit.done and unit.running and worker not in unit.running and unit.attempts < self.max_attempts
+        ]
+        candidates = [item for item in candidates if item[0] > self.lease_timeout]
+        return max(candidates, key=lambda item: item[0])[1] if candidates else None
+
+    def _complete(self, unit_id: int, worker: str, results: List[CaseResult], latency: Dict[str, List[float]]) -> None:
+        with self._cond:
+            unit = self.units[unit_id]
+            unit.running.pop(worker, None)
+            if unit.done:
+                logger.info(f"工作单元 {unit.file} 已由其他节点完成，丢弃 {worker} 的结果")
+                return
+            for result in results:
+                result.source = unit.source
+                result.worker = result.worker or worker
+            unit.done, unit.results, unit.latency = True, results, latency
+            self._commit_ready()
+            self._cond.notify_all()
+
+    def _fail(self, unit_id: int, worker: str, error: str) -> None:
+        with self._cond:
+            unit = self.units[unit_id]
+            unit.running.pop(worker, None)
+            logger.warning(f"工作单元 {unit.file} 在 {worker} 上执行失败: {error}")
+            self._retry(unit, error)
+
+    def _release(self, worker: str) -> None:
+        """节点断开时将其未完成的工作单元重新排队"""
+        with self._cond:
+            self._workers.pop(worker, None)
+            for unit in self.units:
+                if unit.running.pop(worker, None) is not None and not unit.done:
+                    logger.warning(f"工作节点 {worker} 断开，工作单元 {unit.file} 重新排队")
+                    self._retry(unit, f"工作节点 {worker} 断开")
+            self._cond.notify_all()
+        logger.info(f"工作节点已断开: {worker}")
+
+    def _retry(self, unit: WorkUnit, error: str) -> None:
+        """重新排队，其他副本仍在执行时等待副本结果，超过分配次数时记为异常"""
+        if unit.done or unit.running:
+            return
+        if unit.attempts < self.max_attempts:
+            self._pending.appendleft(unit.unit_id)
+        else:
+            result = CaseResult(case_id=unit.file, outcome="error", duration=0.0, source=unit.source, error=error)
+            unit.done, unit.results = True, [result]
+            self._commit_ready()
+        self._cond.notify_all()
+
+    def _commit_ready(self) -> None:
+        """按工作单元顺序提交已完成的结果"""
+        while self._committed < len(self.units) and self.units[self._committed].done:
+            unit = self.units[self._committed]
+            for result in unit.results:
+                self.summary.add(result)
+                if self.reporter:
+                    self.reporter.report(result)
+                if self.on_result:
+                    self.on_result(result)
+            for case_id, samples in unit.latency.items():
+                self.latency_recorder.extend(case_id, samples)
+            unit.results, unit.latency = [], {}
+            self._committed += 1
+
+
+class Worker:
+    """分布式执行的工作节点，从协调者领取工作单元并在本地执行"""
+
+    def __init__(
+        self,
+        executor: CaseExecutor,
+        host: str,
+        port: int,
+        name: Optional[str] = None,
+        base_dir: Optional[Path] = None,
+        heartbeat_interval: float = 5.0,
+    ):
+        """
+        Args:
+            executor: 用例执行器，多个工作节点线程可以共享，每个工作单元使用独立的变量作用域
+            host: 协调者地址
+            port: 协调者端口
+            name: 节点名称，默认为 主机名-进程号
+            base_dir: 用例目录，相对路径的工作单元在该目录下查找
+            heartbeat_interval: 心跳间隔（秒），应小于协调者的心跳超时
+        """
+        self.executor = executor
+        self.host = host
+        self.port = port
+        self.name = name or f"{socket.gethostname()}-{os.getpid()}"
+        self.base_dir = base_dir or DEFAULT_CASE_DIR
+        self.heartbeat_interval = heartbeat_interval
+        self.units = 0
+
+    def run(self) -> int:
+        """
+        连接协调者并执行工作单元直到协调者通知退出，返回执行的工作单元数
+
+        Raises:
+            ConnectionError: 连接协调者失败或协议不兼容时
+        """
+        with socket.create_connection((self.host, self.port)) as sock, sock.makefile("rb") as reader:
+            lock = threading.Lock()
+            _send_message(sock, lock, {"type": "hello", "version": PROTOCOL_VERSION, "worker": self.name})
+            welcome = _read_message(reader)
+            if not welcome or welcome.get("type") != "welcome":
+                raise ConnectionError(f"协调者拒绝连接: {welcome}")
+            self.name = welcome.get("worker", self.name)
+            logger.info(f"工作节点 {self.name} 已连接协调者 {self.host}:{self.port}")
+
+            stopped = threading.Event()
+            heartbeat = threading.Thread(target=self._heartbeat, args=(sock, lock, stopped), daemon=True)
+            heartbeat.start()
+            try:
+                while True:
+                    _send_message(sock, lock, {"type": "ready"})
+                    message = _read_message(reader)
+                    if message is None or message.get("type") == "shutdown":
+                        break
+                    if message.get("type") == "unit":
+                        self._run_unit(sock, lock, message, welcome.get("filters") or [])
+            finally:
+                stopped.set()
+        logger.info(f"工作节点 {self.name} 退出，共执行 {self.units} 个工作单元")
+        return self.units
+
+    def _heartbeat(self, sock: socket.socket, lock: threading.Lock, stopped: threading.Event) -> None:
+        while not stopped.wait(self.heartbeat_interval):
+            try:
+                _send_message(sock, lock, {"type": "heartbeat"})
+            except OSError:
+                break
+
+    def _run_unit(self, sock: socket.socket, lock: threading.Lock, message: Dict[str, Any], filters: List[str]) -> None:
+        unit_id = message["unit_id"]
+        path = Path(message["file"])
+        if not path.is_absolute():
+            path = self.base_dir / path
+        case_ids: List[str] = []
+
+        def send_result(result: CaseResult) -> None:
+            case_ids.append(result.case_id)
+            _send_message(sock, lock, {"type": "result", "unit_id": unit_id, "result": result.to_dict()})
+
+        runner = CaseRunner(self.executor, filters=filters, base_dir=self.base_dir, on_result=send_result)
+        try:
+            runner.run_file(str(path))
+        except Exception as e:
+            logger.error(f"工作单元 {message['file']} 执行失败: {e}")
+            _send_message(sock, lock, {"type": "failed", "unit_id": unit_id, "error": f"{type(e).__name__}: {e}"})
+            return
+        latency = {case_id: self.executor.latency_recorder.pop(case_id) for case_id in case_ids}
+        _send_message(sock, lock, {"type": "done", "unit_id": unit_id, "latency": latency})
+        self.units += 1
@@ -0,0 +1,223 @@
+import threading
+import time
+import traceback
+import weakref
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+from requests import Response
+from core.assertion.latency import LatencyBaseline, LatencyRecorder, assert_latency
+from core.assertion.plan import AssertionPlan, compile_assertions, response_seconds
+from core.http.client import HTTPClient
+from core.http.response import response_handler
+from core.http.template import RequestTemplate
+from core.report.reporter import CaseResult, worker_id
+from data.case import Case, RenderedRequest
+from utils import constant
+from utils.constant import VariableCache
+from utils.jsonpath import jsonpath
+from utils.logger import logger
+from utils.profiler import profiler
+
+
+@contextmanager
+def _stage(timings: Dict[str, float], name: str) -> Iterator[None]:
+    """记录阶段耗时到用例结果中，启用剖析时同时计入全局阶段统计"""
+    start = time.perf_counter()
+    try:
+        with profiler.stage(name):
+            yield
+    finally:
+        timings[name] = timings.get(name, 0.0) + time.perf_counter() - start
+
+
+class CaseExecutor:
+    """用例执行器
+
+    按 数据处理 -> 变量替换 -> 发送请求 -> 断言 -> 耗时检查 -> 变量提取 的顺序执行单个用例，
+    并返回包含各阶段耗时和失败信息的 CaseResult。
+    """
+
+    def __init__(
+        self,
+        client: HTTPClient,
+        latency_recorder: Optional[LatencyRecorder] = None,
+        latency_baseline: Optional[LatencyBaseline] = None,
+    ):
+        self.client = client
+        self.latency_recorder = latency_recorder or LatencyRecorder()
+        self.latency_baseline = latency_baseline
+        # 每个用例的请求模板，用例对象释放后自动移除
+        self._templates: "weakref.WeakKeyDictionary[Case, RequestTemplate]" = weakref.WeakKeyDictionary()
+        self._templates_lock = threading.Lock()
+        # 每个用例编译后的断言计划，重复执行和重跑时不再重新编译
+        self._plans: "weakref.WeakKeyDictionary[Case, AssertionPlan]" = weakref.WeakKeyDictionary()
+        self._plans_lock = threading.Lock()
+
+    def prepare(
+        self,
+        case: Case | Dict[str, Any],
+        timings: Optional[Dict[str, float]] = None,
+        variables: Optional[VariableCache] = None,
+    ) -> RenderedRequest:
+        """替换变量并处理文件/表单/JSON数据，生成本次执行的请求数据，不修改用例本身"""
+        timings = {} if timings is None else timings
+        if not isinstance(case, Case):
+            case = Case.from_dict(case)
+        with _stage(timings, "replace"):
+            request = case.render(process_body=False, variables=variables)
+        if case.data_type:
+            with _stage(timings, "data_processing"):
+                case.process_body(request)
+        return request
+
+    def execute(
+        self,
+        case_data: Case | Dict[str, Any],
+        case_id: str,
+        source: str = "",
+        variables: Optional[VariableCache] = None,
+    ) -> CaseResult:
+        """
+        执行单个用例
+
+        Args:
+            case_data: 用例，也可以是从数据文件读取的用例字典
+            case_id: 用例唯一ID
+            source: 用例所在的数据文件
+            variables: 变量作用域，替换和提取的变量都在其中，为None时使用全局变量缓存；
+                并发执行多个数据文件时每个文件应使用独立的作用域
+
+        Returns:
+            CaseResult: 执行结果，断言失败时 outcome 为 failed，其他异常为 error
+        """
+        timings: Dict[str, float] = {}
+        result = CaseResult(
+            case_id=case_id,
+            outcome="passed",
+            duration=0.0,
+            source=source,
+            name=case_id,
+            timings=timings,
+            worker=worker_id(),
+            started_at=time.time(),
+        )
+        start = time.perf_counter()
+        request: Optional[RenderedRequest] = None
+        try:
+            case = case_data if isinstance(case_data, Case) else Case.from_dict(case_data)
+            result.name = case.name or case_id
+            request = self.prepare(case, timings, variables)
+            result.request = {"method": request.method, "url": request.url}
+
+            # 断言计划按用例缓存，单次解析响应体并汇总全部断言失败
+            assertion_plan = self.assertion_plan(case)
+            response = None
+            # repeat 大于1时重复执行用例，用于计算 p50/p95 耗时
+            for iteration in range(case.repeat):
+                if iteration and not case.templatable:
+                    # 上传文件与multipart编码器在发送时被读取到末尾，每次重复都重新生成请求数据
+                    request.close()
+                    request = self.prepare(case, timings, variables)
+                with _stage(timings, "request"):
+                    response = self.send(request, case)
+                result.request["status_code"] = response.status_code
+                # 缓存命中的响应没有真实的请求耗时，不计入耗时统计
+                if not getattr(response, "from_cache", False):
+                    self.latency_recorder.record(case_id, response_seconds(response))
+
+                with _stage(timings, "assert"):
+                    failures = assertion_plan.evaluate(response)
+                if failures:
+                    result.outcome = "failed"
+                    result.failures = [str(failure) for failure in failures]
+                    return result
+
+            latency_stats = self.latency_recorder.stats(case_id)
+            if latency_stats is not None:
+                assert_latency(case_id, latency_stats, case.latency)
+                if self.latency_baseline:
+                    self.latency_baseline.check_regression(case_id, latency_stats)
+
+            with _stage(timings, "extract"):
+                self.extract_variables(case, response, variables)
+        except AssertionError as e:
+            result.outcome = "failed"
+            result.failures.append(str(e))
+        except Exception as e:
+            logger.error(f"用例 {case_id} 执行异常: {e}")
+            result.outcome = "error"
+            result.error = f"{type(e).__name__}: {e}\n{traceback.format_exc()}"
+        finally:
+            # 上传文件在请求发送后关闭，避免长时间运行时文件句柄泄漏
+            if request is not None:
+                request.close()
+            result.duration = time.perf_counter() - start
+        return result
+
+    def send(self, request: RenderedRequest, case: Optional[Case] = None) -> Response:
+        """
+        发送本次执行的请求
+
+        传入用例时使用该用例的请求模板，不变的部分只准备一次，重复执行时只重新处理包含变量的部分
+        """
+        if case is not None and case.templatable:
+            return self.client.send_template(
+                self.template(case, request),
+                url=request.url,
+                headers=request.headers,
+                params=request.params,
+                data=request.data,
+                json=request.json,
+                use_cache=request.use_cache,
+            )
+        return self.client.send_request(
+            method=request.method,
+            url=request.url,
+            headers=request.headers,
+            params=request.params,
+            data=request.data,
+            json=request.json,
+            files=request.files,
+            use_cache=request.use_cache,
+        )
+
+    def template(self, case: Case, request: RenderedRequest) -> RequestTemplate:
+        """获取用例的请求模板，首次使用时以本次生成的请求数据创建"""
+        template = self._templates.get(case)
+        if template is None:
+            with self._templates_lock:
+                template = self._templates.get(case)
+                if template is None:
+                    template = self.client.create_template(
+                        method=request.method,
+                        url=request.url,
+                        headers=request.headers,
+                        params=request.params,
+                        data=request.data,
+                        json=request.json,
+                        dynamic=case.template_dynamic,
+                    )
+                    self._templates[case] = template
+        return template
+
+    def assertion_plan(self, case: Case) -> AssertionPlan:
+        """获取用例编译后的断言计划，同一个用例对象只编译一次"""
+        plan = self._plans.get(case)
+        if plan is None:
+            with self._plans_lock:
+                plan = self._plans.get(case)
+                if plan is None:
+                    plan = compile_assertions(case.exception)
+                    self._plans[case] = plan
+        return plan
+
+    @staticmethod
+    def extract_variables(case: Case, response: Optional[Response], variables: Optional[VariableCache] = None) -> None:
+        """按用例的 variable 配置从响应中提取变量，写入指定的变量作用域，为None时写入全局变量缓存"""
+        if not case.variable or response is None:
+            return
+        cache = constant.variable_cache if variables is None else variables
+        body = response_handler(response)
+        for var_name, expression in case.variable:
+            values = jsonpath(body, expression)
+            cache.set_value(var_name, values[0] if values else None)
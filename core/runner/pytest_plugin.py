@@ -0,0 +1,280 @@
+"""
+数据驱动用例的pytest插件
+将数据文件中的每一行用例展开为独立的测试项，测试项ID稳定，可以单独选择、重跑和并行执行
+"""
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterator, Optional
+import pytest
+from core.report.reporter import CaseResult, MultiReporter, create_reporter, merge_worker_reports
+from core.runner.collector import CaseRef, is_case_file, iter_file_cases
+from core.runner.state import ORDER_MODES, SELECT_MODES, RunState
+from data.case import Case
+from utils import config_reader
+from utils.constant import VariableCache, variable_cache
+from utils.file import FileTypeUtil
+from utils.logger import logger
+from utils.path import PROJECT_ROOT
+from utils.profiler import profiler
+
+if TYPE_CHECKING:
+    # 执行器依赖requests等较慢的模块，只在首次执行用例时导入，--collect-only 不需要加载
+    from core.runner.executor import CaseExecutor
+
+class CaseFailure(Exception):
+    """用例断言失败或执行异常，携带执行结果用于生成失败信息"""
+
+    def __init__(self, result: CaseResult):
+        super().__init__(result.case_id)
+        self.result = result
+
+
+class ApiTestState:
+    """一次pytest会话内共享的执行器、报告器与耗时基线，首次执行用例时才创建"""
+
+    def __init__(self, config: pytest.Config):
+        self.config = config
+        self._executor: Optional["CaseExecutor"] = None
+        self._reporter: Optional[MultiReporter] = None
+        self._run_state: Optional[RunState] = None
+
+    @property
+    def run_state(self) -> RunState:
+        if self._run_state is None:
+            self._run_state = RunState(self.config.getoption("--run-state"))
+        return self._run_state
+
+    @property
+    def executor(self) -> "CaseExecutor":
+        if self._executor is None:
+            from core.assertion.latency import LatencyBaseline, LatencyRecorder
+            from core.http.auth import TokenManager
+            from core.http.cache import ResponseCache
+            from core.http.client import HTTPClient
+            from core.runner.executor import CaseExecutor
+
+            self._executor = CaseExecutor(
+                HTTPClient(cache=ResponseCache.from_config(), auth=TokenManager.from_config()),
+                LatencyRecorder(),
+                LatencyBaseline.from_config(),
+            )
+            self._reporter = create_reporter(
+                jsonl_path=self.config.getoption("--report-jsonl"),
+                junit_path=self.config.getoption("--report-junit"),
+                batch_size=self.config.getoption("--report-batch-size"),
+            )
+        return self._executor
+
+    def report(self, result: CaseResult) -> None:
+        if self._reporter:
+            self._reporter.report(result)
+
+    def close(self) -> None:
+        if self._run_state is not None:
+            self._run_state.close()
+        if self._executor is None:
+            return
+        baseline = self._executor.latency_baseline
+        # 按配置使用本次耗时更新基线
+        if baseline and config_reader.get_latency_config().get("update_baseline"):
+            baseline.update(self._executor.latency_recorder.all_stats())
+            baseline.save()
+        if self._reporter:
+            self._reporter.close()
+        # 清理全局变量缓存
+        variable_cache.clear()
+
+
+_STATE_KEY = pytest.StashKey[ApiTestState]()
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("api-test")
+    group.addoption("--report-jsonl", default=None, help="逐个用例写入JSONL格式结果的文件路径")
+    group.addoption("--report-junit", default=None, help="逐个用例写入JUnit XML格式结果的文件路径")
+    group.addoption("--report-batch-size", type=int, default=100, help="结果批量刷新到文件的用例数")
+    group.addoption(
+        "--run-state",
+        default=str(PROJECT_ROOT / ".api_test_state.sqlite"),
+        help="持久化用例执行状态的SQLite文件路径",
+    )
+    group.addoption(
+        "--case-select",
+        choices=SELECT_MODES,
+        default="all",
+        help="按历史状态筛选用例：all 全部，failed 上次失败，changed 内容变更或从未通过，failed-changed 两者并集",
+    )
+    group.addoption(
+        "--case-order",
+        choices=ORDER_MODES,
+        default="default",
+        help="按历史状态排序用例；只在数据文件内排序，同一文件的用例保持连续，配置了变量提取的文件保持原有顺序",
+    )
+    group.addoption("--profile", action="store_true", default=False, help="统计用例执行流水线各阶段的耗时")
+    group.addoption(
+        "--profile-sampling",
+        action="store_true",
+        default=False,
+        help="同时启用采样剖析，输出火焰图可用的collapsed调用栈文件（隐含--profile）",
+    )
+    group.addoption("--profile-dir", default=str(PROJECT_ROOT / "profile"), help="剖析结果输出目录")
+    group.addoption("--api-config", default=None, help="配置文件路径，默认按 API_TEST_CONFIG、./config/base_config.yaml、随包默认配置的顺序查找")
+    parser.addini("api_case_dirs", type="paths", default=[], help="用例数据目录，默认为项目根目录下的test_data")
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.stash[_STATE_KEY] = ApiTestState(config)
+    if config.getoption("--api-config"):
+        config_reader.set_config_path(config.getoption("--api-config"))
+    if config.getoption("--profile") or config.getoption("--profile-sampling"):
+        profiler.enable(sampling=config.getoption("--profile-sampling"))
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    config = session.config
+    config.stash[_STATE_KEY].close()
+    if not hasattr(config, "workerinput") and config.pluginmanager.has_plugin("dsession"):
+        # pytest-xdist的控制进程（注册了dsession插件）在全部工作进程结束后合并各工作进程写入的报告；
+        # 未并行执行时报告直接写入原路径，不能被之前并行执行残留的文件覆盖
+        merge_worker_reports(config.getoption("--report-jsonl"), config.getoption("--report-junit"))
+    if profiler.enabled:
+        profiler.disable()
+        profiler.write_report(session.config.getoption("--profile-dir"))
+
+
+def pytest_terminal_summary(terminalreporter: Any, config: pytest.Config) -> None:
+    if config.getoption("--profile") or config.getoption("--profile-sampling"):
+        terminalreporter.write_sep("-", "api-test 流水线阶段耗时")
+        terminalreporter.write_line(profiler.format_report())
+        terminalreporter.write_line(f"剖析结果目录: {config.getoption('--profile-dir')}")
+
+
+def pytest_collection_modifyitems(session: pytest.Session, config: pytest.Config, items: list[pytest.Item]) -> None:
+    select = config.getoption("--case-select")
+    order = config.getoption("--case-order")
+    if select == "all" and order == "default":
+        return
+    run_state = config.stash[_STATE_KEY].run_state
+
+    keep = [
+        not isinstance(item, CaseItem) or run_state.is_selected(item.ref.case_id, item.ref.content_hash, select)
+        for item in items
+    ]
+    # 选中的用例可能依赖文件内前序用例提取的变量，同时保留这些前序的变量提取用例
+    needed: set[pytest.Collector] = set()
+    for index in range(len(items) - 1, -1, -1):
+        item = items[index]
+        if not keep[index] and isinstance(item, CaseItem) and item.ref.extracts and item.parent in needed:
+            keep[index] = True
+        if keep[index]:
+            needed.add(item.parent)
+    selected = [item for item, kept in zip(items, keep) if kept]
+    deselected = [item for item, kept in zip(items, keep) if not kept]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        logger.info(f"按 {select} 模式筛选用例，执行 {len(selected)} 个，跳过 {len(deselected)} 个")
+
+    items[:] = run_state.order(
+        selected,
+        order,
+        key=lambda item: item.ref.case_id if isinstance(item, CaseItem) else item.nodeid,
+        group=lambda item: item.parent,
+        pinned=_has_dependencies,
+    )
+
+
+def _has_dependencies(items: list[pytest.Item]) -> bool:
+    """文件内有用例提取变量时，后续用例可能依赖提取的变量，保持文件内原有顺序"""
+    pinned = any(isinstance(item, CaseItem) and item.ref.extracts for item in items)
+    if pinned:
+        logger.info(f"{items[0].parent.nodeid} 包含变量提取，保持文件内原有顺序")
+    return pinned
+
+
+def _case_dirs(config: pytest.Config) -> list[Path]:
+    return [Path(path).resolve() for path in config.getini("api_case_dirs")] or [(PROJECT_ROOT / "test_data").resolve()]
+
+
+def pytest_collect_file(file_path: Path, parent: pytest.Collector) -> Optional["CaseFile"]:
+    if not is_case_file(file_path):
+        return None
+    resolved = file_path.resolve()
+    for case_dir in _case_dirs(parent.config):
+        if resolved.is_relative_to(case_dir):
+            return CaseFile.from_parent(parent, path=file_path, case_dir=case_dir)
+    return None
+
+
+class CaseFile(pytest.File):
+    """用例数据文件
+
+    收集时逐行读取文件，只为每个用例生成轻量的测试项，不保留用例数据；
+    执行该文件的第一个用例时再读取数据，文件内用例全部执行完后释放。
+    与命令行执行一致，每个文件使用独立的变量作用域。
+    """
+
+    def __init__(self, *, case_dir: Path, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.case_dir = case_dir
+        self._cases: Optional[Dict[int, Case | Dict[str, Any]]] = None
+        self._variables: Optional[VariableCache] = None
+
+    def collect(self) -> Iterator["CaseItem"]:
+        cases = iter_file_cases(self.path, self.case_dir)
+        while True:
+            with profiler.stage("load"):
+                ref, _ = next(cases, (None, None))
+            if ref is None:
+                return
+            yield CaseItem.from_parent(self, name=ref.name, ref=ref)
+
+    def get_case(self, index: int) -> Case:
+        """读取文件内指定行号/序号的用例"""
+        if self._cases is None:
+            logger.debug(f"加载用例文件数据: {self.path}")
+            with profiler.stage("load"):
+                self._cases = dict(FileTypeUtil.iter_file_cases(str(self.path)))
+        case = self._cases[index]
+        # 首次执行时再转换为 Case，单行数据有误只影响该用例
+        if not isinstance(case, Case):
+            case = self._cases[index] = Case.from_dict(case)
+        return case
+
+    @property
+    def variables(self) -> VariableCache:
+        """文件内用例共享的变量作用域"""
+        if self._variables is None:
+            self._variables = VariableCache()
+        return self._variables
+
+    def teardown(self) -> None:
+        self._cases = None
+        self._variables = None
+
+
+class CaseItem(pytest.Item):
+    """单个数据驱动用例"""
+
+    def __init__(self, *, ref: CaseRef, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.ref = ref
+
+    def runtest(self) -> None:
+        state = self.config.stash[_STATE_KEY]
+        case_data = self.parent.get_case(self.ref.index)
+        result = state.executor.execute(case_data, self.ref.case_id, source=self.ref.source, variables=self.parent.variables)
+        state.report(result)
+        state.run_state.record(result, self.ref.content_hash)
+        if not result.passed:
+            raise CaseFailure(result)
+
+    def repr_failure(self, excinfo: pytest.ExceptionInfo[BaseException], style: Optional[str] = None) -> str:
+        if isinstance(excinfo.value, CaseFailure):
+            result = excinfo.value.result
+            if result.outcome == "error":
+                return f"用例 {result.case_id} 执行异常:\n{result.error}"
+            return f"用例 {result.case_id} 断言失败:\n" + "\n".join(result.failures)
+        return super().repr_failure(excinfo, style)
+
+    def reportinfo(self) -> tuple[Path, Optional[int], str]:
+        return self.path, self.ref.index, f"case: {self.ref.case_id}"
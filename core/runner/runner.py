@@ -0,0 +1,216 @@
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+from core.report.reporter import CaseResult, MultiReporter
+from core.runner.collector import CaseRef, iter_case_files, iter_file_cases, relative_source
+from core.runner.executor import CaseExecutor
+from data.case import Case
+from utils.constant import VariableCache
+from utils.logger import logger
+
+
+def shard_of(source: str, shard_count: int) -> int:
+    """按数据文件的相对路径计算所属分片，新增或删除其他文件不影响已有文件的分片"""
+    return zlib.crc32(source.encode("utf-8")) % shard_count
+
+
+def select_shard(files: Iterable[str], shard_index: int, shard_count: int, base_dir: Optional[Path] = None) -> List[str]:
+    """
+    返回属于指定分片的数据文件，以文件为单位分片，保证同一文件内依赖前序用例提取变量的用例在同一分片执行
+
+    Raises:
+        ValueError: 分片参数不合法时
+    """
+    if shard_count < 1 or not 0 <= shard_index < shard_count:
+        raise ValueError(f"分片参数不合法: shard_index={shard_index}, shard_count={shard_count}")
+    if shard_count == 1:
+        return list(files)
+    return [file for file in files if shard_of(relative_source(file, base_dir), shard_count) == shard_index]
+
+
+def matches_filter(ref: CaseRef, patterns: Sequence[str]) -> bool:
+    """
+    判断用例是否匹配筛选条件，多个条件之间为或关系
+
+    条件包含 * ? [ 时按通配符匹配完整的用例ID，否则按子串匹配用例ID；
+    以 not 开头的条件表示排除，排除条件优先。
+    """
+    if not patterns:
+        return True
+    includes = []
+    for pattern in patterns:
+        if pattern.startswith("not "):
+            if _match(ref.case_id, pattern[4:].strip()):
+                return False
+        else:
+            includes.append(pattern)
+    return not includes or any(_match(ref.case_id, pattern) for pattern in includes)
+
+
+def _match(case_id: str, pattern: str) -> bool:
+    if any(char in pattern for char in "*?["):
+        return fnmatchcase(case_id, pattern)
+    return pattern in case_id
+
+
+def collect_files(
+    paths: Optional[Iterable[str | Path]] = None,
+    shard_index: int = 0,
+    shard_count: int = 1,
+    base_dir: Optional[Path] = None,
+) -> List[str]:
+    """收集指定文件或目录下属于当前分片的数据文件，未指定路径时使用默认用例目录"""
+    files = [file for start_path in paths or [None] for file in iter_case_files(start_path)]
+    selected = select_shard(files, shard_index, shard_count, base_dir)
+    if shard_count > 1:
+        logger.info(f"分片 {shard_index + 1}/{shard_count}: 执行 {len(selected)}/{len(files)} 个数据文件")
+    return selected
+
+
+@dataclass
+class RunSummary:
+    """一次执行的汇总结果"""
+
+    total: int = 0
+    passed: int = 0
+    failed: int = 0
+    errors: int = 0
+    duration: float = 0.0
+    failed_cases: List[str] = field(default_factory=list)
+
+    def add(self, result: CaseResult) -> None:
+        self.total += 1
+        if result.outcome == "passed":
+            self.passed += 1
+        elif result.outcome == "failed":
+            self.failed += 1
+            self.failed_cases.append(result.case_id)
+        elif result.outcome == "error":
+            self.errors += 1
+            self.failed_cases.append(result.case_id)
+
+    @property
+    def exit_code(self) -> int:
+        """全部通过返回0，有失败或异常返回1，没有执行任何用例返回5（与pytest一致）"""
+        if self.total == 0:
+            return 5
+        return 0 if self.failed == 0 and self.errors == 0 else 1
+
+
+class CaseRunner:
+    """不经过pytest收集、直接执行数据驱动用例的执行器
+
+    以数据文件为单位分片和并发：多个文件在线程池中并行执行，
+    同一文件内的用例按顺序执行，保证依赖前序用例提取变量的用例仍能正常工作。
+    每个文件使用独立的变量作用域，并发执行的文件之间提取的同名变量互不影响。
+    """
+
+    def __init__(
+        self,
+        executor: CaseExecutor,
+        reporter: Optional[MultiReporter] = None,
+        concurrency: int = 1,
+        filters: Sequence[str] = (),
+        shard_index: int = 0,
+        shard_count: int = 1,
+        base_dir: Optional[Path] = None,
+        on_result: Optional[Callable[[CaseResult], None]] = None,
+    ):
+        """
+        Args:
+            executor: 用例执行器
+            reporter: 结果报告器
+            concurrency: 并行执行的文件数
+            filters: 用例筛选条件，参见 matches_filter
+            shard_index: 当前分片序号，从0开始
+            shard_count: 分片总数
+            base_dir: 计算用例ID相对路径的用例目录
+            on_result: 每个用例执行完成后的回调
+        """
+        self.executor = executor
+        self.reporter = reporter
+        self.concurrency = max(1, concurrency)
+        self.filters = list(filters)
+        self.shard_index = shard_index
+        self.shard_count = shard_count
+        self.base_dir = base_dir
+        self.on_result = on_result
+        self.summary = RunSummary()
+        self._lock = threading.Lock()
+        # 用例ID到 (内容哈希, 用例) 的映射，多次执行（浸泡测试的各轮、分布式的重复分配）复用同一个用例对象，
+        # 执行器按用例对象缓存的断言计划和请求模板才能命中
+        self._cases: Dict[str, tuple[str, Case]] = {}
+        # 数据文件到最近一次执行使用的变量作用域，再次执行该文件时替换，用于统计当前保留的变量数
+        self._scopes: Dict[str, VariableCache] = {}
+
+    def collect_files(self, paths: Optional[Iterable[str | Path]] = None) -> List[str]:
+        """返回当前分片需要执行的数据文件"""
+        return collect_files(paths, self.shard_index, self.shard_count, self.base_dir)
+
+    def run(self, paths: Optional[Iterable[str | Path]] = None) -> RunSummary:
+        """执行指定文件或目录下的全部用例，每次调用返回新的汇总结果"""
+        files = self.collect_files(paths)
+        self.summary = RunSummary()
+        start = time.perf_counter()
+        if self.concurrency == 1 or len(files) <= 1:
+            for file in files:
+                self.run_file(file)
+        else:
+            with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="api-test") as pool:
+                # list() 使工作线程中的异常在这里抛出
+                list(pool.map(self.run_file, files))
+        self.summary.duration = time.perf_counter() - start
+        logger.info(
+            f"执行完成: 共 {self.summary.total} 个用例，通过 {self.summary.passed}，"
+            f"失败 {self.summary.failed}，异常 {self.summary.errors}，耗时 {self.summary.duration:.3f}秒"
+        )
+        return self.summary
+
+    def run_file(self, file_path: str) -> None:
+        """按顺序执行单个数据文件中的用例，变量只在该文件内有效"""
+        logger.debug(f"开始执行用例文件: {file_path}")
+        variables = VariableCache()
+        with self._lock:
+            self._scopes[file_path] = variables
+        for ref, case_data in iter_file_cases(file_path, self.base_dir):
+            if not matches_filter(ref, self.filters):
+                continue
+            result = self.executor.execute(self.case_for(ref, case_data), ref.case_id, source=ref.source, variables=variables)
+            self._report(result)
+
+    def variable_count(self) -> int:
+        """返回各数据文件的变量作用域中当前保留的变量总数"""
+        with self._lock:
+            scopes = list(self._scopes.values())
+        return sum(len(scope) for scope in scopes)
+
+    def case_for(self, ref: CaseRef, case_data: Dict[str, Any]) -> Case | Dict[str, Any]:
+        """
+        返回用例对象，用例内容未变化时复用之前创建的对象
+
+        Returns:
+            Case | Dict[str, Any]: 用例对象；用例数据不合法时返回原始数据，由执行器记录为异常结果
+        """
+        cached = self._cases.get(ref.case_id)
+        if cached is not None and cached[0] == ref.content_hash:
+            return cached[1]
+        try:
+            case = Case.from_dict(case_data)
+        except Exception:
+            return case_data
+        # 同一个数据文件只由一个线程执行，不同文件的用例ID不同，不需要加锁
+        self._cases[ref.case_id] = (ref.content_hash, case)
+        return case
+
+    def _report(self, result: CaseResult) -> None:
+        with self._lock:
+            self.summary.add(result)
+            if self.reporter:
+                self.reporter.report(result)
+        if self.on_result:
+            self.on_result(result)
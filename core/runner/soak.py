@@ -0,0 +1,335 @@
+"""
+浸泡测试
+按迭代次数或持续时间重复执行用例，每轮结束后采集进程内存、文件句柄、连接池、变量缓存与tracemalloc分配情况，
+检测随迭代持续增长的资源并报告增长来源，用于发现长时间运行才会暴露的资源泄漏。
+"""
+
+import json
+import os
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from core.runner.runner import CaseRunner, RunSummary
+from utils.logger import logger
+
+
+# 判定为持续增长所需的最小净增长量
+GROWTH_THRESHOLDS: Dict[str, float] = {
+    "rss_bytes": 5 * 1024 * 1024,
+    "open_fds": 5,
+    "pool_connections": 2,
+    "variables": 10,
+    "traced_bytes": 2 * 1024 * 1024,
+}
+
+# 不统计 tracemalloc 自身与导入机制的内存分配
+_TRACE_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def read_rss() -> Optional[int]:
+    """返回当前进程的常驻内存（字节），无法获取时返回None"""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+
+        # 非Linux系统只能获取峰值内存，macOS单位为字节，其他为KB
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if os.uname().sysname == "Darwin" else peak * 1024
+    except (ImportError, AttributeError):
+        return None
+
+
+def count_open_fds() -> Optional[int]:
+    """返回当前进程打开的文件描述符数量，无法获取时返回None"""
+    for fd_dir in ("/proc/self/fd", "/dev/fd"):
+        try:
+            return len(os.listdir(fd_dir))
+        except OSError:
+            continue
+    return None
+
+
+@dataclass
+class ResourceSample:
+    """
+    一轮迭代结束后的资源采样
+
+    Attributes:
+        iteration: 迭代序号，从1开始
+        elapsed: 距浸泡开始的秒数
+        rss_bytes: 常驻内存
+        open_fds: 打开的文件描述符数
+        pool_connections: 连接池当前打开的连接数（空闲与使用中）
+        pool_idle: 连接池中的空闲连接数
+        variables: 各数据文件的变量作用域中的变量数
+        traced_bytes: tracemalloc跟踪到的当前内存分配
+        cases: 本轮执行的用例数
+        failed: 本轮失败或异常的用例数
+    """
+
+    iteration: int
+    elapsed: float
+    rss_bytes: Optional[int]
+    open_fds: Optional[int]
+    pool_connections: int
+    pool_idle: int
+    variables: int
+    traced_bytes: Optional[int]
+    cases: int
+    failed: int
+
+
+@dataclass
+class GrowthFinding:
+    """
+    持续增长的资源
+
+    Attributes:
+        metric: 资源指标名
+        first: 预热结束后的第一个值
+        last: 最后一个值
+        growing_steps: 相邻两轮之间没有下降的次数
+        steps: 相邻两轮比较的总次数
+    """
+
+    metric: str
+    first: float
+    last: float
+    growing_steps: int
+    steps: int
+
+    @property
+    def delta(self) -> float:
+        return self.last - self.first
+
+    def __str__(self) -> str:
+        return (
+            f"{self.metric} 持续增长: {self.first:,.0f} -> {self.last:,.0f} (+{self.delta:,.0f})，"
+            f"{self.growing_steps}/{self.steps} 轮未下降"
+        )
+
+
+def detect_growth(
+    samples: List[ResourceSample],
+    warmup: int = 1,
+    thresholds: Optional[Dict[str, float]] = None,
+    monotonic_ratio: float = 0.9,
+) -> List[GrowthFinding]:
+    """
+    检测持续增长的资源
+
+    跳过前 warmup 轮（首轮会加载配置、建立连接、填充缓存），其余各轮中相邻两轮没有下降的比例
+    不低于 monotonic_ratio，且净增长超过阈值时，判定为持续增长。
+
+    Args:
+        samples: 各轮采样
+        warmup: 预热轮数
+        thresholds: 各指标的最小净增长量，默认为 GROWTH_THRESHOLDS
+        monotonic_ratio: 判定为单调增长所需的未下降比例，允许偶发的小幅回落
+    """
+    thresholds = GROWTH_THRESHOLDS if thresholds is None else thresholds
+    window = samples[warmup:]
+    if len(window) < 3:
+        return []
+    findings = []
+    for metric, threshold in thresholds.items():
+        values = [getattr(sample, metric) for sample in window]
+        if any(value is None for value in values):
+            continue
+        steps = len(values) - 1
+        growing = sum(1 for previous, current in zip(values, values[1:]) if current >= previous)
+        if values[-1] - values[0] > threshold and growing >= steps * monotonic_ratio:
+            findings.append(GrowthFinding(metric, values[0], values[-1], growing, steps))
+    return findings
+
+
+@dataclass
+class SoakReport:
+    """浸泡测试结果"""
+
+    samples: List[ResourceSample] = field(default_factory=list)
+    findings: List[GrowthFinding] = field(default_factory=list)
+    top_allocations: List[str] = field(default_factory=list)
+
+    @property
+    def exit_code(self) -> int:
+        """检测到资源持续增长返回3，有用例失败返回1，否则返回0"""
+        if self.findings:
+            return 3
+        return 1 if any(sample.failed for sample in self.samples) else 0
+
+    def format(self) -> str:
+        lines = [f"{'iter':>5}{'elapsed(s)':>12}{'rss(MiB)':>10}{'fds':>6}{'conns':>7}{'idle':>6}{'vars':>7}{'traced(KiB)':>13}{'cases':>7}{'failed':>8}"]
+        for sample in self.samples:
+            rss = "-" if sample.rss_bytes is None else f"{sample.rss_bytes / 1048576:.1f}"
+            fds = "-" if sample.open_fds is None else str(sample.open_fds)
+            traced = "-" if sample.traced_bytes is None else f"{sample.traced_bytes / 1024:.1f}"
+            lines.append(
+                f"{sample.iteration:>5}{sample.elapsed:>12.1f}{rss:>10}{fds:>6}{sample.pool_connections:>7}"
+                f"{sample.pool_idle:>6}{sample.variables:>7}{traced:>13}{sample.cases:>7}{sample.failed:>8}"
+            )
+        if self.findings:
+            lines.append("检测到资源持续增长:")
+            lines.extend(f"  {finding}" for finding in self.findings)
+        else:
+            lines.append("未检测到资源持续增长")
+        if self.top_allocations:
+            lines.append("预热后内存增长最多的分配位置:")
+            lines.extend(f"  {line}" for line in self.top_allocations)
+        return "\n".join(lines)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "samples": [asdict(sample) for sample in self.samples],
+            "findings": [dict(asdict(finding), delta=finding.delta) for finding in self.findings],
+            "top_allocations": self.top_allocations,
+        }
+
+    def write(self, path: str | Path) -> None:
+        """写入JSON格式的浸泡测试结果"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), ensure_ascii=False, indent=2), encoding="utf-8")
+        logger.info(f"浸泡测试结果已写入: {path}")
+
+
+class SoakMonitor:
+    """每轮迭代结束后采集资源使用情况"""
+
+    def __init__(self, runner: CaseRunner, trace_frames: int = 1, top: int = 10):
+        """
+        Args:
+            runner: 被测用例执行器，读取其HTTP客户端的连接池统计与变量作用域中的变量数
+            trace_frames: tracemalloc记录的调用栈深度，为0时不启用tracemalloc
+            top: 报告中列出的内存增长位置数量
+        """
+        self.runner = runner
+        self.client = runner.executor.client
+        self.trace_frames = trace_frames
+        self.top = top
+        self._started_tracing = False
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self._start = time.monotonic()
+
+    def start(self) -> None:
+        self._start = time.monotonic()
+        if self.trace_frames and not tracemalloc.is_tracing():
+            tracemalloc.start(self.trace_frames)
+            self._started_tracing = True
+
+    def stop(self) -> None:
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def sample(self, iteration: int, summary: RunSummary) -> ResourceSample:
+        """采集一轮迭代后的资源使用情况"""
+        pool = self.client.connection_stats()
+        return ResourceSample(
+            iteration=iteration,
+            elapsed=time.monotonic() - self._start,
+            rss_bytes=read_rss(),
+            open_fds=count_open_fds(),
+            pool_connections=pool["connections"],
+            pool_idle=pool["idle"],
+            variables=self.runner.variable_count(),
+            traced_bytes=tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None,
+            cases=summary.total,
+            failed=summary.failed + summary.errors,
+        )
+
+    def mark_baseline(self) -> None:
+        """预热结束时记录内存分配快照，之后的增长与该快照比较"""
+        if tracemalloc.is_tracing():
+            self._baseline = tracemalloc.take_snapshot().filter_traces(_TRACE_FILTERS)
+
+    def top_allocations(self) -> List[str]:
+        """返回与预热快照相比内存增长最多的分配位置"""
+        if self._baseline is None or not tracemalloc.is_tracing():
+            return []
+        snapshot = tracemalloc.take_snapshot().filter_traces(_TRACE_FILTERS)
+        stats = snapshot.compare_to(self._baseline, "lineno")
+        return [
+            f"{stat.traceback[0].filename}:{stat.traceback[0].lineno} "
+            f"{stat.size_diff / 1024:+.1f} KiB ({stat.count_diff:+d} blocks)"
+            for stat in stats[: self.top]
+            if stat.size_diff > 0
+        ]
+
+
+def run_soak(
+    runner: CaseRunner,
+    paths: Optional[Iterable[str | Path]] = None,
+    iterations: Optional[int] = None,
+    duration: Optional[float] = None,
+    warmup: int = 1,
+    trace_frames: int = 1,
+    top: int = 10,
+    thresholds: Optional[Dict[str, float]] = None,
+    on_sample: Optional[Callable[[ResourceSample], None]] = None,
+) -> SoakReport:
+    """
+    重复执行用例直到达到迭代次数或持续时间（任一条件满足即停止）
+
+    Args:
+        runner: 用例执行器，每轮调用一次 run
+        paths: 数据文件或目录
+        iterations: 最大迭代次数
+        duration: 最长持续时间（秒），在一轮迭代结束后检查
+        warmup: 预热轮数，不参与增长检测
+        trace_frames: tracemalloc记录的调用栈深度，为0时不启用
+        top: 报告中列出的内存增长位置数量
+        thresholds: 各指标判定为增长的最小净增长量
+        on_sample: 每轮采样后的回调
+
+    Raises:
+        ValueError: 迭代次数和持续时间都未指定时
+    """
+    if not iterations and not duration:
+        raise ValueError("浸泡测试需要指定迭代次数或持续时间")
+    paths = list(paths or [])
+    monitor = SoakMonitor(runner, trace_frames, top)
+    report = SoakReport()
+    deadline = time.monotonic() + duration if duration else None
+    logger.info(f"开始浸泡测试，迭代次数: {iterations or '不限'}，持续时间: {duration or '不限'}秒")
+
+    monitor.start()
+    if warmup <= 0:
+        monitor.mark_baseline()
+    try:
+        iteration = 0
+        while True:
+            iteration += 1
+            summary = runner.run(paths or None)
+            # 耗时样本按用例累积，浸泡测试中每轮清空，避免被误判为泄漏
+            runner.executor.latency_recorder.clear()
+            sample = monitor.sample(iteration, summary)
+            report.samples.append(sample)
+            if on_sample:
+                on_sample(sample)
+            if iteration == warmup:
+                monitor.mark_baseline()
+            if iterations and iteration >= iterations:
+                break
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+        report.top_allocations = monitor.top_allocations()
+    finally:
+        monitor.stop()
+
+    report.findings = detect_growth(report.samples, warmup, thresholds)
+    for finding in report.findings:
+        logger.warning(f"浸泡测试检测到资源增长: {finding}")
+    logger.info(f"浸泡测试结束，共 {len(report.samples)} 轮，检测到 {len(report.findings)} 项资源持续增长")
+    return report
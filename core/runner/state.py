@@ -0,0 +1,218 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, TypeVar
+from core.report.reporter import CaseResult
+from utils.logger import logger
+
+
+T = TypeVar("T")
+
+# 可选的用例筛选模式
+SELECT_MODES = ("all", "failed", "changed", "failed-changed")
+# 可选的用例排序方式
+ORDER_MODES = ("default", "failed-first", "slowest-first", "fastest-first")
+
+
+def content_hash(case_data: Dict[str, Any]) -> str:
+    """计算用例数据的内容哈希，键顺序不影响结果"""
+    canonical = json.dumps(case_data, sort_keys=True, ensure_ascii=False, default=str, separators=(",", ":"))
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True, slots=True)
+class CaseState:
+    """用例的历史执行状态
+
+    Attributes:
+        case_id: 用例ID
+        content_hash: 最近一次执行时的用例内容哈希
+        outcome: 最近一次执行结果
+        duration: 最近一次执行耗时（秒）
+        passed_hash: 最近一次执行通过时的用例内容哈希
+        fail_count: 累计失败次数
+        updated_at: 最近一次执行的时间戳
+    """
+
+    case_id: str
+    content_hash: str
+    outcome: str
+    duration: float
+    passed_hash: Optional[str]
+    fail_count: int
+    updated_at: float
+
+    @property
+    def failed(self) -> bool:
+        return self.outcome in ("failed", "error")
+
+
+class RunState:
+    """持久化的用例执行状态
+
+    使用SQLite保存每个用例的内容哈希、最近结果与耗时，用于只执行失败/变更的用例，
+    以及按历史失败情况或耗时排序。执行结果先写入缓冲区，批量提交。
+    """
+
+    def __init__(self, db_path: str | Path, batch_size: int = 200):
+        self.db_path = Path(db_path)
+        self.batch_size = batch_size
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS case_state (
+                case_id TEXT PRIMARY KEY,
+                content_hash TEXT NOT NULL,
+                outcome TEXT NOT NULL,
+                duration REAL NOT NULL,
+                passed_hash TEXT,
+                fail_count INTEGER NOT NULL DEFAULT 0,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+        self._pending: List[tuple] = []
+        self._lock = threading.Lock()
+        self._states: Optional[Dict[str, CaseState]] = None
+        logger.debug(f"用例执行状态库: {self.db_path}")
+
+    def load(self) -> Dict[str, CaseState]:
+        """读取全部用例的历史状态"""
+        if self._states is None:
+            rows = self._conn.execute(
+                "SELECT case_id, content_hash, outcome, duration, passed_hash, fail_count, updated_at FROM case_state"
+            )
+            self._states = {row[0]: CaseState(*row) for row in rows}
+            logger.info(f"加载用例执行状态，共 {len(self._states)} 条")
+        return self._states
+
+    def get(self, case_id: str) -> Optional[CaseState]:
+        return self.load().get(case_id)
+
+    def record(self, result: CaseResult, case_hash: str) -> None:
+        """记录一次执行结果"""
+        failed = 1 if result.outcome in ("failed", "error") else 0
+        passed_hash = case_hash if result.outcome == "passed" else None
+        with self._lock:
+            self._pending.append(
+                (result.case_id, case_hash, result.outcome, result.duration, passed_hash, failed, time.time())
+            )
+            if len(self._pending) >= self.batch_size:
+                self._flush()
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        self._conn.executemany(
+            """
+            INSERT INTO case_state (case_id, content_hash, outcome, duration, passed_hash, fail_count, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(case_id) DO UPDATE SET
+                content_hash = excluded.content_hash,
+                outcome = excluded.outcome,
+                duration = excluded.duration,
+                passed_hash = COALESCE(excluded.passed_hash, case_state.passed_hash),
+                fail_count = case_state.fail_count + excluded.fail_count,
+                updated_at = excluded.updated_at
+            """,
+            self._pending,
+        )
+        self._conn.commit()
+        self._pending.clear()
+
+    def flush(self) -> None:
+        """提交缓冲区中的执行结果"""
+        with self._lock:
+            self._flush()
+
+    def close(self) -> None:
+        """提交剩余结果并关闭数据库"""
+        self.flush()
+        self._conn.close()
+
+    def is_selected(self, case_id: str, case_hash: str, mode: str) -> bool:
+        """
+        判断用例在指定筛选模式下是否需要执行
+
+        - all: 全部执行
+        - failed: 只执行上次失败的用例
+        - changed: 只执行从未通过或内容在上次通过后发生变化的用例
+        - failed-changed: 上述两者的并集
+        """
+        if mode == "all":
+            return True
+        state = self.get(case_id)
+        if state is None:
+            return mode in ("changed", "failed-changed")
+        failed = state.failed
+        changed = state.passed_hash != case_hash
+        if mode == "failed":
+            return failed
+        if mode == "changed":
+            return changed
+        if mode == "failed-changed":
+            return failed or changed
+        raise ValueError(f"不支持的用例筛选模式: {mode}，可选值为 {SELECT_MODES}")
+
+    def order(
+        self,
+        items: Iterable[T],
+        order: str,
+        key: Callable[[T], str],
+        group: Optional[Callable[[T], Any]] = None,
+        pinned: Optional[Callable[[List[T]], bool]] = None,
+    ) -> List[T]:
+        """
+        按历史状态排序，排序稳定，同等条件下保持原有顺序
+
+        - failed-first: 上次失败的在前，其次是累计失败次数多的、从未执行过的
+        - slowest-first / fastest-first: 按上次耗时排序，从未执行过的排在最前
+
+        Args:
+            items: 需要排序的用例
+            order: 排序方式，取值见 ORDER_MODES
+            key: 返回用例ID的函数
+            group: 返回用例所属分组（如数据文件）的函数，指定时只在组内排序，
+                各组按组内排在最前的用例排序，同一组的用例保持连续
+            pinned: 判断一组用例是否保持原有顺序的函数，如组内用例之间存在变量依赖时
+        """
+        items = list(items)
+        if order == "default":
+            return items
+        states = self.load()
+
+        if order == "failed-first":
+            def sort_key(item: T) -> tuple:
+                state = states.get(key(item))
+                if state is None:
+                    return (1, 0)
+                return (0 if state.failed else 2, -state.fail_count)
+        elif order in ("slowest-first", "fastest-first"):
+            sign = -1 if order == "slowest-first" else 1
+
+            def sort_key(item: T) -> tuple:
+                state = states.get(key(item))
+                if state is None:
+                    return (0, 0.0)
+                return (1, sign * state.duration)
+        else:
+            raise ValueError(f"不支持的用例排序方式: {order}，可选值为 {ORDER_MODES}")
+        if group is None:
+            return sorted(items, key=sort_key)
+
+        groups: Dict[Any, List[T]] = {}
+        for item in items:
+            groups.setdefault(group(item), []).append(item)
+        ordered = [
+            members if pinned is not None and pinned(members) else sorted(members, key=sort_key)
+            for members in groups.values()
+        ]
+        ordered.sort(key=lambda members: min(sort_key(item) for item in members))
+        return [item for members in ordered for item in members]
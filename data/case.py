@@ -0,0 +1,188 @@
+"""
+用例模型
+将数据文件中读取的用例字典规范化为不可变的 Case，执行时只为包含变量的部分重新生成请求数据
+"""
+
+import sys
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Optional, Tuple
+from data import data_processor
+from utils import replacer
+from utils.constant import VariableCache
+
+
+def _has_placeholder(value: Any) -> bool:
+    """判断值中是否有需要 replace_data 替换的 ${变量}，规则与 replace_data 一致：只检查字符串和嵌套字典"""
+    if isinstance(value, str):
+        return value.startswith("${") and value.endswith("}")
+    if isinstance(value, dict):
+        return any(_has_placeholder(item) for item in value.values())
+    return False
+
+
+def _intern_headers(headers: Optional[Mapping[str, Any]]) -> Optional[Dict[str, Any]]:
+    # 大量用例使用相同的请求头名称，驻留后只保留一份字符串
+    if not headers:
+        return None
+    return {sys.intern(str(name)): value for name, value in headers.items()}
+
+
+@dataclass(slots=True)
+class RenderedRequest:
+    """
+    单次执行时生成的请求数据，没有变量的部分直接引用 Case 中的对象
+
+    Attributes:
+        method: 请求方法
+        url: 替换变量后的URL
+        headers: 请求头
+        params: URL参数
+        data: 表单数据或multipart编码器
+        json: JSON请求体
+        files: 上传文件
+        use_cache: 是否使用响应缓存
+    """
+
+    method: str
+    url: str
+    headers: Optional[Dict[str, Any]] = None
+    params: Any = None
+    data: Any = None
+    json: Any = None
+    files: Optional[Dict[str, Any]] = None
+    use_cache: bool = True
+
+    def close(self) -> None:
+        """关闭 data_type 为 file 时打开的上传文件"""
+        for value in (self.files or {}).values():
+            handle = value[1] if isinstance(value, tuple) and len(value) > 1 else value
+            if hasattr(handle, "close"):
+                handle.close()
+
+
+# 参与变量替换的请求字段
+_RENDER_FIELDS = ("headers", "params", "data", "json")
+
+
+@dataclass(frozen=True, slots=True, eq=False, weakref_slot=True)
+class Case:
+    """
+    规范化后的用例，创建后不再修改，重复执行之间共享
+
+    Attributes:
+        name: 用例名称
+        method: 大写的请求方法
+        url: URL模板
+        headers: 请求头模板，请求头名称已驻留
+        params: URL参数模板
+        data: 请求体模板
+        json: JSON请求体模板
+        data_type: 请求体类型，file / form / json
+        exception: 断言配置
+        variable: 变量提取配置，(变量名, JSONPath) 元组
+        latency: 耗时SLO配置
+        repeat: 重复执行次数
+        cache: 是否使用响应缓存
+        dynamic_fields: 包含 ${变量} 需要在执行时替换的请求字段
+        dynamic_url: URL中是否包含变量
+    """
+
+    name: str = ""
+    method: str = ""
+    url: str = ""
+    headers: Optional[Dict[str, Any]] = None
+    params: Any = None
+    data: Any = None
+    json: Any = None
+    data_type: Optional[str] = None
+    exception: Tuple[Dict[str, Any], ...] = ()
+    variable: Tuple[Tuple[str, str], ...] = ()
+    latency: Optional[Dict[str, Any]] = None
+    repeat: int = 1
+    cache: bool = True
+    dynamic_fields: Tuple[str, ...] = ()
+    dynamic_url: bool = False
+
+    @classmethod
+    def from_dict(cls, case_data: Mapping[str, Any]) -> "Case":
+        """
+        从数据文件读取的用例字典创建 Case
+
+        Args:
+            case_data: 用例字典，请求头使用 header 键
+        """
+        method = case_data.get("method")
+        url = case_data.get("url") or ""
+        headers = _intern_headers(case_data.get("header"))
+        fields = {
+            "headers": headers,
+            "params": case_data.get("params"),
+            "data": case_data.get("data"),
+            "json": case_data.get("json"),
+        }
+        variables = case_data.get("variable") or {}
+        return cls(
+            name=str(case_data.get("name") or case_data.get("case_name") or ""),
+            method=sys.intern(str(method).upper()) if method else "",
+            url=url,
+            data_type=case_data.get("data_type") or None,
+            exception=tuple(case_data.get("exception") or ()),
+            variable=tuple((sys.intern(str(name)), expression) for name, expression in variables.items()),
+            latency=case_data.get("latency"),
+            repeat=max(1, int(case_data.get("repeat") or 1)),
+            cache=bool(case_data.get("cache", True)),
+            dynamic_fields=tuple(name for name in _RENDER_FIELDS if _has_placeholder(fields[name])),
+            dynamic_url="${" in url,
+            **fields,
+        )
+
+    @property
+    def templatable(self) -> bool:
+        """上传文件和multipart表单的请求体是一次性的流，不能使用请求模板"""
+        return self.data_type not in ("file", "form")
+
+    @property
+    def template_dynamic(self) -> Tuple[str, ...]:
+        """发送时需要重新处理的请求部分，对应 RequestTemplate 的 dynamic 参数"""
+        fields = ["url"] if self.dynamic_url else []
+        for name in self.dynamic_fields:
+            # data_type 为 json 时 data 会作为JSON请求体发送
+            fields.append("json" if name == "data" and self.data_type == "json" else name)
+        return tuple(fields)
+
+    def render(self, process_body: bool = True, variables: Optional[VariableCache] = None) -> RenderedRequest:
+        """
+        生成单次执行的请求数据
+
+        只对包含变量的字段调用 replace_data 拷贝并替换，其余字段直接共享；
+        设置了 data_type 时再按类型处理上传文件、表单或JSON请求体。
+
+        Args:
+            process_body: 是否同时处理请求体，为False时需要再调用 process_body
+            variables: 变量作用域，为None时使用全局变量缓存
+        """
+        values = {name: getattr(self, name) for name in _RENDER_FIELDS}
+        if self.dynamic_fields:
+            values.update(replacer.replace_data({name: values[name] for name in self.dynamic_fields}, variables))
+        request = RenderedRequest(
+            method=self.method,
+            url=replacer.replace_url(self.url, variables) if self.dynamic_url else self.url,
+            use_cache=self.cache,
+            **values,
+        )
+        if process_body:
+            self.process_body(request)
+        return request
+
+    def process_body(self, request: RenderedRequest) -> None:
+        """按 data_type 处理上传文件、表单或JSON请求体，未设置 data_type 时不做处理"""
+        if not self.data_type:
+            return
+        # data_processing 会修改传入的字典，只传入本次执行的请求数据
+        body = {"data_type": self.data_type, "data": request.data, "headers": dict(request.headers or {})}
+        body = data_processor.data_processing(body)
+        request.data = body.get("data")
+        request.json = body.get("json", request.json)
+        request.files = body.get("files")
+        if self.data_type == "form":
+            request.headers = body["headers"]
@@ -1,10 +1,13 @@
 from pathlib import Path
-from typing import BinaryIO, Dict
-from requests_toolbelt.multipart.encoder import MultipartEncoder
+from typing import TYPE_CHECKING, BinaryIO, Dict
 from utils.logger import logger
 
+if TYPE_CHECKING:
+    # requests_toolbelt导入较慢，只在处理form类型数据时导入
+    from requests_toolbelt.multipart.encoder import MultipartEncoder
 
-def data_processing(excel_dict: Dict) -> Dict[str, str | MultipartEncoder | Dict]:
+
+def data_processing(excel_dict: Dict) -> Dict[str, "str | MultipartEncoder | Dict"]:
     """处理Excel数据, 返回一个字典
 
     Args:
@@ -31,6 +34,8 @@ def data_processing(excel_dict: Dict) -> Dict[str, str | MultipartEncoder | Dict
 
     elif data_type == "form":
         logger.info("处理form类型数据")
+        from requests_toolbelt.multipart.encoder import MultipartEncoder
+
         mp_encoder = MultipartEncoder(fields=excel_dict["data"])
         excel_dict["headers"].update({"content_type": mp_encoder.content_type})
         excel_dict["data"] = mp_encoder
@@ -1,16 +1,19 @@
 import json
-from typing import Any, Optional
+from typing import TYPE_CHECKING, Any, Iterator, Optional
 from pathlib import Path
-from openpyxl import load_workbook, Workbook
-from openpyxl.worksheet.worksheet import Worksheet
 from utils.logger import logger
 
+if TYPE_CHECKING:
+    # openpyxl导入较慢，只在实际读取Excel时导入
+    from openpyxl import Workbook
+    from openpyxl.worksheet.worksheet import Worksheet
+
 
 class ExcelUtil:
     """Excel文件操作辅助类"""
     
     @staticmethod
-    def load_workbook_safe(file_path: str) -> Workbook:
+    def load_workbook_safe(file_path: str) -> "Workbook":
         """安全加载Excel文件，增加错误处理"""
         logger.debug(f"开始加载Excel文件: {file_path}")
         
@@ -20,6 +23,8 @@ class ExcelUtil:
             logger.error(error_msg)
             raise FileNotFoundError(error_msg)
         
+        from openpyxl import load_workbook
+
         try:
             wb = load_workbook(file_path, data_only=True)
             logger.info(f"成功加载Excel文件: {file_path}")
@@ -29,7 +34,7 @@ class ExcelUtil:
             raise
     
     @staticmethod
-    def get_sheet(wb: Workbook, sheet_name: Optional[str] = None) -> Worksheet:
+    def get_sheet(wb: "Workbook", sheet_name: Optional[str] = None) -> "Worksheet":
         """获取工作表，增加安全性"""
         if sheet_name and sheet_name in wb.sheetnames:
             logger.debug(f"使用指定工作表: {sheet_name}")
@@ -112,3 +117,59 @@ def excel_reader(file_path: str, sheet_name: Optional[str] = None,
     
     logger.info(f"Excel读取完成，共读取 {len(case_data)} 行数据，自动解析JSON {json_parse_count} 个")
     return case_data
+
+
+def _parse_cell(cell_value: Any, auto_parse_json: bool) -> Any:
+    """按需将JSON字符串单元格解析为Python对象"""
+    if auto_parse_json and isinstance(cell_value, str):
+        try:
+            return json.loads(cell_value.strip())
+        except (json.JSONDecodeError, AttributeError):
+            return cell_value
+    return cell_value
+
+
+def iter_excel_rows(file_path: str, sheet_name: Optional[str] = None,
+                    start_row: int = 2, auto_parse_json: bool = True) -> Iterator[tuple[int, dict[str, Any]]]:
+    """
+    以只读模式逐行读取Excel文件，不会一次性加载整个工作表
+
+    Args:
+        file_path: Excel文件路径
+        sheet_name: 工作表名称，如为None则使用第一个工作表
+        start_row: 数据开始行（表头所在行+1）
+        auto_parse_json: 是否自动解析JSON字符串
+
+    Returns:
+        Iterator[tuple[int, dict[str, Any]]]: (行号, 行数据) 迭代器，跳过空行
+
+    Raises:
+        FileNotFoundError: 文件不存在时
+    """
+    logger.debug(f"开始逐行读取Excel文件: {file_path}, 工作表: {sheet_name}")
+
+    if not Path(file_path).exists():
+        error_msg = f"Excel文件不存在: {file_path}"
+        logger.error(error_msg)
+        raise FileNotFoundError(error_msg)
+
+    from openpyxl import load_workbook
+
+    wb = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        sheet = ExcelUtil.get_sheet(wb, sheet_name)
+        rows = sheet.iter_rows(values_only=True)
+        header_row = next(rows, None)
+        if header_row is None:
+            logger.warning("Excel文件为空")
+            return
+        headers = [str(value) if value is not None else f"Column_{col}" for col, value in enumerate(header_row, 1)]
+
+        for row_number, values in enumerate(rows, 2):
+            if row_number < start_row:
+                continue
+            if all(value is None for value in values):
+                continue
+            yield row_number, {header: _parse_cell(value, auto_parse_json) for header, value in zip(headers, values)}
+    finally:
+        wb.close()
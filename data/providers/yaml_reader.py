@@ -1,5 +1,5 @@
 import yaml
-from typing import Any, Optional
+from typing import Any, Iterator, Optional
 from utils.logger import logger
 
 
@@ -32,6 +32,40 @@ def yaml_reader(file_path: str) -> Optional[list[dict[str, Any]]]:
 
 
 
+def iter_yaml_cases(file_path: str) -> Iterator[tuple[int, dict[str, Any]]]:
+    """
+    逐个读取YAML文件中的用例
+
+    支持以 --- 分隔的多文档YAML，每个文档可以是用例列表或单个用例，
+    按文档依次解析，不会同时持有所有文档的内容。
+
+    Args:
+        file_path (str): Path to the YAML file
+
+    Returns:
+        Iterator[tuple[int, dict[str, Any]]]: (用例序号, 用例数据) 迭代器，序号从1开始
+
+    Raises:
+        FileNotFoundError: 文件不存在时
+        yaml.YAMLError: 文件格式错误时
+    """
+    logger.debug(f"开始逐个读取YAML用例: {file_path}")
+
+    index = 0
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for document in yaml.safe_load_all(f):
+            if document is None:
+                continue
+            cases = document if isinstance(document, list) else [document]
+            for case in cases:
+                index += 1
+                if isinstance(case, dict):
+                    yield index, case
+                else:
+                    logger.warning(f"YAML文件 {file_path} 第 {index} 个用例不是字典，已跳过")
+
+
+
 def write_yaml(file_path: str, data: Any) -> bool:
     """
     Write data to YAML file
@@ -1,6 +1,380 @@
-def main():
-    print("Hello from api-test!")
+"""
+命令行入口
+不经过pytest收集，直接读取数据文件并执行用例，适合用例数量很多的纯数据驱动场景：
+
+    api-test run test_data -n 8 --report-junit report/junit.xml
+    api-test run test_data --shard-index 0 --shard-count 4 -k login
+    api-test run test_data --record cassettes/smoke.jsonl
+    api-test soak test_data --duration 3600 --soak-report report/soak.json
+    api-test coordinator test_data --bind 0.0.0.0:7100 --report-junit report/junit.xml
+    api-test worker coordinator-host:7100 -n 4
+    api-test merge --report-jsonl report/report.jsonl --report-junit report/junit.xml
+"""
+
+import argparse
+import os
+import socket
+import subprocess
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, List, Optional
+from utils.path import PROJECT_ROOT
+
+if TYPE_CHECKING:
+    from core.assertion.latency import LatencyBaseline, LatencyRecorder
+    from core.http.recorder import Cassette
+    from core.report.reporter import CaseResult, MultiReporter
+    from core.runner.runner import CaseRunner, RunSummary
+
+
+def _add_run_options(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("paths", nargs="*", help="数据文件或目录，默认为项目根目录下的test_data")
+    parser.add_argument("-n", "--concurrency", type=int, default=1, help="并行执行的数据文件数，同一文件内的用例按顺序执行")
+    parser.add_argument("--shard-index", type=int, default=0, help="当前分片序号，从0开始")
+    parser.add_argument("--shard-count", type=int, default=1, help="分片总数，按数据文件分片")
+    parser.add_argument(
+        "-k",
+        dest="filters",
+        action="append",
+        default=[],
+        help="按用例ID筛选，可以重复指定；含 * ? 时按通配符匹配，以 'not ' 开头表示排除",
+    )
+    record = parser.add_mutually_exclusive_group()
+    record.add_argument("--record", metavar="PATH", default=None, help="将实际响应录制到文件")
+    record.add_argument("--replay", metavar="PATH", default=None, help="回放录制的响应，不发送网络请求")
+    parser.add_argument("--report-jsonl", default=None, help="逐个用例写入JSONL格式结果的文件路径")
+    parser.add_argument("--report-junit", default=None, help="逐个用例写入JUnit XML格式结果的文件路径")
+    parser.add_argument("--report-batch-size", type=int, default=100, help="结果批量刷新到文件的用例数")
+    parser.add_argument("--case-dir", default=str(PROJECT_ROOT / "test_data"), help="计算用例ID相对路径的用例目录")
+    parser.add_argument("--transport", choices=["http1", "h2"], default=None, help="HTTP传输方式，默认按配置文件 Http.transport")
+    parser.add_argument("--config", default=None, help="配置文件路径，默认按 API_TEST_CONFIG、./config/base_config.yaml、随包默认配置的顺序查找")
+    parser.add_argument("-q", "--quiet", action="store_true", default=False, help="只输出汇总结果")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="api-test", description="数据驱动接口测试")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run = subparsers.add_parser("run", help="执行数据文件中的用例")
+    _add_run_options(run)
+
+    soak = subparsers.add_parser("soak", help="重复执行用例并检测内存、文件句柄、连接等资源的持续增长")
+    _add_run_options(soak)
+    soak.add_argument("--iterations", type=int, default=None, help="迭代次数")
+    soak.add_argument("--duration", type=float, default=None, help="持续时间（秒），与迭代次数任一满足即停止")
+    soak.add_argument("--warmup", type=int, default=1, help="预热轮数，不参与增长检测")
+    soak.add_argument("--trace-frames", type=int, default=1, help="tracemalloc记录的调用栈深度，为0时不启用")
+    soak.add_argument("--top", type=int, default=10, help="报告中列出的内存增长位置数量")
+    soak.add_argument("--soak-report", default=None, help="JSON格式浸泡测试结果的输出路径")
+
+    coordinator = subparsers.add_parser("coordinator", help="分布式执行：按数据文件向工作节点分发用例并汇总结果")
+    _add_run_options(coordinator)
+    coordinator.add_argument("--bind", default="127.0.0.1:7100", help="监听地址 host:port，端口为0时自动分配")
+    coordinator.add_argument("--local-workers", type=int, default=0, help="在本机启动的工作节点进程数，每个进程并行执行 -n 个数据文件")
+    coordinator.add_argument("--lease-timeout", type=float, default=300.0, help="数据文件执行超过该秒数时分配副本给空闲节点，先完成的结果生效")
+    coordinator.add_argument("--heartbeat-timeout", type=float, default=30.0, help="超过该秒数未收到工作节点消息时重新分配其数据文件")
+
+    worker = subparsers.add_parser("worker", help="分布式执行的工作节点，连接协调者领取数据文件并在本地执行")
+    worker.add_argument("address", help="协调者地址 host:port")
+    worker.add_argument("-n", "--concurrency", type=int, default=1, help="并行执行的数据文件数")
+    worker.add_argument("--name", default=None, help="节点名称，默认为 主机名-进程号")
+    worker.add_argument("--replay", metavar="PATH", default=None, help="回放录制的响应，不发送网络请求")
+    worker.add_argument("--transport", choices=["http1", "h2"], default=None, help="HTTP传输方式，默认按配置文件 Http.transport")
+    worker.add_argument("--case-dir", default=str(PROJECT_ROOT / "test_data"), help="用例目录，需与协调者的用例目录内容一致")
+    worker.add_argument("--config", default=None, help="配置文件路径，默认按 API_TEST_CONFIG、./config/base_config.yaml、随包默认配置的顺序查找")
+    worker.add_argument("--heartbeat-interval", type=float, default=5.0, help="心跳间隔（秒），应小于协调者的 --heartbeat-timeout")
+    # 工作节点复用单机执行器的构建逻辑，筛选条件由协调者下发
+    worker.set_defaults(
+        paths=[],
+        filters=[],
+        shard_index=0,
+        shard_count=1,
+        record=None,
+        report_jsonl=None,
+        report_junit=None,
+        report_batch_size=100,
+        quiet=True,
+    )
+
+    merge = subparsers.add_parser("merge", help="合并pytest-xdist各工作进程写入的报告（如 report.gw0.jsonl）到原路径")
+    merge.add_argument("--report-jsonl", default=None, help="JSONL报告路径")
+    merge.add_argument("--report-junit", default=None, help="JUnit XML报告路径")
+    merge.set_defaults(shard_index=0, shard_count=1, concurrency=1, config=None)
+    return parser
+
+
+def _print_result(result: "CaseResult") -> None:
+    print(f"{result.outcome.upper():<7} {result.case_id} ({result.duration:.3f}s)")
+
+
+def _build_runner(args: argparse.Namespace, cassette: Optional["Cassette"], reporter: Optional["MultiReporter"]) -> "CaseRunner":
+    # 执行相关模块依赖requests等，解析参数后再导入
+    from core.assertion.latency import LatencyBaseline, LatencyRecorder
+    from core.http.auth import TokenManager
+    from core.http.cache import ResponseCache
+    from core.http.client import HTTPClient
+    from core.runner.executor import CaseExecutor
+    from core.runner.runner import CaseRunner
+
+    executor = CaseExecutor(
+        HTTPClient(
+            cache=ResponseCache.from_config(),
+            recorder=cassette,
+            pool_maxsize=max(10, args.concurrency),
+            auth=TokenManager.from_config(),
+            transport=args.transport,
+        ),
+        LatencyRecorder(),
+        LatencyBaseline.from_config(),
+    )
+    return CaseRunner(
+        executor,
+        reporter=reporter,
+        concurrency=args.concurrency,
+        filters=args.filters,
+        shard_index=args.shard_index,
+        shard_count=args.shard_count,
+        base_dir=Path(args.case_dir),
+        on_result=None if args.quiet else _print_result,
+    )
+
+
+@contextmanager
+def _session(args: argparse.Namespace) -> Iterator["CaseRunner"]:
+    """创建执行器及其录制文件、报告器，结束时关闭"""
+    from core.http.recorder import Cassette
+    from core.report.reporter import create_reporter
+
+    cassette = None
+    if args.record:
+        cassette = Cassette(args.record, mode="record")
+    elif args.replay:
+        cassette = Cassette(args.replay, mode="replay")
+    reporter = create_reporter(
+        jsonl_path=args.report_jsonl,
+        junit_path=args.report_junit,
+        worker="",
+        batch_size=args.report_batch_size,
+    )
+    runner = None
+    try:
+        runner = _build_runner(args, cassette, reporter)
+        yield runner
+    finally:
+        if runner:
+            runner.executor.client.close()
+        if reporter:
+            reporter.close()
+        if cassette:
+            cassette.close()
+
+
+def _finish_summary(summary: "RunSummary", recorder: "LatencyRecorder", baseline: Optional["LatencyBaseline"]) -> int:
+    """按配置更新耗时基线并输出汇总结果，返回进程退出码"""
+    from utils import config_reader
+
+    if baseline and config_reader.get_latency_config().get("update_baseline"):
+        baseline.update(recorder.all_stats())
+        baseline.save()
+
+    for case_id in summary.failed_cases:
+        print(f"FAILED  {case_id}")
+    print(
+        f"共 {summary.total} 个用例，通过 {summary.passed}，失败 {summary.failed}，"
+        f"异常 {summary.errors}，耗时 {summary.duration:.3f}秒"
+    )
+    return summary.exit_code
+
+
+def run_command(args: argparse.Namespace) -> int:
+    """执行 run 子命令，返回进程退出码"""
+    with _session(args) as runner:
+        summary = runner.run(args.paths)
+    executor = runner.executor
+    return _finish_summary(summary, executor.latency_recorder, executor.latency_baseline)
+
+
+def soak_command(args: argparse.Namespace) -> int:
+    """执行 soak 子命令，检测到资源持续增长时返回3"""
+    from core.runner.soak import run_soak
+
+    with _session(args) as runner:
+        report = run_soak(
+            runner,
+            args.paths,
+            iterations=args.iterations,
+            duration=args.duration,
+            warmup=args.warmup,
+            trace_frames=args.trace_frames,
+            top=args.top,
+            on_sample=lambda sample: print(
+                f"第 {sample.iteration} 轮完成: {sample.cases} 个用例，失败 {sample.failed}，"
+                f"rss={sample.rss_bytes}，fds={sample.open_fds}，connections={sample.pool_connections}"
+            ),
+        )
+    print(report.format())
+    if args.soak_report:
+        report.write(args.soak_report)
+    return report.exit_code
+
+
+def local_worker_args(args: argparse.Namespace, address: str) -> List[str]:
+    """
+    返回在本机启动工作节点进程的命令行，转发影响执行结果的选项，本机节点与协调者使用相同的配置
+
+    Args:
+        args: coordinator 子命令的参数
+        address: 协调者实际监听的地址 host:port
+    """
+    worker_args = [
+        sys.executable,
+        str(Path(__file__).resolve()),
+        "worker",
+        address,
+        "-n",
+        str(args.concurrency),
+        "--case-dir",
+        str(Path(args.case_dir).resolve()),
+        # 心跳间隔需小于协调者的心跳超时，默认5秒
+        "--heartbeat-interval",
+        str(min(5.0, args.heartbeat_timeout / 3)),
+    ]
+    if args.config:
+        worker_args += ["--config", str(Path(args.config).resolve())]
+    if args.replay:
+        worker_args += ["--replay", str(Path(args.replay).resolve())]
+    if args.transport:
+        worker_args += ["--transport", args.transport]
+    return worker_args
+
+
+def coordinator_command(args: argparse.Namespace) -> int:
+    """执行 coordinator 子命令，结果与单机 run 的汇总和报告一致"""
+    from core.assertion.latency import LatencyBaseline, LatencyRecorder
+    from core.report.reporter import create_reporter
+    from core.runner.distributed import Coordinator, parse_address
+    from core.runner.runner import collect_files
+
+    base_dir = Path(args.case_dir)
+    host, port = parse_address(args.bind)
+    files = collect_files(args.paths, args.shard_index, args.shard_count, base_dir)
+    reporter = create_reporter(
+        jsonl_path=args.report_jsonl,
+        junit_path=args.report_junit,
+        worker="",
+        batch_size=args.report_batch_size,
+    )
+    recorder = LatencyRecorder()
+    coordinator = Coordinator(
+        files,
+        base_dir=base_dir,
+        filters=args.filters,
+        reporter=reporter,
+        host=host,
+        port=port,
+        lease_timeout=args.lease_timeout,
+        heartbeat_timeout=args.heartbeat_timeout,
+        on_result=None if args.quiet else _print_result,
+        latency_recorder=recorder,
+    )
+    processes: List[subprocess.Popen] = []
+    try:
+        coordinator.start()
+        bound_host, bound_port = coordinator.address
+        print(f"协调者监听 {bound_host}:{bound_port}，共 {len(files)} 个数据文件")
+        worker_args = local_worker_args(args, f"{bound_host}:{bound_port}")
+        for index in range(args.local_workers):
+            processes.append(subprocess.Popen(worker_args + ["--name", f"{socket.gethostname()}-local{index}"]))
+        alive = (lambda: any(process.poll() is None for process in processes)) if processes else None
+        summary = coordinator.wait(alive=alive)
+    finally:
+        coordinator.close()
+        if reporter:
+            reporter.close()
+        for process in processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+    return _finish_summary(summary, recorder, LatencyBaseline.from_config())
+
+
+def worker_command(args: argparse.Namespace) -> int:
+    """执行 worker 子命令，-n 大于1时在同一进程中建立多个连接并行执行，各数据文件的变量互不影响"""
+    import threading
+    from core.runner.distributed import Worker, parse_address
+
+    host, port = parse_address(args.address)
+    name = args.name or f"{socket.gethostname()}-{os.getpid()}"
+    errors: List[BaseException] = []
+
+    def serve(worker: Worker) -> None:
+        try:
+            worker.run()
+        except Exception as e:
+            errors.append(e)
+            print(f"工作节点 {worker.name} 异常退出: {e}", file=sys.stderr)
+
+    with _session(args) as runner:
+        workers = [
+            Worker(
+                runner.executor,
+                host,
+                port,
+                name=name if args.concurrency == 1 else f"{name}-{index}",
+                base_dir=Path(args.case_dir),
+                heartbeat_interval=args.heartbeat_interval,
+            )
+            for index in range(args.concurrency)
+        ]
+        threads = [threading.Thread(target=serve, args=(worker,), name=worker.name) for worker in workers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    return 1 if errors else 0
+
+
+def merge_command(args: argparse.Namespace) -> int:
+    """执行 merge 子命令，没有找到任何工作进程的报告时返回1"""
+    from core.report.reporter import merge_worker_reports
+
+    merged = merge_worker_reports(args.report_jsonl, args.report_junit)
+    for path, count in merged.items():
+        print(f"{path}: 合并 {count} 个用例")
+    return 0 if merged else 1
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.shard_count < 1 or not 0 <= args.shard_index < args.shard_count:
+        parser.error("--shard-index 必须满足 0 <= shard-index < shard-count")
+    if args.concurrency < 1:
+        parser.error("--concurrency 必须大于0")
+    if args.config:
+        from utils import config_reader
+
+        config_reader.set_config_path(args.config)
+    if args.command == "soak":
+        if not args.iterations and not args.duration:
+            parser.error("soak 需要指定 --iterations 或 --duration")
+        return soak_command(args)
+    if args.command == "coordinator":
+        if args.record:
+            parser.error("coordinator 不支持 --record，录制请使用单机 run")
+        if args.local_workers < 0:
+            parser.error("--local-workers 不能小于0")
+        return coordinator_command(args)
+    if args.command == "worker":
+        return worker_command(args)
+    if args.command == "merge":
+        if not args.report_jsonl and not args.report_junit:
+            parser.error("merge 需要指定 --report-jsonl 或 --report-junit")
+        return merge_command(args)
+    return run_command(args)
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
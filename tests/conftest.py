@@ -1,28 +1,87 @@
+import json
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
 import pytest
-from typing import List, Dict, Any
-from data import data_processor
-from utils import replacer
-from utils import  file, path
-
-
-@pytest.fixture(autouse=True)
-def get_test_data_path() -> list[str]:
-    path_list:List[str]=[]
-    data_path = path.path_util()
-    for k,v in data_path.items():
-        for i in v:
-            path_list.append(i)
-        
-    return path_list
-
-@pytest.fixture(autouse=True)
-def get_case_data(file_path: str) -> List[Dict[str, Any]]:
-    data = file.FileTypeUtil.get_file_helper(file_path)
-    if not data:
-        raise ValueError(f"无法读取文件: {file_path}")
-    for i in data:
-        data_processor.data_processing(i) 
-        i["url"] = replacer.replace_url(i["url"])
-        replacer.replace_data(i)
-        print("data: ", i)
-    return data
\ No newline at end of file
+
+
+# 路由处理函数，参数为 (请求处理器, URL参数, 请求体)，返回 (状态码, 响应头, 响应体)
+Route = Callable[[BaseHTTPRequestHandler, Dict[str, str], bytes], Tuple[int, Dict[str, str], bytes]]
+
+
+def json_response(data: Any, status: int = 200, headers: Optional[Dict[str, str]] = None) -> Tuple[int, Dict[str, str], bytes]:
+    """生成JSON响应"""
+    return status, {"Content-Type": "application/json", **(headers or {})}, json.dumps(data).encode("utf-8")
+
+
+class StubServer:
+    """本地HTTP替身服务，按 (方法, 路径) 注册路由，并记录每个路径收到的请求数"""
+
+    def __init__(self):
+        self.routes: Dict[Tuple[str, str], Route] = {}
+        self.hits: Counter = Counter()
+        self.requests: list[Dict[str, Any]] = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _handle(self) -> None:
+                parts = urlsplit(self.path)
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                with stub._lock:
+                    stub.hits[parts.path] += 1
+                    stub.requests.append({"method": self.command, "path": parts.path, "headers": dict(self.headers), "body": body})
+                route = stub.routes.get((self.command, parts.path))
+                if route is None:
+                    status, headers, content = json_response({"error": "not found"}, 404)
+                else:
+                    params = {key: values[0] for key, values in parse_qs(parts.query).items()}
+                    status, headers, content = route(self, params, body)
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            do_GET = do_POST = do_PUT = do_DELETE = _handle
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def route(self, method: str, path: str) -> Callable[[Route], Route]:
+        """注册路由的装饰器"""
+
+        def register(handler: Route) -> Route:
+            self.routes[(method, path)] = handler
+            return handler
+
+        return register
+
+    def start(self) -> None:
+        threading.Thread(target=self._server.serve_forever, args=(0.05,), name="stub-server", daemon=True).start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def stub_server() -> Iterator[StubServer]:
+    """每个测试独立的本地HTTP替身服务"""
+    server = StubServer()
+    server.start()
+    yield server
+    server.stop()
@@ -0,0 +1,139 @@
+import io
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from requests import Request
+from conftest import json_response
+from core.http.auth import AuthConfig, AuthError, TokenManager
+from core.http.client import HTTPClient
+from utils.serializer import stdlib_dumps
+
+
+def _config(origin: str, **kwargs) -> AuthConfig:
+    return AuthConfig(host="api", origin=origin, login={}, token_path="$.token", **kwargs)
+
+
+class _FakeResponse:
+    def __init__(self, body, status_code=200):
+        self.body = body
+        self.status_code = status_code
+        self.ok = status_code < 400
+
+    def json(self):
+        return self.body
+
+
+class TestTokenManager:
+    """令牌单线程刷新与注入"""
+
+    def test_single_flight_login(self):
+        manager = TokenManager([_config("http://api.test")])
+        calls = []
+        started = threading.Event()
+
+        def login(case_data):
+            calls.append(threading.current_thread().name)
+            started.set()
+            time.sleep(0.2)
+            return _FakeResponse({"token": f"t{len(calls)}"})
+
+        def apply(_):
+            request = Request("GET", "http://api.test/user").prepare()
+            manager.apply(request, login)
+            return request.headers["Authorization"]
+
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            headers = list(pool.map(apply, range(64)))
+        assert len(calls) == 1
+        assert set(headers) == {"Bearer t1"}
+        assert manager.provider_for("http://api.test/x").logins == 1
+
+    def test_refresh_after_expiry(self):
+        manager = TokenManager([_config("http://api.test", expires_in=0.1, refresh_margin=0)])
+        tokens = iter(["t1", "t2"])
+
+        def login(case_data):
+            return _FakeResponse({"token": next(tokens)})
+
+        request = Request("GET", "http://api.test/user").prepare()
+        assert manager.apply(request, login) == "t1"
+        time.sleep(0.15)
+        request = Request("GET", "http://api.test/user").prepare()
+        assert manager.apply(request, login) == "t2"
+
+    def test_other_hosts_and_explicit_tokens_are_untouched(self):
+        manager = TokenManager([_config("http://api.test")])
+
+        def login(case_data):
+            raise AssertionError("不应登录")
+
+        other = Request("GET", "http://other.test/user").prepare()
+        assert manager.apply(other, login) is None
+        explicit = Request("GET", "http://api.test/user", headers={"Authorization": "Bearer invalid"}).prepare()
+        assert manager.apply(explicit, login) is None
+        assert explicit.headers["Authorization"] == "Bearer invalid"
+
+    def test_login_failure(self):
+        manager = TokenManager([_config("http://api.test")])
+        request = Request("GET", "http://api.test/user").prepare()
+        with pytest.raises(AuthError):
+            manager.apply(request, lambda case_data: _FakeResponse({}, status_code=500))
+
+    def test_rejected_token_is_refreshed_once(self, stub_server):
+        tokens = iter(["expired", "fresh"])
+        stub_server.route("POST", "/login")(lambda handler, params, body: json_response({"token": next(tokens)}))
+
+        @stub_server.route("GET", "/user")
+        def user(handler, params, body):
+            if handler.headers.get("Authorization") != "Bearer fresh":
+                return json_response({}, 401)
+            return json_response({"id": 1})
+
+        config = AuthConfig(
+            host="api",
+            origin=stub_server.url,
+            login={"url": stub_server.url + "/login", "method": "POST", "json": {"user": "a"}},
+            token_path="$.token",
+        )
+        client = HTTPClient(serializer=stdlib_dumps, auth=TokenManager([config]), transport="http1")
+        response = client.send_request("GET", stub_server.url + "/user")
+        assert response.status_code == 200
+        assert stub_server.hits["/login"] == 2
+        assert stub_server.hits["/user"] == 2
+
+    def _upload_client(self, stub_server):
+        tokens = iter(["expired", "fresh"])
+        stub_server.route("POST", "/login")(lambda handler, params, body: json_response({"token": next(tokens)}))
+
+        @stub_server.route("POST", "/upload")
+        def upload(handler, params, body):
+            if handler.headers.get("Authorization") != "Bearer fresh":
+                return json_response({}, 401)
+            return json_response({"size": len(body)})
+
+        config = AuthConfig(
+            host="api",
+            origin=stub_server.url,
+            login={"url": stub_server.url + "/login", "method": "POST", "json": {"user": "a"}},
+            token_path="$.token",
+        )
+        return HTTPClient(serializer=stdlib_dumps, auth=TokenManager([config]), transport="http1")
+
+    def test_retry_rewinds_file_body(self, stub_server):
+        client = self._upload_client(stub_server)
+        response = client.send_request("POST", stub_server.url + "/upload", data=io.BytesIO(b"payload"))
+        assert response.status_code == 200
+        assert [request["body"] for request in stub_server.requests if request["path"] == "/upload"] == [b"payload"] * 2
+
+    def test_stream_body_is_not_retried(self, stub_server):
+        from requests_toolbelt.multipart.encoder import MultipartEncoder
+
+        client = self._upload_client(stub_server)
+        encoder = MultipartEncoder(fields={"file": ("a.txt", b"payload", "text/plain")})
+        response = client.send_request("POST", stub_server.url + "/upload", data=encoder, headers={"Content-Type": encoder.content_type})
+        # 请求体已被消耗，不重试，令牌已作废，下一个请求重新登录
+        assert response.status_code == 401
+        assert stub_server.hits["/upload"] == 1
+        assert client.send_request("POST", stub_server.url + "/upload", data=b"x").status_code == 200
+        assert stub_server.hits["/login"] == 2
@@ -0,0 +1,101 @@
+from conftest import json_response
+from core.http.cache import ResponseCache
+from core.http.client import HTTPClient
+from utils.serializer import stdlib_dumps
+
+
+def _client(cache: ResponseCache) -> HTTPClient:
+    return HTTPClient(cache=cache, serializer=stdlib_dumps, transport="http1")
+
+
+def _expire(cache: ResponseCache) -> None:
+    for store in cache._stores.values():
+        for entry in store.values():
+            entry.expires_at = 0.0
+
+
+class TestResponseCache:
+    """响应缓存的有效期与304重新验证"""
+
+    def test_fresh_entry_is_served_from_cache(self, stub_server):
+        stub_server.route("GET", "/user")(lambda handler, params, body: json_response({"id": 1}))
+        client = _client(ResponseCache(ttl=60))
+        first = client.send_request("GET", stub_server.url + "/user")
+        second = client.send_request("GET", stub_server.url + "/user")
+        assert first.json() == second.json() == {"id": 1}
+        assert not getattr(first, "from_cache", False)
+        assert second.from_cache is True
+        assert stub_server.hits["/user"] == 1
+        assert client.cache.hits == 1 and client.cache.misses == 1
+
+    def test_expired_entry_without_validator_is_fetched_again(self, stub_server):
+        stub_server.route("GET", "/user")(lambda handler, params, body: json_response({"id": 1}))
+        client = _client(ResponseCache(ttl=60))
+        client.send_request("GET", stub_server.url + "/user")
+        _expire(client.cache)
+        client.send_request("GET", stub_server.url + "/user")
+        assert stub_server.hits["/user"] == 2
+
+    def test_expired_entry_is_revalidated_with_etag(self, stub_server):
+        @stub_server.route("GET", "/user")
+        def user(handler, params, body):
+            if handler.headers.get("If-None-Match") == '"v1"':
+                return 304, {"ETag": '"v1"'}, b""
+            return json_response({"id": 1}, headers={"ETag": '"v1"'})
+
+        client = _client(ResponseCache(ttl=60))
+        client.send_request("GET", stub_server.url + "/user")
+        _expire(client.cache)
+        response = client.send_request("GET", stub_server.url + "/user")
+        assert response.status_code == 200
+        assert response.json() == {"id": 1}
+        assert response.from_cache is True
+        assert stub_server.hits["/user"] == 2
+        assert stub_server.requests[-1]["headers"].get("If-None-Match") == '"v1"'
+        assert client.cache.stats() == {"hits": 0, "misses": 1, "revalidations": 1, "revalidated": 1}
+        # 304后有效期刷新，再次请求直接命中
+        client.send_request("GET", stub_server.url + "/user")
+        assert stub_server.hits["/user"] == 2
+        assert client.cache.stats() == {"hits": 1, "misses": 1, "revalidations": 1, "revalidated": 1}
+
+    def test_changed_and_unvalidatable_entries_are_counted(self, stub_server):
+        versions = iter(['"v1"', '"v2"'])
+        stub_server.route("GET", "/user")(lambda handler, params, body: json_response({"id": 1}, headers={"ETag": next(versions)}))
+        stub_server.route("GET", "/plain")(lambda handler, params, body: json_response({"id": 2}))
+        client = _client(ResponseCache(ttl=60))
+        for path in ("/user", "/plain"):
+            client.send_request("GET", stub_server.url + path)
+        _expire(client.cache)
+        for path in ("/user", "/plain"):
+            client.send_request("GET", stub_server.url + path)
+        # /user 发送条件请求但内容已变化（200），/plain 过期后无法重新验证，计为未命中
+        assert client.cache.stats() == {"hits": 0, "misses": 3, "revalidations": 1, "revalidated": 0}
+
+    def test_use_cache_false_bypasses_cache(self, stub_server):
+        stub_server.route("GET", "/user")(lambda handler, params, body: json_response({"id": 1}))
+        client = _client(ResponseCache(ttl=60))
+        client.send_request("GET", stub_server.url + "/user", use_cache=False)
+        client.send_request("GET", stub_server.url + "/user", use_cache=False)
+        assert stub_server.hits["/user"] == 2
+
+    def test_no_store_and_post_are_not_cached(self, stub_server):
+        stub_server.route("GET", "/nostore")(
+            lambda handler, params, body: json_response({}, headers={"Cache-Control": "no-store"})
+        )
+        stub_server.route("POST", "/user")(lambda handler, params, body: json_response({"id": 1}))
+        client = _client(ResponseCache(ttl=60))
+        for _ in range(2):
+            client.send_request("GET", stub_server.url + "/nostore")
+            client.send_request("POST", stub_server.url + "/user", json={"name": "a"})
+        assert stub_server.hits["/nostore"] == 2
+        assert stub_server.hits["/user"] == 2
+
+    def test_lru_eviction_respects_max_bytes(self, stub_server):
+        stub_server.route("GET", "/a")(lambda handler, params, body: (200, {}, b"a" * 60))
+        stub_server.route("GET", "/b")(lambda handler, params, body: (200, {}, b"b" * 60))
+        client = _client(ResponseCache(ttl=60, max_bytes=100))
+        client.send_request("GET", stub_server.url + "/a")
+        client.send_request("GET", stub_server.url + "/b")
+        assert client.cache.size() == 60
+        client.send_request("GET", stub_server.url + "/a")
+        assert stub_server.hits["/a"] == 2
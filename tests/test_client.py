@@ -0,0 +1,24 @@
+from conftest import json_response
+from core.http.client import HTTPClient
+from utils.serializer import stdlib_dumps
+
+
+class TestConnectionStats:
+    """连接池统计反映当前打开的连接，而不是累计创建的连接"""
+
+    def test_keep_alive_reuses_one_connection(self, stub_server):
+        stub_server.route("GET", "/user")(lambda handler, params, body: json_response({"id": 1}))
+        client = HTTPClient(serializer=stdlib_dumps, transport="http1")
+        for _ in range(5):
+            client.send_request("GET", stub_server.url + "/user", use_cache=False)
+        assert client.connection_stats() == {"pools": 1, "connections": 1, "idle": 1}
+        client.close()
+
+    def test_reconnects_do_not_count_as_growth(self, stub_server):
+        stub_server.route("GET", "/user")(lambda handler, params, body: json_response({"id": 1}, headers={"Connection": "close"}))
+        client = HTTPClient(serializer=stdlib_dumps, transport="http1")
+        for _ in range(5):
+            client.send_request("GET", stub_server.url + "/user", use_cache=False)
+        # 每次请求后服务端关闭连接，累计创建了5个连接，当前没有打开的连接
+        assert client.connection_stats()["connections"] == 0
+        client.close()
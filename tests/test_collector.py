@@ -0,0 +1,50 @@
+import yaml
+from core.runner.collector import iter_cases, iter_file_cases, relative_source
+
+
+def _write(path, cases) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(yaml.safe_dump(cases, allow_unicode=True), encoding="utf-8")
+
+
+class TestCollector:
+    """数据文件的每一行展开为独立的用例，用例ID稳定"""
+
+    def test_each_row_gets_a_stable_id(self, tmp_path):
+        source = tmp_path / "cases" / "user" / "login.yaml"
+        _write(source, [{"url": "/a"}, {"url": "/b", "case_id": "wrong_password"}, {"url": "/c"}])
+        refs = [ref for ref, _ in iter_file_cases(source, tmp_path / "cases")]
+        assert [ref.case_id for ref in refs] == [
+            "user/login.yaml::1",
+            "user/login.yaml::wrong_password",
+            "user/login.yaml::3",
+        ]
+        assert [ref.index for ref in refs] == [1, 2, 3]
+        assert [ref.name for ref in refs] == ["1", "wrong_password", "3"]
+
+    def test_duplicate_ids_get_row_suffix(self, tmp_path):
+        source = tmp_path / "a.yaml"
+        _write(source, [{"url": "/a", "case_id": "login"}, {"url": "/b", "case_id": "login"}, {"url": "/c", "case_id": 1}, {"url": "/d"}])
+        refs = [ref for ref, _ in iter_file_cases(source, tmp_path)]
+        # 第一次出现的标识保持不变，显式ID与行号相同时也视为重复
+        assert [ref.case_id for ref in refs] == ["a.yaml::login", "a.yaml::login#2", "a.yaml::1", "a.yaml::4"]
+        assert len({ref.case_id for ref in refs}) == len(refs)
+
+    def test_content_hash_tracks_row_changes(self, tmp_path):
+        source = tmp_path / "a.yaml"
+        _write(source, [{"url": "/a"}, {"url": "/b"}])
+        before = [ref.content_hash for ref, _ in iter_file_cases(source, tmp_path)]
+        _write(source, [{"url": "/a"}, {"url": "/changed"}])
+        after = [ref.content_hash for ref, _ in iter_file_cases(source, tmp_path)]
+        assert before[0] == after[0]
+        assert before[1] != after[1]
+
+    def test_files_are_read_in_order(self, tmp_path):
+        _write(tmp_path / "b.yaml", [{"url": "/b"}])
+        _write(tmp_path / "a" / "z.yaml", [{"url": "/z"}])
+        _write(tmp_path / "a.yaml", [{"url": "/a"}, {"url": "/a2"}])
+        case_ids = [ref.case_id for ref, _ in iter_cases([tmp_path], tmp_path)]
+        assert case_ids == ["a.yaml::1", "a.yaml::2", "a/z.yaml::1", "b.yaml::1"]
+
+    def test_relative_source_outside_case_dir(self, tmp_path):
+        assert relative_source(tmp_path / "x" / "a.yaml", tmp_path / "cases") == "a.yaml"
@@ -0,0 +1,31 @@
+from utils import config_reader
+from utils.path import PACKAGE_ROOT
+
+
+class TestConfigPath:
+    """配置文件的查找顺序"""
+
+    def test_lookup_order(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(config_reader, "PROJECT_ROOT", tmp_path)
+        monkeypatch.delenv(config_reader.CONFIG_ENV, raising=False)
+        # 项目根目录下没有配置时使用随包发布的默认配置
+        assert config_reader.config_file_path() == PACKAGE_ROOT / "config/base_config.yaml"
+
+        project_config = tmp_path / "config" / "base_config.yaml"
+        project_config.parent.mkdir()
+        project_config.write_text("Http: {timeout: 1}\n", encoding="utf-8")
+        assert config_reader.config_file_path() == project_config
+
+        env_config = tmp_path / "env.yaml"
+        monkeypatch.setenv(config_reader.CONFIG_ENV, str(env_config))
+        assert config_reader.config_file_path() == env_config
+
+        explicit = tmp_path / "explicit.yaml"
+        explicit.write_text("Http: {timeout: 2}\n", encoding="utf-8")
+        try:
+            config_reader.set_config_path(explicit)
+            assert config_reader.config_file_path() == explicit
+            assert config_reader.get_config() == {"Http": {"timeout": 2}}
+        finally:
+            config_reader.set_config_path(None)
+        assert config_reader.config_file_path() == env_config
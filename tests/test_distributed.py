@@ -0,0 +1,195 @@
+import socket
+import threading
+import pytest
+import yaml
+import main
+from conftest import json_response
+from core.http.client import HTTPClient
+from core.runner.distributed import PROTOCOL_VERSION, Coordinator, Worker, _read_message, _send_message, parse_address
+from core.runner.executor import CaseExecutor
+from core.runner.runner import CaseRunner
+from utils.serializer import stdlib_dumps
+
+
+def _write_cases(tmp_path, url: str, files: int = 4, cases: int = 3) -> list[str]:
+    paths = []
+    for file_index in range(files):
+        path = tmp_path / f"api{file_index}.yaml"
+        data = [
+            {
+                "url": f"{url}/echo",
+                "method": "GET",
+                "params": {"file": file_index, "case": case_index},
+                "exception": [{"asset_type": "status_code", "excpect_value": 200}],
+            }
+            for case_index in range(cases)
+        ]
+        path.write_text(yaml.safe_dump(data), encoding="utf-8")
+        paths.append(str(path))
+    return paths
+
+
+def _executor() -> CaseExecutor:
+    return CaseExecutor(HTTPClient(serializer=stdlib_dumps, transport="http1"))
+
+
+def _start_workers(coordinator: Coordinator, tmp_path, count: int) -> list[threading.Thread]:
+    host, port = coordinator.address
+    executor = _executor()
+    threads = [
+        threading.Thread(target=Worker(executor, host, port, name=f"w{index}", base_dir=tmp_path).run, daemon=True)
+        for index in range(count)
+    ]
+    for thread in threads:
+        thread.start()
+    return threads
+
+
+@pytest.fixture
+def echo_server(stub_server):
+    stub_server.route("GET", "/echo")(lambda handler, params, body: json_response(params))
+    return stub_server
+
+
+class TestProtocol:
+    """协调者与工作节点之间的消息协议"""
+
+    @pytest.mark.parametrize(
+        "address, expected",
+        [("127.0.0.1:7100", ("127.0.0.1", 7100)), (":7100", ("127.0.0.1", 7100)), ("[::1]:80", ("[::1]", 80))],
+    )
+    def test_parse_address(self, address, expected):
+        assert parse_address(address) == expected
+
+    @pytest.mark.parametrize("address", ["localhost", "host:port", ""])
+    def test_parse_invalid_address(self, address):
+        with pytest.raises(ValueError):
+            parse_address(address)
+
+    def test_message_roundtrip(self):
+        left, right = socket.socketpair()
+        with left, right, right.makefile("rb") as reader:
+            message = {"type": "result", "unit_id": 1, "result": {"case_id": "用例::1"}}
+            _send_message(left, threading.Lock(), message)
+            assert _read_message(reader) == message
+            left.shutdown(socket.SHUT_WR)
+            assert _read_message(reader) is None
+
+    def test_incompatible_worker_is_rejected(self, tmp_path):
+        coordinator = Coordinator([], base_dir=tmp_path)
+        coordinator.start()
+        try:
+            with socket.create_connection(coordinator.address) as sock, sock.makefile("rb") as reader:
+                _send_message(sock, threading.Lock(), {"type": "hello", "version": PROTOCOL_VERSION + 1, "worker": "old"})
+                assert _read_message(reader) is None
+        finally:
+            coordinator.close()
+
+
+class TestDistributedRun:
+    """分布式执行的结果与单机执行一致"""
+
+    def test_results_match_single_node(self, tmp_path, echo_server):
+        files = _write_cases(tmp_path, echo_server.url)
+        single = []
+        CaseRunner(_executor(), base_dir=tmp_path, on_result=single.append).run(files)
+
+        committed = []
+        coordinator = Coordinator(files, base_dir=tmp_path, on_result=committed.append)
+        coordinator.start()
+        try:
+            threads = _start_workers(coordinator, tmp_path, 3)
+            summary = coordinator.wait()
+            for thread in threads:
+                thread.join(5)
+        finally:
+            coordinator.close()
+        assert summary.total == summary.passed == 12
+        assert [(r.case_id, r.source, r.outcome) for r in committed] == [(r.case_id, r.source, r.outcome) for r in single]
+        assert {result.worker for result in committed} <= {"w0", "w1", "w2"}
+
+    def test_unit_of_disconnected_worker_is_requeued(self, tmp_path, echo_server):
+        files = _write_cases(tmp_path, echo_server.url, files=2)
+        coordinator = Coordinator(files, base_dir=tmp_path)
+        coordinator.start()
+        try:
+            # 领取工作单元后直接断开的节点
+            with socket.create_connection(coordinator.address) as sock, sock.makefile("rb") as reader:
+                lock = threading.Lock()
+                _send_message(sock, lock, {"type": "hello", "version": PROTOCOL_VERSION, "worker": "flaky"})
+                assert _read_message(reader)["type"] == "welcome"
+                _send_message(sock, lock, {"type": "ready"})
+                assert _read_message(reader)["type"] == "unit"
+            threads = _start_workers(coordinator, tmp_path, 1)
+            summary = coordinator.wait()
+            for thread in threads:
+                thread.join(5)
+        finally:
+            coordinator.close()
+        assert summary.total == summary.passed == 6
+        assert coordinator.units[0].attempts == 2
+
+    def test_worker_threads_have_separate_variables(self, tmp_path, stub_server):
+        barrier = threading.Barrier(2, timeout=5)
+        stub_server.route("GET", "/login")(lambda handler, params, body: json_response({"token": params["user"]}))
+
+        @stub_server.route("GET", "/sync")
+        def sync(handler, params, body):
+            barrier.wait()
+            return json_response({})
+
+        stub_server.route("GET", "/whoami")(lambda handler, params, body: json_response({"token": params.get("token")}))
+        files = []
+        for user in ("alice", "bob"):
+            cases = [
+                {"url": stub_server.url + "/login", "method": "GET", "params": {"user": user}, "variable": {"token": "$.token"}},
+                {"url": stub_server.url + "/sync", "method": "GET"},
+                {
+                    "url": stub_server.url + "/whoami",
+                    "method": "GET",
+                    "params": {"token": "${token}"},
+                    "exception": [{"asset_type": "body", "exp": "$.token", "excpect_value": user}],
+                },
+            ]
+            path = tmp_path / f"{user}.yaml"
+            path.write_text(yaml.safe_dump(cases), encoding="utf-8")
+            files.append(str(path))
+
+        # 与 worker -n 2 相同：两个工作节点线程共享一个执行器
+        coordinator = Coordinator(files, base_dir=tmp_path)
+        coordinator.start()
+        try:
+            threads = _start_workers(coordinator, tmp_path, 2)
+            summary = coordinator.wait()
+            for thread in threads:
+                thread.join(5)
+        finally:
+            coordinator.close()
+        assert summary.total == 6
+        assert summary.failed_cases == []
+
+
+class TestLocalWorkers:
+    """协调者启动的本机工作节点使用与协调者相同的配置"""
+
+    def test_config_affecting_options_are_forwarded(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        parser = main.build_parser()
+        args = parser.parse_args(
+            ["coordinator", "--config", "cfg.yaml", "--replay", "cassette.jsonl", "--transport", "h2", "-n", "2", "--heartbeat-timeout", "6"]
+        )
+        worker_args = main.local_worker_args(args, "127.0.0.1:7100")
+        worker = parser.parse_args(worker_args[2:])
+        assert worker.command == "worker"
+        assert worker.address == "127.0.0.1:7100"
+        assert worker.concurrency == 2
+        assert worker.config == str(tmp_path / "cfg.yaml")
+        assert worker.replay == str(tmp_path / "cassette.jsonl")
+        assert worker.transport == "h2"
+        assert worker.heartbeat_interval == 2.0
+
+    def test_defaults_are_not_forwarded(self):
+        parser = main.build_parser()
+        worker = parser.parse_args(main.local_worker_args(parser.parse_args(["coordinator"]), "127.0.0.1:7100")[2:])
+        assert worker.config is None and worker.replay is None and worker.transport is None
+        assert worker.heartbeat_interval == 5.0
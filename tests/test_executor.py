@@ -0,0 +1,68 @@
+import pytest
+from conftest import json_response
+from core.http.cache import ResponseCache
+from core.http.client import HTTPClient
+from core.runner import executor as executor_module
+from core.runner.executor import CaseExecutor
+from data.case import Case
+from utils.serializer import stdlib_dumps
+
+
+def _executor() -> CaseExecutor:
+    return CaseExecutor(HTTPClient(serializer=stdlib_dumps, transport="http1"))
+
+
+class TestCaseExecutor:
+    """用例执行流水线"""
+
+    def test_assertion_plan_is_compiled_once_per_case(self, stub_server, monkeypatch):
+        stub_server.route("GET", "/user")(lambda handler, params, body: json_response({"id": 1}))
+        compiled = []
+        compile_assertions = executor_module.compile_assertions
+
+        def counting(exception):
+            compiled.append(exception)
+            return compile_assertions(exception)
+
+        monkeypatch.setattr(executor_module, "compile_assertions", counting)
+        case = Case.from_dict(
+            {
+                "url": stub_server.url + "/user",
+                "method": "GET",
+                "repeat": 2,
+                "exception": [{"asset_type": "body", "exp": "$.id", "excpect_value": 1}],
+            }
+        )
+        executor = _executor()
+        results = [executor.execute(case, "user.yaml::1") for _ in range(3)]
+        assert [result.outcome for result in results] == ["passed"] * 3
+        assert len(compiled) == 1
+        assert stub_server.hits["/user"] == 6
+
+    def test_cached_responses_are_not_recorded_as_latency(self, stub_server):
+        stub_server.route("GET", "/user")(lambda handler, params, body: json_response({"id": 1}))
+        executor = CaseExecutor(HTTPClient(cache=ResponseCache(ttl=60), serializer=stdlib_dumps, transport="http1"))
+        case = {"url": stub_server.url + "/user", "method": "GET", "repeat": 3, "latency": {"p95": 5}}
+        assert executor.execute(case, "a.yaml::1").passed
+        # 只有第一次请求真正发送，后两次命中缓存
+        assert stub_server.hits["/user"] == 1
+        assert executor.latency_recorder.stats("a.yaml::1").count == 1
+
+        # 全部命中缓存时没有耗时样本，跳过耗时断言
+        assert executor.execute(case, "b.yaml::1").passed
+        assert executor.latency_recorder.stats("b.yaml::1") is None
+
+    @pytest.mark.parametrize("data_type", ["file", "form"])
+    def test_repeat_resends_upload_body(self, stub_server, tmp_path, data_type):
+        stub_server.route("POST", "/upload")(lambda handler, params, body: json_response({"size": len(body)}))
+        upload = tmp_path / "upload.txt"
+        upload.write_bytes(b"payload-content")
+        data = {"file": str(upload)} if data_type == "file" else {"file": ("upload.txt", upload.read_bytes(), "text/plain")}
+        case = Case.from_dict(
+            {"url": stub_server.url + "/upload", "method": "POST", "repeat": 3, "data_type": data_type, "data": data}
+        )
+        result = _executor().execute(case, "upload.yaml::1")
+        assert result.outcome == "passed", result.error
+        bodies = [request["body"] for request in stub_server.requests]
+        assert len(bodies) == 3
+        assert all(b"payload-content" in body for body in bodies)
@@ -0,0 +1,26 @@
+from utils.import_budget import IMPORT_BUDGETS, _parse_cumulative, check_budgets, discover_modules
+
+
+class TestImportBudget:
+    """导入耗时预算"""
+
+    def test_modules_are_discovered_from_packages(self):
+        modules = discover_modules()
+        assert set(IMPORT_BUDGETS) <= set(modules)
+        assert "core.http.client" in modules
+        assert not any(module.endswith("__init__") for module in modules)
+
+    def test_parse_cumulative(self):
+        output = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |   yaml.error\n"
+            "import time:      3000 |      45000 | core.runner.pytest_plugin\n"
+        )
+        assert _parse_cumulative(output, "core.runner.pytest_plugin") == 45.0
+
+    def test_pytest_plugin_within_budget(self):
+        # 插件在收集阶段不应导入requests等执行依赖
+        module = "core.runner.pytest_plugin"
+        (timing,) = check_budgets({module: IMPORT_BUDGETS[module]}, repeat=2)
+        assert timing.baseline_ms > 0
+        assert not timing.over_budget, f"{module} 导入耗时为基准的 {timing.ratio:.2f} 倍，预算 {timing.budget}"
@@ -0,0 +1,52 @@
+import pytest
+from utils.jsonpath import compile_jsonpath, iter_compiled, iter_jsonpath
+
+
+DATA = {
+    "code": 0,
+    "data": {
+        "items": [
+            {"id": 1, "name": "a", "tags": ["x", "y"], "child": {"id": 11}},
+            {"id": 2, "name": "b", "tags": [], "child": {"id": 12}},
+            {"id": 3, "name": "c", "tags": ["z"]},
+        ],
+        "total": 3,
+    },
+    "list": [[1, 2], [3, 4]],
+}
+
+EXPRESSIONS = [
+    "$.code",
+    "$.data.total",
+    "$.data.items[0].name",
+    "$.data.items[-1].id",
+    "$.data.items[*].id",
+    "$.data.items[1:].name",
+    "$.data.items[::2].id",
+    "$.data.items[*].tags[*]",
+    "$..id",
+    "$..child.id",
+    "$.data.*",
+    "$.list[*][1]",
+    "$.missing",
+    "$.code[*]",
+    "$.code | $.data.total",
+]
+
+
+class TestIterCompiled:
+    """惰性求值与jsonpath_ng完整匹配的结果一致"""
+
+    @pytest.mark.parametrize("expression", EXPRESSIONS)
+    def test_same_values_as_jsonpath_ng(self, expression):
+        expr = compile_jsonpath(expression)
+        expected = [match.value for match in expr.find(DATA)]
+        assert list(iter_compiled(expr, DATA)) == expected
+
+    def test_is_lazy(self):
+        # 取到第一个值后停止，不会遍历后续节点
+        values = iter_jsonpath({"items": [{"id": 1}, None]}, "$.items[*].id")
+        assert next(values) == 1
+
+    def test_compile_is_cached(self):
+        assert compile_jsonpath("$.data.items[*].id") is compile_jsonpath("$.data.items[*].id")
@@ -0,0 +1,109 @@
+import pytest
+from core.assertion import latency as latency_module
+from core.assertion.latency import LatencyBaseline, LatencyRecorder, LatencyStats, assert_latency, percentile
+from utils import config_reader
+
+
+def _stats(p95: float) -> LatencyStats:
+    return LatencyStats(count=10, p50=p95 / 2, p95=p95, max=p95, mean=p95 / 2)
+
+
+class TestPercentile:
+    """百分位数按线性插值计算"""
+
+    @pytest.mark.parametrize("p, expected", [(0, 1.0), (50, 3.0), (95, 4.8), (100, 5.0)])
+    def test_interpolation(self, p, expected):
+        assert percentile([5.0, 1.0, 4.0, 2.0, 3.0], p) == pytest.approx(expected)
+
+    def test_single_sample(self):
+        assert percentile([0.2], 95) == 0.2
+
+    def test_empty_samples_are_rejected(self):
+        with pytest.raises(ValueError):
+            percentile([], 50)
+
+    def test_recorder_stats(self):
+        recorder = LatencyRecorder()
+        assert recorder.stats("a::1") is None
+        for seconds in (0.1, 0.3, 0.2):
+            recorder.record("a::1", seconds)
+        stats = recorder.stats("a::1")
+        assert (stats.count, stats.p50, stats.max) == (3, 0.2, 0.3)
+        assert stats.mean == pytest.approx(0.2)
+        assert recorder.pop("a::1") == [0.1, 0.3, 0.2]
+        assert recorder.all_stats() == {}
+
+
+class TestSlo:
+    """用例 latency 配置的SLO断言"""
+
+    def test_within_thresholds(self):
+        assert_latency("a::1", _stats(0.4), {"p50": 0.3, "p95": "0.5"})
+        assert_latency("a::1", _stats(9.0), None)
+
+    def test_exceeded_thresholds_are_reported_together(self):
+        with pytest.raises(AssertionError) as excinfo:
+            assert_latency("a::1", _stats(0.8), {"p50": 0.3, "p95": 0.5})
+        message = str(excinfo.value)
+        assert "10 次执行" in message
+        assert "p50=0.400秒 超过阈值 0.300秒" in message
+        assert "p95=0.800秒 超过阈值 0.500秒" in message
+
+    def test_unknown_metric_is_rejected(self):
+        with pytest.raises(ValueError, match="p99"):
+            assert_latency("a::1", _stats(0.1), {"p99": 0.5})
+
+
+class TestBaseline:
+    """历史耗时基线的回退比较与更新"""
+
+    def test_regression_check(self, tmp_path):
+        path = tmp_path / "baseline.yaml"
+        path.write_text("a::1: {p95: 0.1}\nb::1: {p95: 1.0}\n", encoding="utf-8")
+        baseline = LatencyBaseline(path, regression_margin=0.2, min_delta=0.05)
+        # 超过上限但绝对增量小于 min_delta，视为抖动
+        baseline.check_regression("a::1", _stats(0.14))
+        with pytest.raises(AssertionError, match="耗时回退"):
+            baseline.check_regression("a::1", _stats(0.2))
+        baseline.check_regression("b::1", _stats(1.19))
+        with pytest.raises(AssertionError):
+            baseline.check_regression("b::1", _stats(1.3))
+        # 没有基线的用例跳过比较
+        baseline.check_regression("c::1", _stats(10.0))
+
+    def test_update_and_save(self, tmp_path):
+        path = tmp_path / "nested" / "baseline.yaml"
+        baseline = LatencyBaseline(path)
+        assert baseline.get("a::1") is None
+        baseline.update({"a::1": LatencyStats(3, 0.1234567, 0.2, 0.3, 0.15)})
+        assert baseline.save()
+
+        reloaded = LatencyBaseline(path, metric="max")
+        assert reloaded.get("a::1") == {"count": 3, "p50": 0.123457, "p95": 0.2, "max": 0.3, "mean": 0.15}
+        reloaded.check_regression("a::1", _stats(0.35))
+        with pytest.raises(AssertionError, match="max="):
+            reloaded.check_regression("a::1", _stats(0.5))
+
+    def test_from_config(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(latency_module, "PROJECT_ROOT", tmp_path)
+        config = tmp_path / "config.yaml"
+        try:
+            config.write_text("Latency: {baseline_file: ''}\n", encoding="utf-8")
+            config_reader.set_config_path(config)
+            assert LatencyBaseline.from_config() is None
+
+            config.write_text("Latency: {baseline_file: baseline.yaml, regression_margin: 0.5, metric: mean}\n", encoding="utf-8")
+            config_reader.set_config_path(config)
+            baseline = LatencyBaseline.from_config()
+            assert baseline.file_path == tmp_path / "baseline.yaml"
+            assert (baseline.regression_margin, baseline.min_delta, baseline.metric) == (0.5, 0.05, "mean")
+        finally:
+            config_reader.set_config_path(None)
+
+    def test_default_config_has_no_baseline(self, monkeypatch):
+        monkeypatch.delenv(config_reader.CONFIG_ENV, raising=False)
+        config_reader.set_config_path(config_reader.DEFAULT_CONFIG_PATH)
+        try:
+            assert LatencyBaseline.from_config() is None
+        finally:
+            config_reader.set_config_path(None)
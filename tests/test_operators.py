@@ -0,0 +1,103 @@
+import pytest
+from core.assertion.operators import OPERATORS, is_subset, validate_expected
+
+
+class TestOperators:
+    """断言运算符的判定结果"""
+
+    @pytest.mark.parametrize(
+        "operator, actual, expected, result",
+        [
+            ("eq", 1, 1, True),
+            ("eq", "1", 1, False),
+            ("ne", "a", "b", True),
+            ("ne", None, None, False),
+            ("gt", 2, 1, True),
+            ("gt", 1, 1, False),
+            ("ge", 1, 1, True),
+            ("lt", 0.5, 1, True),
+            ("le", 2, 1, False),
+            ("between", 5, [1, 10], True),
+            ("between", 10, [1, 10], True),
+            ("between", 11, [None, 10], False),
+            ("between", 0, [None, 10], True),
+            ("contains", "hello world", "world", True),
+            ("contains", [1, 2], 2, True),
+            ("contains", {"a": 1}, "a", True),
+            ("contains", [1, 2], 3, False),
+            ("not_contains", "hello", "x", True),
+            ("not_contains", [1, 2], 1, False),
+            ("in", "a", ["a", "b"], True),
+            ("in", "c", ["a", "b"], False),
+            ("not_in", "c", ["a", "b"], True),
+            ("length", [1, 2, 3], 3, True),
+            ("length", "ab", [1, 2], True),
+            ("length", {}, [1, None], False),
+            ("type", "x", "string", True),
+            ("type", 1, "number", True),
+            ("type", 1.5, "INT", False),
+            ("type", None, "null", True),
+            ("type", [], "array", True),
+            ("schema_subset", {"a": 1, "b": {"c": [1, 2]}}, {"b": {"c": [2]}}, True),
+            ("schema_subset", {"a": 1}, {"a": 2}, False),
+        ],
+    )
+    def test_operator(self, operator, actual, expected, result):
+        assert OPERATORS[operator](actual, expected) is result
+
+    @pytest.mark.parametrize(
+        "operator, actual, expected",
+        [
+            ("gt", "10", 9),
+            ("ge", None, 0),
+            ("lt", [1], 2),
+            ("le", {"a": 1}, 1),
+            ("between", "5", [1, 10]),
+            ("contains", "123", 1),
+            ("contains", 123, 1),
+            ("in", 1, "abc"),
+            ("length", 123, 3),
+        ],
+    )
+    def test_type_mismatch_fails_without_raising(self, operator, actual, expected):
+        # 类型不兼容时判定为失败，而不是让TypeError中断整个断言计划
+        assert OPERATORS[operator](actual, expected) is False
+
+    def test_bool_is_not_a_number(self):
+        assert OPERATORS["type"](True, "int") is False
+        assert OPERATORS["type"](True, "bool") is True
+        assert OPERATORS["between"](True, [0, 1]) is False
+
+    def test_subset_of_lists(self):
+        actual = {"items": [{"id": 1, "tags": ["a"]}, {"id": 2, "tags": ["b", "c"]}]}
+        assert is_subset({"items": [{"tags": ["c"]}, {"id": 1}]}, actual)
+        assert not is_subset({"items": [{"id": 3}]}, actual)
+        assert not is_subset({"items": {"id": 1}}, actual)
+
+
+class TestValidateExpected:
+    """编译阶段校验期望值格式"""
+
+    @pytest.mark.parametrize(
+        "operator, expected, message",
+        [
+            ("regex", "x", "不支持的断言运算符"),
+            ("between", 5, "between"),
+            ("between", [1, 2, 3], "between"),
+            ("in", 1, "in 运算符"),
+            ("not_in", None, "not_in 运算符"),
+            ("length", "3", "length"),
+            ("type", "decimal", "type"),
+            ("type", 1, "type"),
+        ],
+    )
+    def test_invalid_expected(self, operator, expected, message):
+        with pytest.raises(ValueError, match=message):
+            validate_expected(operator, expected)
+
+    @pytest.mark.parametrize(
+        "operator, expected",
+        [("between", [1, None]), ("in", ["a"]), ("in", "abc"), ("length", 2), ("length", (1, 3)), ("type", "Object"), ("eq", None)],
+    )
+    def test_valid_expected(self, operator, expected):
+        validate_expected(operator, expected)
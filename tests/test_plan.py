@@ -0,0 +1,129 @@
+import json
+import pytest
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+from core.assertion.plan import compile_assertions, compile_check
+
+
+BODY = {
+    "code": 0,
+    "data": {
+        "items": [
+            {"id": 1, "price": 9.5, "status": "paid"},
+            {"id": 2, "price": 20, "status": "paid"},
+            {"id": 3, "price": 5, "status": "refund"},
+        ]
+    },
+}
+
+
+def _response(body=BODY, status: int = 200, content_type: str = "application/json", headers=None) -> Response:
+    response = Response()
+    response.status_code = status
+    response.headers = CaseInsensitiveDict({"Content-Type": content_type, **(headers or {})})
+    response._content = body if isinstance(body, bytes) else json.dumps(body).encode("utf-8")
+    response.encoding = "utf-8"
+    response.total_elapsed = 0.05
+    return response
+
+
+def _check(exp: str, operator: str, expected, match: str = "first") -> dict:
+    return {"asset_type": "body", "exp": exp, "operator": operator, "excpect_value": expected, "match": match}
+
+
+class TestQuantifiers:
+    """多个匹配值时按 first/any/all/none 判定"""
+
+    @pytest.mark.parametrize(
+        "exp, operator, expected, match, passed",
+        [
+            ("$.data.items[*].id", "eq", 1, "first", True),
+            ("$.data.items[*].id", "eq", 2, "first", False),
+            ("$.data.items[*].id", "eq", 3, "any", True),
+            ("$.data.items[*].id", "eq", 4, "any", False),
+            ("$.data.items[*].price", "gt", 0, "all", True),
+            ("$.data.items[*].price", "lt", 10, "all", False),
+            ("$.data.items[*].status", "eq", "cancelled", "none", True),
+            ("$.data.items[*].status", "eq", "refund", "none", False),
+            ("$..id", "in", [1, 2, 3], "all", True),
+        ],
+    )
+    def test_multi_match(self, exp, operator, expected, match, passed):
+        plan = compile_assertions([_check(exp, operator, expected, match)])
+        assert (plan.evaluate(_response()) == []) is passed
+
+    def test_failure_reports_offending_value(self):
+        failure = compile_assertions([_check("$.data.items[*].price", "lt", 10, "all")]).evaluate(_response())[0]
+        assert failure.actual == 20
+        assert "提取值 20 不满足 lt 10" in failure.message
+
+        failure = compile_assertions([_check("$.data.items[*].status", "eq", "refund", "none")]).evaluate(_response())[0]
+        assert failure.actual == "refund"
+        assert "不应满足" in failure.message
+
+    @pytest.mark.parametrize("match", ["first", "all"])
+    def test_no_match_fails(self, match):
+        failure = compile_assertions([_check("$.data.missing[*]", "eq", 1, match)]).evaluate(_response())[0]
+        assert "未找到任何匹配的值" in failure.message
+
+    def test_none_and_any_without_matches(self):
+        assert compile_assertions([_check("$.data.missing[*]", "eq", 1, "none")]).evaluate(_response()) == []
+        assert compile_assertions([_check("$.data.missing[*]", "eq", 1, "any")]).evaluate(_response()) != []
+
+    def test_regex_values_on_text_response(self):
+        response = _response(b"order=12 order=15", content_type="text/plain")
+        plan = compile_assertions([_check(r"\d+", "eq", 15, "any"), _check(r"\d+", "length", 2, "all")])
+        assert plan.evaluate(response) == []
+
+
+class TestAssertionPlan:
+    """一次执行全部断言并汇总失败"""
+
+    def test_failures_are_aggregated(self):
+        plan = compile_assertions(
+            [
+                {"asset_type": "status_code", "excpect_value": "201"},
+                _check("$.code", "eq", 0),
+                {"asset_type": "header", "exp": "X-Trace", "excpect_value": "abc"},
+                _check("$.data.items[*].price", "le", 10, "all"),
+                {"asset_type": "response_time", "excpect_value": 1},
+            ]
+        )
+        failures = plan.evaluate(_response(headers={"X-Trace": "abc"}))
+        assert [failure.index for failure in failures] == [0, 3]
+
+        with pytest.raises(AssertionError) as excinfo:
+            plan.assert_all(_response())
+        message = str(excinfo.value)
+        assert message.startswith("共 3 条断言失败")
+        assert "[0] 状态码 200 不满足 eq 201" in message
+        assert "[2] 响应头 'X-Trace' 不存在" in message
+        assert "[3] 提取值 20 不满足 le 10" in message
+
+    def test_response_body_is_parsed_once(self, monkeypatch):
+        from core.http import response as response_module
+
+        parsed = []
+        handle = response_module.__dict__["__handle"]
+        monkeypatch.setitem(response_module.__dict__, "__handle", lambda response: parsed.append(1) or handle(response))
+        plan = compile_assertions([_check("$.code", "eq", 0), _check("$.data.items[*].id", "ge", 1, "all")])
+        assert plan.evaluate(_response()) == []
+        assert len(parsed) == 1
+
+    def test_default_operator_of_response_time(self):
+        plan = compile_assertions([{"asset_type": "response_time", "excpect_value": 0.01}])
+        assert "响应耗时(秒) 0.05 不满足 lt 0.01" in str(plan.evaluate(_response())[0])
+
+    @pytest.mark.parametrize(
+        "item, message",
+        [
+            ({"asset_type": "body", "exp": "$.a", "match": "most"}, "match 不合法"),
+            ({"asset_type": "status_code", "excpect_value": "ok"}, "状态码期望值不合法"),
+            ({"asset_type": "header", "excpect_value": 1}, "缺少响应头名称"),
+            ({"asset_type": "cookie", "exp": "a"}, "类型不支持"),
+            ({"asset_type": "body", "exp": "$.a", "operator": "between", "excpect_value": 1}, "between"),
+        ],
+    )
+    def test_invalid_items_fail_at_compile_time(self, item, message):
+        with pytest.raises(ValueError, match=message):
+            compile_check(0, item)
@@ -0,0 +1,103 @@
+import threading
+import time
+from types import SimpleNamespace
+from utils import profiler as profiler_module
+from utils.profiler import StageProfiler
+
+
+def _busy(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+class TestStageProfiler:
+    """阶段计时的总耗时与自身耗时"""
+
+    def test_nested_stages_split_self_and_total(self, monkeypatch):
+        clock = iter([0, 10, 40, 50, 60, 100, 200, 205])
+        monkeypatch.setattr(profiler_module, "time", SimpleNamespace(perf_counter_ns=lambda: next(clock)))
+        profiler = StageProfiler()
+        profiler.enable()
+        with profiler.stage("execute"):
+            with profiler.stage("request"):
+                pass
+            with profiler.stage("assert"):
+                pass
+        with profiler.stage("request"):
+            pass
+
+        stats = profiler.stats()
+        assert (stats["execute"].count, stats["execute"].total_ns, stats["execute"].self_ns) == (1, 100, 60)
+        assert (stats["request"].count, stats["request"].total_ns, stats["request"].self_ns, stats["request"].max_ns) == (2, 35, 35, 30)
+        assert (stats["assert"].total_ns, stats["assert"].self_ns) == (10, 10)
+        report = profiler.format_report().splitlines()
+        assert [line.split()[0] for line in report[1:]] == ["execute", "request", "assert"]
+
+    def test_disabled_profiler_returns_shared_null_context(self):
+        profiler = StageProfiler()
+        stage = profiler.stage("request")
+        assert stage is profiler_module._NULL_STAGE
+        assert profiler.stage("assert") is stage
+        with stage:
+            pass
+        assert profiler.stats() == {}
+
+    def test_finished_threads_do_not_leave_stacks(self):
+        profiler = StageProfiler()
+        profiler.enable()
+        seen = []
+
+        def work() -> None:
+            with profiler.stage("execute"):
+                with profiler.stage("request"):
+                    seen.append(profiler.current_stages(threading.get_ident()))
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert seen == [["execute", "request"]] * 8
+        assert profiler._thread_stacks == {}
+        assert profiler.stats()["execute"].count == 8
+
+        # 同一线程再次进入阶段时重新注册
+        with profiler.stage("execute"):
+            assert profiler.current_stages(threading.get_ident()) == ["execute"]
+        assert profiler._thread_stacks == {}
+
+
+class TestSamplingProfiler:
+    """采样剖析输出collapsed格式的调用栈"""
+
+    def test_collapsed_stacks(self, tmp_path):
+        profiler = StageProfiler()
+        profiler.enable(sampling=True, interval=0.001)
+
+        def work() -> None:
+            with profiler.stage("request"):
+                _busy(0.2)
+
+        worker = threading.Thread(target=work)
+        worker.start()
+        worker.join()
+        profiler.disable()
+        files = profiler.write_report(tmp_path)
+
+        assert files["stages"].read_text(encoding="utf-8").startswith("stage")
+        lines = files["collapsed"].read_text(encoding="utf-8").splitlines()
+        assert lines
+        stacks = {}
+        for line in lines:
+            stack, count = line.rsplit(" ", 1)
+            stacks[stack] = int(count)
+        busy = [stack for stack in stacks if "_busy (test_profiler.py:" in stack]
+        assert busy
+        # 调用栈以所在的流水线阶段开头，帧按调用顺序由外到内排列
+        assert all(stack.startswith("[request];") for stack in busy)
+        frames = busy[0].split(";")
+        assert frames[-1].startswith("_busy (") and frames[-2].startswith("work (")
+        # 按次数降序写入
+        counts = [int(line.rsplit(" ", 1)[1]) for line in lines]
+        assert counts == sorted(counts, reverse=True)
@@ -0,0 +1,179 @@
+import json
+import os
+import re
+import subprocess
+import sys
+import yaml
+from conftest import json_response
+from core.report.reporter import CaseResult, iter_jsonl_results
+from core.runner.state import RunState
+from utils.path import PROJECT_ROOT
+
+
+def _ok(url: str, **extra) -> dict:
+    return {"url": url + "/ok", "method": "GET", "exception": [{"asset_type": "status_code", "excpect_value": 200}], **extra}
+
+
+def _fail(url: str) -> dict:
+    return {"url": url + "/fail", "method": "GET", "exception": [{"asset_type": "status_code", "excpect_value": 200}]}
+
+
+def _run_pytest(tmp_path, *args: str) -> list[tuple[str, str]]:
+    """在子进程中执行数据驱动用例，返回按执行顺序的 (用例ID, 结果)"""
+    env = {**os.environ, "PYTHONPATH": str(PROJECT_ROOT)}
+    process = subprocess.run(
+        [sys.executable, "-m", "pytest", "-v", "-p", "no:cacheprovider", "--run-state", str(tmp_path / "state.sqlite"), *args],
+        cwd=tmp_path,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    return re.findall(r"^(cases/\S+::\S+) (PASSED|FAILED)", process.stdout, re.MULTILINE)
+
+
+class TestRunStateOrder:
+    """按数据文件分组排序"""
+
+    def test_grouped_order_keeps_files_contiguous(self, tmp_path):
+        state = RunState(tmp_path / "state.sqlite")
+        durations = {"a::1": 0.1, "a::2": 0.5, "b::1": 0.9, "b::2": 0.2, "c::1": 0.3, "c::2": 0.8}
+        for case_id, duration in durations.items():
+            state.record(CaseResult(case_id=case_id, outcome="passed", duration=duration), "")
+        state.flush()
+        items = list(durations)
+        ordered = state.order(items, "slowest-first", key=lambda item: item, group=lambda item: item[0])
+        assert ordered == ["b::1", "b::2", "c::2", "c::1", "a::2", "a::1"]
+        pinned = state.order(
+            items, "slowest-first", key=lambda item: item, group=lambda item: item[0], pinned=lambda members: members[0][0] == "c"
+        )
+        assert pinned == ["b::1", "b::2", "c::1", "c::2", "a::2", "a::1"]
+        state.close()
+
+
+class TestCaseOrder:
+    """--case-order 与 --case-select 不会打散文件，也不会拆开变量依赖"""
+
+    def test_reorder_within_files(self, tmp_path, stub_server):
+        stub_server.route("GET", "/ok")(lambda handler, params, body: json_response({"value": 1}))
+        stub_server.route("GET", "/fail")(lambda handler, params, body: json_response({}, 500))
+        url = stub_server.url
+        cases = tmp_path / "cases"
+        cases.mkdir()
+        files = {
+            "a.yaml": [_ok(url), _fail(url), _ok(url), _fail(url)],
+            "b.yaml": [_ok(url), _fail(url)],
+            "c.yaml": [_ok(url, variable={"value": "$.value"}), _fail(url), _ok(url, params={"v": "${value}"})],
+        }
+        for name, data in files.items():
+            (cases / name).write_text(yaml.safe_dump(data), encoding="utf-8")
+        (tmp_path / "pytest.ini").write_text(
+            "[pytest]\naddopts = -p core.runner.pytest_plugin\napi_case_dirs = cases\n", encoding="utf-8"
+        )
+
+        first = _run_pytest(tmp_path)
+        assert [case_id for case_id, _ in first] == [f"cases/{name}::{index}" for name in files for index in range(1, len(files[name]) + 1)]
+
+        for log in (tmp_path / "logs").glob("*.log"):
+            log.unlink()
+        ordered = [case_id for case_id, _ in _run_pytest(tmp_path, "--case-order", "failed-first")]
+        assert ordered == [
+            "cases/a.yaml::2",
+            "cases/a.yaml::4",
+            "cases/a.yaml::1",
+            "cases/a.yaml::3",
+            "cases/b.yaml::2",
+            "cases/b.yaml::1",
+            "cases/c.yaml::1",
+            "cases/c.yaml::2",
+            "cases/c.yaml::3",
+        ]
+        # 同一文件的用例连续执行，每个文件只加载一次
+        log_text = "".join(log.read_text(encoding="utf-8") for log in (tmp_path / "logs").glob("*.log"))
+        assert log_text.count("加载用例文件数据") == 3
+
+        selected = _run_pytest(tmp_path, "--case-select", "failed")
+        assert [case_id for case_id, _ in selected] == ["cases/a.yaml::2", "cases/a.yaml::4", "cases/b.yaml::2", "cases/c.yaml::1", "cases/c.yaml::2"]
+
+
+class TestWorkerReports:
+    """pytest-xdist的控制进程合并各工作进程的报告"""
+
+    def _setup(self, tmp_path, url: str) -> None:
+        cases = tmp_path / "cases"
+        cases.mkdir()
+        (cases / "a.yaml").write_text(yaml.safe_dump([_ok(url)]), encoding="utf-8")
+        (tmp_path / "pytest.ini").write_text(
+            "[pytest]\naddopts = -p core.runner.pytest_plugin\napi_case_dirs = cases\n", encoding="utf-8"
+        )
+        for worker in ("gw0", "gw1"):
+            result = CaseResult(case_id=f"{worker}::1", outcome="passed", duration=0.1)
+            (tmp_path / f"report.{worker}.jsonl").write_text(json.dumps(result.to_dict()) + "\n", encoding="utf-8")
+
+    def test_controller_merges_worker_reports(self, tmp_path, stub_server):
+        stub_server.route("GET", "/ok")(lambda handler, params, body: json_response({}))
+        self._setup(tmp_path, stub_server.url)
+        # 模拟xdist的控制进程：注册dsession插件且没有workerinput
+        (tmp_path / "conftest.py").write_text(
+            "def pytest_configure(config):\n    config.pluginmanager.register(object(), 'dsession')\n", encoding="utf-8"
+        )
+        _run_pytest(tmp_path, "--report-jsonl", "report.jsonl")
+        assert [result.case_id for result in iter_jsonl_results(tmp_path / "report.jsonl")] == ["gw0::1", "gw1::1"]
+        assert not list(tmp_path.glob("report.gw*.jsonl"))
+
+    def test_serial_run_keeps_its_report(self, tmp_path, stub_server):
+        stub_server.route("GET", "/ok")(lambda handler, params, body: json_response({}))
+        self._setup(tmp_path, stub_server.url)
+        _run_pytest(tmp_path, "--report-jsonl", "report.jsonl")
+        assert [result.case_id for result in iter_jsonl_results(tmp_path / "report.jsonl")] == ["a.yaml::1"]
+
+
+class TestVariableScope:
+    """与命令行执行一致，每个数据文件使用独立的变量作用域"""
+
+    def test_variables_do_not_leak_between_files(self, tmp_path, stub_server):
+        stub_server.route("GET", "/login")(lambda handler, params, body: json_response({"token": "alice"}))
+        stub_server.route("GET", "/whoami")(lambda handler, params, body: json_response({"token": params.get("token")}))
+        url = stub_server.url
+
+        def whoami(expected: str) -> dict:
+            return {
+                "url": url + "/whoami",
+                "method": "GET",
+                "params": {"token": "${token}"},
+                "exception": [{"asset_type": "body", "exp": "$.token", "excpect_value": expected}],
+            }
+
+        cases = tmp_path / "cases"
+        cases.mkdir()
+        login = {"url": url + "/login", "method": "GET", "variable": {"token": "$.token"}}
+        (cases / "a.yaml").write_text(yaml.safe_dump([login, whoami("alice")]), encoding="utf-8")
+        # b.yaml 没有提取变量，不能读取到 a.yaml 提取的变量
+        (cases / "b.yaml").write_text(yaml.safe_dump([whoami("${token}")]), encoding="utf-8")
+        (tmp_path / "pytest.ini").write_text(
+            "[pytest]\naddopts = -p core.runner.pytest_plugin\napi_case_dirs = cases\n", encoding="utf-8"
+        )
+        assert _run_pytest(tmp_path) == [
+            ("cases/a.yaml::1", "PASSED"),
+            ("cases/a.yaml::2", "PASSED"),
+            ("cases/b.yaml::1", "PASSED"),
+        ]
+
+
+class TestDuplicateCaseIds:
+    """文件内重复的 case_id 生成不同的测试项ID，每个用例都会执行"""
+
+    def test_duplicate_case_ids_are_collected_separately(self, tmp_path, stub_server):
+        stub_server.route("GET", "/ok")(lambda handler, params, body: json_response({}))
+        cases = tmp_path / "cases"
+        cases.mkdir()
+        (cases / "a.yaml").write_text(yaml.safe_dump([_ok(stub_server.url, case_id="login")] * 3), encoding="utf-8")
+        (tmp_path / "pytest.ini").write_text(
+            "[pytest]\naddopts = -p core.runner.pytest_plugin\napi_case_dirs = cases\n", encoding="utf-8"
+        )
+        assert _run_pytest(tmp_path) == [
+            ("cases/a.yaml::login", "PASSED"),
+            ("cases/a.yaml::login#2", "PASSED"),
+            ("cases/a.yaml::login#3", "PASSED"),
+        ]
+        assert stub_server.hits["/ok"] == 3
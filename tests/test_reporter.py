@@ -0,0 +1,106 @@
+import json
+from xml.etree import ElementTree as ETree
+import main
+from core.report.reporter import (
+    CaseResult,
+    create_reporter,
+    iter_jsonl_results,
+    merge_jsonl,
+    merge_junit,
+    merge_worker_reports,
+    worker_parts,
+    worker_path,
+)
+
+
+def _results(prefix: str) -> list[CaseResult]:
+    return [
+        CaseResult(case_id=f"{prefix}::1", outcome="passed", duration=0.1, source=f"{prefix}.yaml"),
+        CaseResult(case_id=f"{prefix}::2", outcome="failed", duration=0.2, source=f"{prefix}.yaml", failures=["[0] a < b & c"]),
+        CaseResult(case_id=f"{prefix}::3", outcome="error", duration=0.3, source=f"{prefix}.yaml", error='KeyError: "x"'),
+    ]
+
+
+def _write(tmp_path, worker: str) -> None:
+    reporter = create_reporter(tmp_path / "report.jsonl", tmp_path / "junit.xml", worker=worker, batch_size=2)
+    for result in _results(worker):
+        reporter.report(result)
+    reporter.close()
+
+
+class TestReporter:
+    """逐个写入的报告与多个工作进程报告的合并"""
+
+    def test_worker_path(self, tmp_path):
+        assert worker_path(tmp_path / "report.jsonl", "gw1") == tmp_path / "report.gw1.jsonl"
+        assert worker_path(tmp_path / "report.jsonl", "") == tmp_path / "report.jsonl"
+
+    def test_jsonl_roundtrip(self, tmp_path):
+        _write(tmp_path, "")
+        results = list(iter_jsonl_results(tmp_path / "report.jsonl"))
+        assert [result.to_dict() for result in results] == [result.to_dict() for result in _results("")]
+
+    def test_junit_counts(self, tmp_path):
+        _write(tmp_path, "")
+        suite = ETree.parse(tmp_path / "junit.xml").getroot()
+        assert (suite.get("tests"), suite.get("failures"), suite.get("errors")) == ("3", "1", "1")
+        assert suite.find("testcase/failure").text == "[0] a < b & c"
+        assert not (tmp_path / "junit.xml.part").exists()
+
+    def test_merge(self, tmp_path):
+        for worker in ("gw0", "gw1"):
+            _write(tmp_path, worker)
+        jsonl_parts = [tmp_path / f"report.{worker}.jsonl" for worker in ("gw0", "gw1")]
+        assert merge_jsonl(jsonl_parts, tmp_path / "merged.jsonl") == 6
+        lines = (tmp_path / "merged.jsonl").read_text(encoding="utf-8").splitlines()
+        assert [json.loads(line)["case_id"] for line in lines] == [r.case_id for w in ("gw0", "gw1") for r in _results(w)]
+
+        junit_parts = [tmp_path / f"junit.{worker}.xml" for worker in ("gw0", "gw1")]
+        assert merge_junit(junit_parts, tmp_path / "merged.xml") == 6
+        suite = ETree.parse(tmp_path / "merged.xml").getroot()
+        assert (suite.get("tests"), suite.get("failures"), suite.get("errors")) == ("6", "2", "2")
+        assert len(suite.findall("testcase")) == 6
+        assert suite.findall("testcase")[1].find("failure").text == "[0] a < b & c"
+
+    def test_merge_worker_reports(self, tmp_path):
+        for worker in ("gw10", "gw2", "gw0"):
+            _write(tmp_path, worker)
+        (tmp_path / "report.gwx.jsonl").write_text("", encoding="utf-8")
+        assert [part.name for part in worker_parts(tmp_path / "report.jsonl")] == [
+            "report.gw0.jsonl",
+            "report.gw2.jsonl",
+            "report.gw10.jsonl",
+        ]
+        merged = merge_worker_reports(tmp_path / "report.jsonl", tmp_path / "junit.xml")
+        assert merged == {str(tmp_path / "report.jsonl"): 9, str(tmp_path / "junit.xml"): 9}
+        assert [result.case_id for result in iter_jsonl_results(tmp_path / "report.jsonl")][:3] == ["gw0::1", "gw0::2", "gw0::3"]
+        assert ETree.parse(tmp_path / "junit.xml").getroot().get("tests") == "9"
+        # 合并后删除各工作进程的文件，未并行执行时没有需要合并的文件
+        assert worker_parts(tmp_path / "report.jsonl") == worker_parts(tmp_path / "junit.xml") == []
+        assert merge_worker_reports(tmp_path / "report.jsonl", tmp_path / "junit.xml") == {}
+
+    def test_merge_command(self, tmp_path, capsys):
+        for worker in ("gw0", "gw1"):
+            _write(tmp_path, worker)
+        assert main.main(["merge", "--report-junit", str(tmp_path / "junit.xml")]) == 0
+        assert ETree.parse(tmp_path / "junit.xml").getroot().get("tests") == "6"
+        assert main.main(["merge", "--report-junit", str(tmp_path / "junit.xml")]) == 1
+
+    def test_junit_replaces_control_characters(self, tmp_path):
+        reporter = create_reporter(junit_path=tmp_path / "junit.xml", worker="")
+        reporter.report(
+            CaseResult(
+                case_id="a::1",
+                outcome="failed",
+                duration=0.1,
+                name="bell\x07",
+                failures=["escape \x1b[31m red\x00", "tab\tok"],
+                request={"url": "http://x/\x0c"},
+            )
+        )
+        reporter.close()
+        testcase = ETree.parse(tmp_path / "junit.xml").getroot().find("testcase")
+        assert testcase.get("name") == "bell#x07"
+        assert testcase.find("failure").get("message") == "escape #x1B[31m red#x00"
+        assert testcase.find("failure").text == "escape #x1B[31m red#x00\ntab\tok"
+        assert testcase.find("system-out").text == "url=http://x/#x0C"
@@ -0,0 +1,155 @@
+import threading
+import pytest
+import yaml
+from conftest import json_response
+from core.http.client import HTTPClient
+from core.runner.collector import CaseRef
+from core.runner import executor as executor_module
+from core.runner.executor import CaseExecutor
+from core.runner.runner import CaseRunner, matches_filter, select_shard, shard_of
+from utils import constant
+from utils.serializer import stdlib_dumps
+
+
+FILES = [f"/cases/module{index}/api{index}.yaml" for index in range(40)]
+
+
+class TestShard:
+    """按数据文件的相对路径分片"""
+
+    @pytest.mark.parametrize("shard_count", [1, 2, 3, 7])
+    def test_shards_partition_files(self, shard_count):
+        shards = [select_shard(FILES, index, shard_count) for index in range(shard_count)]
+        selected = [file for shard in shards for file in shard]
+        assert sorted(selected) == sorted(FILES)
+        assert len(selected) == len(set(selected))
+
+    def test_assignment_is_stable(self):
+        before = {file: shard_of(file.rsplit("/", 1)[-1], 4) for file in FILES}
+        # 新增文件不影响已有文件的分片
+        after = {file: shard_of(file.rsplit("/", 1)[-1], 4) for file in FILES + ["/cases/new.yaml"]}
+        assert all(after[file] == shard for file, shard in before.items())
+        assert shard_of("login.yaml", 4) == shard_of("login.yaml", 4)
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            select_shard(FILES, 2, 2)
+        with pytest.raises(ValueError):
+            select_shard(FILES, 0, 0)
+
+
+class TestFilter:
+    """-k 筛选条件"""
+
+    REF = CaseRef("user/login.yaml::3", "user/login.yaml", 3, "3")
+
+    @pytest.mark.parametrize(
+        "patterns, expected",
+        [
+            ([], True),
+            (["login"], True),
+            (["order"], False),
+            (["user/*::3"], True),
+            (["user/*::4"], False),
+            (["not login"], False),
+            (["user", "not ::3"], False),
+            (["order", "login"], True),
+        ],
+    )
+    def test_matches_filter(self, patterns, expected):
+        assert matches_filter(self.REF, patterns) is expected
+
+
+class TestCaseRunner:
+    """不经过pytest的并发执行"""
+
+    def test_concurrent_files_have_separate_variables(self, tmp_path, stub_server):
+        barrier = threading.Barrier(2, timeout=5)
+        stub_server.route("GET", "/login")(lambda handler, params, body: json_response({"token": params["user"]}))
+
+        @stub_server.route("GET", "/sync")
+        def sync(handler, params, body):
+            # 两个文件都提取完变量后再继续，之后的用例读取同名变量
+            barrier.wait()
+            return json_response({})
+
+        stub_server.route("GET", "/whoami")(lambda handler, params, body: json_response({"token": params.get("token")}))
+
+        files = []
+        for user in ("alice", "bob"):
+            cases = [
+                {"url": stub_server.url + "/login", "method": "GET", "params": {"user": user}, "variable": {"token": "$.token"}},
+                {"url": stub_server.url + "/sync", "method": "GET"},
+                {
+                    "url": stub_server.url + "/whoami",
+                    "method": "GET",
+                    "params": {"token": "${token}"},
+                    "exception": [{"asset_type": "body", "exp": "$.token", "excpect_value": user}],
+                },
+            ]
+            path = tmp_path / f"{user}.yaml"
+            path.write_text(yaml.safe_dump(cases), encoding="utf-8")
+            files.append(str(path))
+
+        executor = CaseExecutor(HTTPClient(serializer=stdlib_dumps, transport="http1"))
+        summary = CaseRunner(executor, concurrency=2, base_dir=tmp_path).run(files)
+        assert summary.total == 6
+        assert summary.failed_cases == []
+        assert constant.get_variable("token") is None
+
+    def test_assertion_plans_are_reused_across_runs(self, tmp_path, stub_server, monkeypatch):
+        stub_server.route("GET", "/user")(lambda handler, params, body: json_response({"id": 1}))
+        compiled = []
+        compile_assertions = executor_module.compile_assertions
+        monkeypatch.setattr(executor_module, "compile_assertions", lambda exception: compiled.append(1) or compile_assertions(exception))
+        cases = [
+            {
+                "url": stub_server.url + "/user",
+                "method": "GET",
+                "params": {"page": index},
+                "repeat": 2,
+                "exception": [{"asset_type": "body", "exp": "$.id", "excpect_value": 1}],
+            }
+            for index in range(3)
+        ]
+        path = tmp_path / "user.yaml"
+        path.write_text(yaml.safe_dump(cases), encoding="utf-8")
+
+        runner = CaseRunner(CaseExecutor(HTTPClient(serializer=stdlib_dumps, transport="http1")), base_dir=tmp_path)
+        # 与浸泡测试一样多次执行同一批文件
+        for _ in range(4):
+            summary = runner.run([str(path)])
+            assert summary.total == 3 and summary.failed_cases == []
+        assert stub_server.hits["/user"] == 24
+        assert len(compiled) == 3
+
+        # 用例内容变化后重新创建用例对象
+        cases[0]["params"] = {"page": 9}
+        path.write_text(yaml.safe_dump(cases), encoding="utf-8")
+        runner.run([str(path)])
+        assert len(compiled) == 4
+
+    def test_invalid_case_is_reported_as_error(self, tmp_path):
+        path = tmp_path / "bad.yaml"
+        path.write_text(yaml.safe_dump([{"method": "GET"}]), encoding="utf-8")
+        summary = CaseRunner(CaseExecutor(HTTPClient(serializer=stdlib_dumps, transport="http1")), base_dir=tmp_path).run([str(path)])
+        assert summary.total == 1 and summary.errors == 1
+
+    def test_request_templates_are_reused_across_runs(self, tmp_path, stub_server, monkeypatch):
+        stub_server.route("POST", "/user")(lambda handler, params, body: json_response({"id": 1}))
+        cases = [
+            {"url": stub_server.url + "/user", "method": "POST", "data_type": "json", "data": {"id": index}, "repeat": 2}
+            for index in range(3)
+        ]
+        path = tmp_path / "user.yaml"
+        path.write_text(yaml.safe_dump(cases), encoding="utf-8")
+        client = HTTPClient(serializer=stdlib_dumps, transport="http1")
+        templates = []
+        create_template = client.create_template
+        monkeypatch.setattr(client, "create_template", lambda *args, **kwargs: templates.append(1) or create_template(*args, **kwargs))
+        runner = CaseRunner(CaseExecutor(client), base_dir=tmp_path)
+        for _ in range(4):
+            assert runner.run([str(path)]).failed_cases == []
+        assert stub_server.hits["/user"] == 24
+        assert len(templates) == 3
+        assert [request["body"] for request in stub_server.requests[:2]] == [b'{"id":0}'] * 2
@@ -0,0 +1,102 @@
+import json
+import os
+import fastjsonschema
+import pytest
+import yaml
+from core.assertion.plan import compile_check
+from core.assertion.schema import clear_schema_cache, compile_schema, get_validator, validate
+
+
+ITEMS_SCHEMA = {
+    "type": "object",
+    "required": ["items"],
+    "properties": {
+        "items": {"type": "array", "items": {"type": "object", "properties": {"id": {"type": "integer"}}}},
+    },
+}
+
+
+@pytest.fixture(autouse=True)
+def _clean_cache():
+    clear_schema_cache()
+    yield
+    clear_schema_cache()
+
+
+@pytest.fixture
+def compiled(monkeypatch):
+    """记录实际调用 fastjsonschema.compile 的次数"""
+    calls = []
+    compile_ = fastjsonschema.compile
+    monkeypatch.setattr(fastjsonschema, "compile", lambda schema: calls.append(schema) or compile_(schema))
+    return calls
+
+
+class TestSchemaValidator:
+    """Schema校验函数的缓存与错误信息"""
+
+    def test_equal_schemas_share_one_validator(self, tmp_path, compiled):
+        first = tmp_path / "a.json"
+        first.write_text(json.dumps(ITEMS_SCHEMA), encoding="utf-8")
+        # 键顺序不同、格式不同但内容相同
+        second = tmp_path / "b.json"
+        second.write_text(json.dumps(dict(reversed(list(ITEMS_SCHEMA.items()))), indent=2), encoding="utf-8")
+        third = tmp_path / "c.yaml"
+        third.write_text(yaml.safe_dump(ITEMS_SCHEMA, sort_keys=True), encoding="utf-8")
+
+        validators = [get_validator(path) for path in (first, second, third, first)]
+        assert all(validator is validators[0] for validator in validators)
+        assert len(compiled) == 1
+        assert compile_schema(dict(ITEMS_SCHEMA)) is validators[0]
+        assert len(compiled) == 1
+
+    def test_modified_file_is_reloaded(self, tmp_path, compiled):
+        path = tmp_path / "a.json"
+        path.write_text(json.dumps(ITEMS_SCHEMA), encoding="utf-8")
+        before = get_validator(path)
+        path.write_text(json.dumps({"type": "array"}), encoding="utf-8")
+        # 避免文件系统时间精度导致修改时间不变
+        os.utime(path, (1, 1))
+        after = get_validator(path)
+        assert after is not before
+        assert len(compiled) == 2
+
+    @pytest.mark.parametrize(
+        "schema, reason",
+        [
+            ({"type": "strng"}, "Unknown type"),
+            ({"required": "id"}, "required must be an array"),
+            ({"$ref": "#/definitions/missing"}, "Unresolvable ref"),
+            ({"type": "string", "pattern": "("}, "missing \\)"),
+        ],
+    )
+    def test_invalid_schema_raises_clear_error(self, tmp_path, schema, reason):
+        path = tmp_path / "bad.json"
+        path.write_text(json.dumps(schema), encoding="utf-8")
+        with pytest.raises(ValueError, match=f"Schema文件 .*bad.json 不合法: JSON Schema定义不合法: {reason}"):
+            get_validator(path)
+        # 断言编译阶段就报告错误
+        with pytest.raises(ValueError, match="bad.json"):
+            compile_check(0, {"asset_type": "schema", "exp": str(path)})
+
+    def test_missing_and_unsupported_files(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            get_validator(tmp_path / "missing.json")
+        path = tmp_path / "schema.txt"
+        path.write_text("{}", encoding="utf-8")
+        with pytest.raises(ValueError, match="不支持的Schema文件类型"):
+            get_validator(path)
+
+    @pytest.mark.parametrize(
+        "data, message",
+        [
+            ({"items": [{"id": 1}, {"id": "2"}]}, "$.items[1].id must be integer"),
+            ({"items": {}}, "$.items must be array"),
+            ({}, "$ must contain ['items'] properties"),
+            ([], "$ must be object"),
+        ],
+    )
+    def test_failure_message_contains_json_path(self, data, message):
+        validator = compile_schema(ITEMS_SCHEMA)
+        assert validate(validator, data) == message
+        assert validate(validator, {"items": [{"id": 1}]}) is None
@@ -0,0 +1,81 @@
+import datetime
+import math
+import random
+import timeit
+import pytest
+from utils import serializer
+from utils.serializer import create_serializer, stdlib_dumps
+
+pytest.importorskip("orjson")
+
+
+def _random_value(rng: random.Random, depth: int = 0):
+    kind = rng.randrange(8 if depth < 3 else 5)
+    if kind == 0:
+        return rng.choice([None, True, False])
+    if kind == 1:
+        return rng.randint(-(2**70), 2**70) if rng.random() < 0.1 else rng.randint(-1000, 1000)
+    if kind == 2:
+        return rng.choice([0.1, -0.0, 1e-5, 1.5e-7, 1e16, 1e300, 5e-324, rng.uniform(-1e6, 1e6), rng.random() * 1e-6])
+    if kind in (3, 4):
+        return "".join(rng.choice("ab/\\\"\n\x00\x1f\x7fé张😀") for _ in range(rng.randrange(6)))
+    if kind == 5:
+        return [_random_value(rng, depth + 1) for _ in range(rng.randrange(4))]
+    keys = [rng.choice(["a", "键", 1, 2.5, True]) for _ in range(rng.randrange(4))]
+    return {key: _random_value(rng, depth + 1) for key in keys}
+
+
+class TestSerializer:
+    """orjson与标准库的输出一致"""
+
+    @pytest.mark.parametrize(
+        "value",
+        [
+            {"name": "张三", "emoji": "😀"},
+            {"a": [1, 2.5, None, True], "b": {"c": "x"}},
+            {"small": 1e-5, "tiny": 1.5e-7, "big": 1e16},
+            {"del": "\x7f", "ctrl": "\x00\x1f"},
+            {1: "int key", 2.5: "float key"},
+            2**80,
+        ],
+    )
+    def test_backends_produce_same_bytes(self, value):
+        assert create_serializer("orjson")(value) == stdlib_dumps(value)
+
+    def test_random_documents(self):
+        rng = random.Random(20261019)
+        orjson_dumps = create_serializer("orjson")
+        for _ in range(500):
+            value = _random_value(rng)
+            assert orjson_dumps(value) == stdlib_dumps(value), value
+
+    @pytest.mark.parametrize(
+        "value, expected",
+        [
+            ({"name": "张三", "emoji": "😀"}, '{"name":"张三","emoji":"😀"}'.encode()),
+            ({"small": 1e-5, "neg": -1.23456e-5, "tiny": 1.5e-7, "min": 1e-10}, b'{"small":0.00001,"neg":-0.0000123456,"tiny":1.5e-7,"min":1e-10}'),
+            ({"nan": math.nan, "inf": [math.inf, -math.inf]}, b'{"nan":null,"inf":[null,null]}'),
+            ({"text": "NaN Infinity 1e-05"}, b'{"text":"NaN Infinity 1e-05"}'),
+        ],
+    )
+    def test_stdlib_output_matches_orjson(self, value, expected):
+        assert stdlib_dumps(value) == expected
+        assert create_serializer("orjson")(value) == expected
+
+    def test_unsupported_types_are_rejected(self):
+        for dumps in (stdlib_dumps, create_serializer("orjson")):
+            with pytest.raises(TypeError):
+                dumps({"at": datetime.datetime(2024, 1, 1)})
+
+    def test_null_and_utf8_bodies_do_not_fall_back(self, monkeypatch):
+        value = [{"id": index, "name": "张三😀", "note": None, "score": 0.5} for index in range(200)]
+        calls = []
+        monkeypatch.setattr(serializer, "stdlib_dumps", lambda obj: calls.append(obj) or stdlib_dumps(obj))
+        orjson_dumps = create_serializer("orjson")
+        assert orjson_dumps(value) == stdlib_dumps(value)
+        assert calls == []
+
+        # 不回退时orjson应明显快于标准库
+        orjson_seconds = min(timeit.repeat(lambda: orjson_dumps(value), number=50, repeat=3))
+        stdlib_seconds = min(timeit.repeat(lambda: stdlib_dumps(value), number=50, repeat=3))
+        assert orjson_seconds < stdlib_seconds
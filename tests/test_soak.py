@@ -0,0 +1,43 @@
+import yaml
+from conftest import json_response
+from core.http.client import HTTPClient
+from core.runner.executor import CaseExecutor
+from core.runner.runner import CaseRunner
+from core.runner.soak import ResourceSample, detect_growth, run_soak
+from utils.serializer import stdlib_dumps
+
+
+def _sample(iteration: int, variables: int) -> ResourceSample:
+    return ResourceSample(iteration, float(iteration), None, None, 1, 1, variables, None, 1, 0)
+
+
+class TestSoak:
+    """浸泡测试的资源采样"""
+
+    def test_variables_are_sampled_from_file_scopes(self, tmp_path, stub_server):
+        stub_server.route("GET", "/login")(lambda handler, params, body: json_response({"token": "t", "uid": 7}))
+        files = []
+        for name in ("a", "b"):
+            cases = [{"url": stub_server.url + "/login", "method": "GET", "variable": {"token": "$.token", "uid": "$.uid"}}]
+            path = tmp_path / f"{name}.yaml"
+            path.write_text(yaml.safe_dump(cases), encoding="utf-8")
+            files.append(str(path))
+
+        runner = CaseRunner(CaseExecutor(HTTPClient(serializer=stdlib_dumps, transport="http1")), base_dir=tmp_path)
+        report = run_soak(runner, files, iterations=5, trace_frames=0)
+        runner.executor.client.close()
+
+        # 每个文件的作用域保留2个变量，再次执行同一文件时替换而不是累积
+        assert [sample.variables for sample in report.samples] == [4] * 5
+        assert report.findings == []
+        assert report.exit_code == 0
+
+    def test_growing_variables_are_detected(self):
+        samples = [_sample(index + 1, index * 20) for index in range(6)]
+        findings = detect_growth(samples, warmup=1)
+        assert [finding.metric for finding in findings] == ["variables"]
+        assert findings[0].delta == 80
+
+    def test_stable_variables_are_not_detected(self):
+        samples = [_sample(index + 1, 4) for index in range(6)]
+        assert detect_growth(samples, warmup=1) == []
@@ -0,0 +1,54 @@
+import pytest
+from core.assertion.tabular import Column, compile_table_check
+
+pytest.importorskip("numpy")
+
+
+RECORDS = [
+    {"id": 1, "price": 9.5, "name": "a"},
+    {"id": 2, "price": 10, "name": "b"},
+    {"id": 3, "price": None, "name": "c"},
+]
+
+
+class TestTableCheck:
+    """表格断言的按列检查"""
+
+    def test_passes(self):
+        check = compile_table_check(0, {"id": {"unique": True, "sorted": "asc"}, "price": {"sum": 19.5, "nulls": 1}}, rows=3)
+        assert check.evaluate(RECORDS) is None
+
+    def test_reports_failures(self):
+        check = compile_table_check(0, {"id": {"sorted": "desc"}, "price": {"max": 9.9}})
+        message = check.evaluate(RECORDS)
+        assert "未按 desc 排序" in message
+        assert "最大值 10.0 大于上限 9.9" in message
+
+    @pytest.mark.parametrize(
+        "values, kinds",
+        [([1, "2", 3], "number, str"), ([2.5, "x"], "number, str"), ([True, 2], "bool, number")],
+    )
+    def test_mixed_types_fail_clearly(self, values, kinds):
+        # NumPy会把 [1, "2", 3] 静默转换为字符串数组，"10" < "9" 之类的比较结果不可信
+        records = [{"id": value} for value in values]
+        with pytest.raises(TypeError, match=kinds):
+            Column.from_records(records, "id")
+        message = compile_table_check(0, {"id": {"sorted": "asc"}}).evaluate(records)
+        assert message == f"列 'id' 的值类型不一致: {kinds}，无法按列检查"
+
+    def test_strings_and_mixed_numbers_are_allowed(self):
+        assert Column.from_records([{"v": "b"}, {"v": "a"}], "v").values.dtype.kind == "U"
+        column = Column.from_records([{"v": 1}, {"v": 2.5}, {}], "v")
+        assert column.numeric and column.nulls == 1
+
+    @pytest.mark.parametrize(
+        "values, kinds",
+        [([[1, 2], [3]], "list"), ([[1, 2], [3, 4]], "list"), ([{"a": 1}, {"a": 2}], "dict"), ([1, [2]], "list")],
+    )
+    def test_nested_values_fail_clearly(self, values, kinds):
+        # 长度不同的数组会让NumPy抛出ValueError，长度相同时会生成二维数组
+        records = [{"tags": value} for value in values]
+        with pytest.raises(TypeError, match=kinds):
+            Column.from_records(records, "tags")
+        message = compile_table_check(0, {"tags": {"unique": True}, "id": {"nulls": 2}}).evaluate(records)
+        assert message == f"列 'tags' 包含非标量值: {kinds}，无法按列检查"
@@ -0,0 +1,67 @@
+import pytest
+from requests import Request
+from core.http.template import RequestTemplate
+from utils.serializer import stdlib_dumps
+
+
+def _prepared(method, url, headers=None, params=None, data=None, json=None):
+    """requests 完整准备的请求，作为模板结果的对照，JSON请求体与模板使用相同的序列化函数"""
+    if json is not None:
+        headers = {**(headers or {}), "Content-Type": "application/json"}
+        data = stdlib_dumps(json)
+    return Request(method=method, url=url, headers=headers, params=params, data=data).prepare()
+
+
+def _same(left, right):
+    assert left.method == right.method
+    assert left.url == right.url
+    assert dict(left.headers) == dict(right.headers)
+    assert left.body == right.body
+
+
+class TestRequestTemplate:
+    """模板生成的请求与每次完整 prepare 的请求一致"""
+
+    def test_static_request(self):
+        template = RequestTemplate(
+            "POST",
+            "http://example.com/api",
+            headers={"X-Trace": "1"},
+            params={"q": "a"},
+            json={"name": "张三"},
+            serializer=stdlib_dumps,
+        )
+        expected = _prepared("POST", "http://example.com/api", {"X-Trace": "1"}, {"q": "a"}, json={"name": "张三"})
+        _same(template.prepare(), expected)
+
+    def test_dynamic_parts(self):
+        template = RequestTemplate(
+            "POST",
+            "http://example.com/api",
+            headers={"X-Trace": "1"},
+            json={"id": 0},
+            dynamic=("url", "json", "params"),
+            serializer=stdlib_dumps,
+        )
+        for index in range(3):
+            url = f"http://example.com/api/{index}"
+            expected = _prepared("POST", url, {"X-Trace": "1"}, {"page": index}, json={"id": index})
+            _same(template.prepare(url=url, params={"page": index}, json={"id": index}), expected)
+
+    def test_form_body(self):
+        template = RequestTemplate("POST", "http://example.com/form", data={"a": "1"}, dynamic=("data",), serializer=stdlib_dumps)
+        _same(template.prepare(data={"a": "2"}), _prepared("POST", "http://example.com/form", data={"a": "2"}))
+
+    def test_undeclared_parts_are_ignored(self):
+        template = RequestTemplate("GET", "http://example.com/api", serializer=stdlib_dumps)
+        assert template.prepare(url="http://other.com/").url == "http://example.com/api"
+
+    def test_prepared_requests_are_independent(self):
+        template = RequestTemplate("GET", "http://example.com/api", headers={"A": "1"}, serializer=stdlib_dumps)
+        first = template.prepare()
+        first.headers["A"] = "changed"
+        assert template.prepare().headers["A"] == "1"
+
+    def test_unknown_dynamic_part(self):
+        with pytest.raises(ValueError):
+            RequestTemplate("GET", "http://example.com/api", dynamic=("files",))
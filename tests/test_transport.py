@@ -0,0 +1,132 @@
+import io
+import socket
+import pytest
+import requests
+from conftest import json_response
+from core.http.client import HTTPClient
+from utils.serializer import stdlib_dumps
+
+pytest.importorskip("httpx")
+pytest.importorskip("h2")
+
+from core.http.transport import Http2Transport  # noqa: E402
+from core.http.transport_benchmark import H2StandInServer, compare_transports, main  # noqa: E402
+
+
+@pytest.fixture
+def h2_server():
+    server = H2StandInServer(record=True)
+    server.start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def h2_client():
+    client = HTTPClient(serializer=stdlib_dumps, transport=Http2Transport(prior_knowledge=True))
+    yield client
+    client.close()
+
+
+class TestRequestBody:
+    """各种请求体通过HTTP/2发送后，服务端收到的字节与requests准备的请求体一致"""
+
+    def test_json_body(self, h2_server, h2_client):
+        response = h2_client.send_request("POST", h2_server.url, json={"name": "张三", "id": 1}, use_cache=False)
+        assert response.status_code == 200
+        assert response.http_version == "HTTP/2"
+        request = h2_server.requests[-1]
+        assert request["method"] == "POST"
+        assert request["body"] == '{"name":"张三","id":1}'.encode()
+        assert request["headers"]["content-type"] == "application/json"
+
+    def test_form_body(self, h2_server, h2_client):
+        h2_client.send_request("POST", h2_server.url, data={"a": "1", "b": "x y"}, use_cache=False)
+        request = h2_server.requests[-1]
+        assert request["body"] == b"a=1&b=x+y"
+        assert request["headers"]["content-type"] == "application/x-www-form-urlencoded"
+
+    def test_multipart_encoder_body(self, h2_server, h2_client):
+        from requests_toolbelt.multipart.encoder import MultipartEncoder
+
+        fields = {"name": "report", "file": ("a.txt", b"payload" * 20000, "text/plain")}
+        encoder = MultipartEncoder(fields=fields, boundary="stand-in-boundary")
+        expected = MultipartEncoder(fields=fields, boundary="stand-in-boundary").to_string()
+        response = h2_client.send_request(
+            "POST", h2_server.url, headers={"Content-Type": encoder.content_type}, data=encoder, use_cache=False
+        )
+        assert response.status_code == 200
+        request = h2_server.requests[-1]
+        # 请求体超过一个读取块，按 Content-Length 发送而不是分块传输
+        assert request["body"] == expected
+        assert request["headers"]["content-length"] == str(len(expected))
+        assert "transfer-encoding" not in request["headers"]
+
+    def test_file_body(self, h2_server, h2_client):
+        h2_client.send_request("PUT", h2_server.url, data=io.BytesIO(b"raw file"), use_cache=False)
+        assert h2_server.requests[-1]["body"] == b"raw file"
+
+
+class TestResponseMapping:
+    """httpx响应转换为 requests.Response，使用HTTP/1.1连接本地替身服务"""
+
+    def test_status_headers_cookies_and_history(self, stub_server):
+        stub_server.route("GET", "/old")(lambda handler, params, body: (302, {"Location": "/new"}, b""))
+        stub_server.route("GET", "/new")(
+            lambda handler, params, body: json_response(
+                {"id": 1}, 201, {"Content-Type": "application/json; charset=gbk", "Set-Cookie": "sid=abc; Path=/"}
+            )
+        )
+        client = HTTPClient(serializer=stdlib_dumps, transport=Http2Transport())
+        response = client.send_request("GET", stub_server.url + "/old", use_cache=False)
+        client.close()
+
+        assert response.status_code == 201
+        assert response.reason == "Created"
+        assert response.http_version == "HTTP/1.1"
+        assert response.url == stub_server.url + "/new"
+        assert response.headers["content-type"] == "application/json; charset=gbk"
+        assert response.encoding == "gbk"
+        assert response.json() == {"id": 1}
+        assert response.cookies.get("sid") == "abc"
+        assert [item.status_code for item in response.history] == [302]
+        assert response.request.url == stub_server.url + "/old"
+
+    def test_timeout_is_mapped(self):
+        server = H2StandInServer(delay=1.0)
+        server.start()
+        transport = Http2Transport(prior_knowledge=True)
+        try:
+            with pytest.raises(requests.Timeout):
+                transport.send(requests.Request("GET", server.url).prepare(), timeout=0.1)
+        finally:
+            transport.close()
+            server.stop()
+
+    def test_connection_error_is_mapped(self):
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        transport = Http2Transport(prior_knowledge=True)
+        with pytest.raises(requests.ConnectionError):
+            transport.send(requests.Request("GET", f"http://127.0.0.1:{port}/").prepare(), timeout=1)
+        transport.close()
+
+
+class TestTransportBenchmark:
+    """基准测试在本机替身服务上运行，h2传输复用一个连接"""
+
+    def test_compare_transports(self):
+        http1, h2 = compare_transports(requests=40, concurrency=4, delay=0.0, body_bytes=256)
+        assert (http1.transport, h2.transport) == ("http1", "h2")
+        assert http1.errors == h2.errors == 0
+        assert h2.connections == 1
+        assert 1 <= http1.connections <= 4
+        assert h2.latency.count == 40
+        assert h2.throughput > 0
+
+    def test_main_prints_results(self, capsys):
+        assert main(["--requests", "8", "--concurrency", "2", "--delay", "0", "-v"]) == 0
+        lines = capsys.readouterr().out.splitlines()
+        assert lines[0].startswith("transport")
+        assert [line.split()[0] for line in lines[1:]] == ["http1", "h2"]
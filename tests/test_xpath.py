@@ -0,0 +1,95 @@
+from xml.etree import ElementTree as ETree
+import pytest
+from utils.xpath import compile_xpath, iter_xpath, iter_xpath_stream
+
+
+SOAP = b"""<?xml version="1.0" encoding="utf-8"?>
+<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/" xmlns:m="urn:test">
+  <soap:Body>
+    <m:Response code="0">
+      <m:Item id="1">a</m:Item>
+      <m:Item id="2">b</m:Item>
+      <m:Total>2</m:Total>
+    </m:Response>
+  </soap:Body>
+</soap:Envelope>"""
+
+
+def _both(document: bytes, expression: str) -> tuple[list, list]:
+    return list(iter_xpath(ETree.fromstring(document), expression)), list(iter_xpath_stream(document, expression))
+
+
+class TestXPath:
+    """XPath断言的求值"""
+
+    @pytest.mark.parametrize(
+        "expression, expected",
+        [
+            ("/Envelope/Body/Response/Total", ["2"]),
+            ("//Item", ["a", "b"]),
+            ("//Item/@id", ["1", "2"]),
+            ("//Response/@code", ["0"]),
+            (".//Item/text()", ["a", "b"]),
+            ("Body/Response/Total", ["2"]),
+            ("//Missing", []),
+        ],
+    )
+    def test_tree_and_stream(self, expression, expected):
+        tree, stream = _both(SOAP, expression)
+        assert tree == expected
+        assert stream == expected
+
+    def test_predicates_are_not_streamable(self):
+        expr = compile_xpath("//Item[@id='2']")
+        assert not expr.streamable
+        assert list(iter_xpath(ETree.fromstring(SOAP), expr)) == ["b"]
+        with pytest.raises(ValueError):
+            list(iter_xpath_stream(SOAP, expr))
+
+    def test_stream_stops_early(self):
+        # 找到第一个值后停止，后面格式错误的部分不会被解析
+        document = b"<root><a>1</a><a>2</a><broken></root>"
+        assert next(iter_xpath_stream(document, "//a")) == "1"
+
+    def test_empty_expression(self):
+        with pytest.raises(ValueError):
+            compile_xpath("  ")
+
+    @pytest.mark.parametrize(
+        "expression, expected",
+        [
+            ("//item", ["outer", "inner", "deep", "last"]),
+            ("//item/@id", ["1", "2", "3", "4"]),
+            ("//item//item", ["inner", "deep"]),
+            ("//item/item", ["inner", "deep"]),
+            ("//list/item", ["outer", "last"]),
+            ("/list/item/item/item", ["deep"]),
+            ("//list/@id", [None]),
+        ],
+    )
+    def test_stream_matches_tree_on_nested_document(self, expression, expected):
+        # 嵌套的匹配节点按开始标签（文档）顺序返回，外层节点不会排在内层之后，也不会重复
+        document = b"""<list>
+            <item id="1">outer<item id="2">inner<item id="3">deep</item></item></item>
+            <item id="4">last</item>
+        </list>"""
+        tree, stream = _both(document, expression)
+        assert tree == expected
+        assert stream == expected
+
+    def test_predicate_with_slash_and_bracket(self):
+        document = b'<root><a href="x/y]">1</a><a href="z">2</a></root>'
+        expr = compile_xpath("//a[@href='x/y]']/@href")
+        assert expr.attribute == "href"
+        assert [name for _, name in expr.steps] == ["a[@href='x/y]']"]
+        assert list(iter_xpath(ETree.fromstring(document), expr)) == ["x/y]"]
+
+    def test_namespace_step_with_slash(self):
+        expr = compile_xpath("/{http://schemas.xmlsoap.org/soap/envelope/}Envelope/Body/Response/Total")
+        assert len(expr.steps) == 4
+        tree, stream = _both(SOAP, expr.expression)
+        assert tree == stream == ["2"]
+
+    def test_unbalanced_predicate(self):
+        with pytest.raises(ValueError):
+            compile_xpath("//a[@href='x'")
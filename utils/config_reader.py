@@ -1,19 +1,53 @@
+import os
 import pathlib
 from typing import Any, Dict, List, Optional
 import yaml
 from utils.logger import logger
+from utils.path import PACKAGE_ROOT, PROJECT_ROOT
 
 
-# 配置文件路径
-CONFIG_FILE_PATH = pathlib.Path(__file__).parent.parent / "config/base_config.yaml"
+# 指定配置文件路径的环境变量
+CONFIG_ENV = "API_TEST_CONFIG"
+# 随包发布的默认配置文件
+DEFAULT_CONFIG_PATH = PACKAGE_ROOT / "config/base_config.yaml"
+# 通过 set_config_path（命令行 --config / --api-config）指定的配置文件路径
+_CONFIG_PATH: Optional[pathlib.Path] = None
 # 缓存配置，避免重复读取文件
 _CONFIG_CACHE: Optional[Dict[str, Any]] = None
 
 
+def config_file_path() -> pathlib.Path:
+    """
+    获取配置文件路径
+
+    优先级：set_config_path 指定的路径 > 环境变量 API_TEST_CONFIG > 项目根目录下的 config/base_config.yaml >
+    随包发布的默认配置
+    """
+    if _CONFIG_PATH is not None:
+        return _CONFIG_PATH
+    if os.environ.get(CONFIG_ENV):
+        return pathlib.Path(os.environ[CONFIG_ENV])
+    project_config = PROJECT_ROOT / "config/base_config.yaml"
+    return project_config if project_config.exists() else DEFAULT_CONFIG_PATH
+
+
+def set_config_path(path: Optional[str | pathlib.Path]) -> None:
+    """
+    指定配置文件路径并清除配置缓存
+
+    Args:
+        path: 配置文件路径，为None时恢复默认的查找顺序
+    """
+    global _CONFIG_PATH
+    _CONFIG_PATH = None if path is None else pathlib.Path(path)
+    clear_config_cache()
+
+
 def read_config() -> dict:
     """读取配置文件"""
-    logger.info(f"开始读取配置文件: {CONFIG_FILE_PATH}")
-    with open(CONFIG_FILE_PATH, "r", encoding="utf-8") as file:
+    path = config_file_path()
+    logger.info(f"开始读取配置文件: {path}")
+    with open(path, "r", encoding="utf-8") as file:
         config = yaml.safe_load(file)
     if config:
         logger.info(f"配置文件读取成功，包含 {len(config)} 个顶级配置项")
@@ -61,6 +95,18 @@ def get_global_headers() -> Dict[str, str]:
     return global_headers
 
 
+def get_latency_config() -> Dict[str, Any]:
+    """
+    获取耗时SLO与基线配置
+
+    Returns:
+        dict: Latency 配置项，未配置时返回空字典
+    """
+    logger.debug("开始获取耗时基线配置")
+    config = get_config()
+    return config.get("Latency") or {}
+
+
 def get_config() -> Dict[str, Any]:
     """获取配置数据，使用缓存提高性能"""
     global _CONFIG_CACHE
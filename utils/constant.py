@@ -7,7 +7,7 @@ from typing import Any, Dict, Optional
 
 
 class VariableCache:
-    """简单的全局变量缓存类"""
+    """简单的变量缓存类，全局实例之外，也作为单个数据文件的变量作用域"""
 
     def __init__(self):
         self._cache: Dict[str, Any] = {}
@@ -35,6 +35,9 @@ class VariableCache:
         """获取所有变量"""
         return self._cache.copy()
 
+    def __len__(self) -> int:
+        return len(self._cache)
+
 
 # 创建全局实例
 variable_cache = VariableCache()
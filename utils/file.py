@@ -1,7 +1,11 @@
 from pathlib import Path
 from data.providers import excel_reader
 from data.providers import yaml_reader
-from typing import Optional, Any
+from typing import Iterator, Optional, Any
+
+
+# 支持作为用例数据的文件后缀
+CASE_FILE_SUFFIXES = ('.xlsx', '.xls', '.yaml', '.yml')
 
 
 class FileTypeUtil:
@@ -29,4 +33,28 @@ class FileTypeUtil:
         elif suffix in ['.yaml', '.yml']:
             return yaml_reader.yaml_reader(file_path=file_path)
         else:
-            raise ValueError(f"不支持的文件类型: {suffix}")
\ No newline at end of file
+            raise ValueError(f"不支持的文件类型: {suffix}")
+
+    @staticmethod
+    def iter_file_cases(file_path: str) -> Iterator[tuple[int, dict[str, Any]]]:
+        """
+        根据文件后缀逐个读取用例
+
+        Args:
+            file_path: 文件路径
+
+        Returns:
+            Iterator[tuple[int, dict[str, Any]]]: (行号或序号, 用例数据) 迭代器
+
+        Raises:
+            ValueError: 当文件类型不支持时
+        """
+        suffix = Path(file_path).suffix.lower()
+
+        if suffix in ['.xlsx', '.xls']:
+            return excel_reader.iter_excel_rows(file_path=file_path)
+
+        elif suffix in ['.yaml', '.yml']:
+            return yaml_reader.iter_yaml_cases(file_path=file_path)
+        else:
+            raise ValueError(f"不支持的文件类型: {suffix}")
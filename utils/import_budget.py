@@ -0,0 +1,148 @@
+"""
+模块导入耗时预算
+在独立的解释器中用 -X importtime 测量各模块的累计导入耗时，超出预算时以非零状态码退出，
+可以在CI中执行 `python -m utils.import_budget` 防止启动变慢。
+
+绝对耗时随机器变化很大，预算以同一台机器上导入基准模块（requests）耗时的倍数表示；
+运行时总会加载的第三方模块（pytest、yaml）在测量前预先导入，其耗时不计入被测模块。
+"""
+
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+from utils.path import PACKAGE_ROOT
+
+
+# 基准模块，各模块的导入耗时以其倍数表示
+BASELINE_MODULE = "requests"
+# 测量前预先导入的第三方模块
+PRELOAD_MODULES = ("yaml", "pytest")
+# 需要检查的项目包，模块列表从包目录中收集
+PACKAGES = ("core", "data", "utils")
+# 未单独配置预算的模块的预算（基准耗时的倍数），依赖requests的模块约为1~2倍
+DEFAULT_BUDGET = 3.0
+# 需要保持轻量的模块的预算，这些模块的重依赖（requests、openpyxl、requests_toolbelt等）应在使用时才导入
+IMPORT_BUDGETS: Dict[str, float] = {
+    "utils.logger": 0.5,
+    "utils.profiler": 0.75,
+    "utils.file": 0.75,
+    "data.providers.excel_reader": 0.75,
+    "data.data_processor": 0.75,
+    "core.report.reporter": 0.75,
+    "core.runner.state": 0.75,
+    "core.runner.collector": 0.75,
+    "core.runner.pytest_plugin": 0.75,
+    "main": 0.75,
+}
+
+
+@dataclass
+class ImportTiming:
+    """
+    单个模块的导入耗时
+
+    Attributes:
+        module: 模块名
+        cumulative_ms: 包含依赖在内的累计导入耗时，不含预先导入的模块
+        baseline_ms: 同一台机器上基准模块的导入耗时
+        budget: 预算（基准耗时的倍数），为None时不检查
+    """
+
+    module: str
+    cumulative_ms: float
+    baseline_ms: float
+    budget: Optional[float] = None
+
+    @property
+    def ratio(self) -> float:
+        return self.cumulative_ms / self.baseline_ms if self.baseline_ms else 0.0
+
+    @property
+    def over_budget(self) -> bool:
+        return self.budget is not None and self.ratio > self.budget
+
+
+def discover_modules(packages: Iterable[str] = PACKAGES) -> List[str]:
+    """收集项目包下的全部模块及命令行入口 main"""
+    modules = []
+    for package in packages:
+        for path in sorted((PACKAGE_ROOT / package).rglob("*.py")):
+            if path.stem in ("__init__", "__main__"):
+                continue
+            modules.append(".".join(path.relative_to(PACKAGE_ROOT).with_suffix("").parts))
+    if (PACKAGE_ROOT / "main.py").exists():
+        modules.append("main")
+    return modules
+
+
+def measure_import(module: str, repeat: int = 3, preload: Iterable[str] = PRELOAD_MODULES) -> float:
+    """
+    在新的解释器中测量模块的累计导入耗时，多次测量取最小值以降低抖动
+
+    Args:
+        module: 模块名
+        repeat: 测量次数
+        preload: 测量前预先导入的模块，已导入的模块不计入累计耗时
+
+    Returns:
+        float: 累计导入耗时（毫秒）
+    """
+    preload = [name for name in preload if name != module]
+    statements = "".join(f"import {name}; " for name in preload) + f"import {module}"
+    best: Optional[float] = None
+    for _ in range(repeat):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", statements],
+            cwd=PACKAGE_ROOT,
+            capture_output=True,
+            text=True,
+        )
+        if proc.returncode != 0:
+            raise ImportError(f"导入模块 {module} 失败:\n{proc.stderr}")
+        cumulative = _parse_cumulative(proc.stderr, module)
+        best = cumulative if best is None else min(best, cumulative)
+    return best
+
+
+def _parse_cumulative(output: str, module: str) -> float:
+    # 输出格式: "import time: self [us] | cumulative | imported package"
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) == 3 and parts[2].strip() == module:
+            return int(parts[1]) / 1000
+    raise ValueError(f"未找到模块 {module} 的导入耗时")
+
+
+def check_budgets(budgets: Optional[Dict[str, Optional[float]]] = None, repeat: int = 3) -> List[ImportTiming]:
+    """
+    测量模块的导入耗时
+
+    Args:
+        budgets: 模块及其预算，为None时检查 discover_modules 收集的全部模块
+        repeat: 每个模块的测量次数
+    """
+    if budgets is None:
+        budgets = {module: IMPORT_BUDGETS.get(module, DEFAULT_BUDGET) for module in discover_modules()}
+    baseline = measure_import(BASELINE_MODULE, repeat)
+    return [ImportTiming(module, measure_import(module, repeat), baseline, budget) for module, budget in budgets.items()]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    modules = argv if argv is not None else sys.argv[1:]
+    budgets = {module: IMPORT_BUDGETS.get(module, DEFAULT_BUDGET) for module in modules} if modules else None
+    timings = check_budgets(budgets)
+    if timings:
+        print(f"基准: import {BASELINE_MODULE} = {timings[0].baseline_ms:.1f}ms，预先导入: {', '.join(PRELOAD_MODULES)}")
+    print(f"{'module':<36}{'import(ms)':>12}{'ratio':>8}{'budget':>8}")
+    for timing in timings:
+        budget = "-" if timing.budget is None else f"{timing.budget:.2f}"
+        flag = "  超出预算" if timing.over_budget else ""
+        print(f"{timing.module:<36}{timing.cumulative_ms:>12.1f}{timing.ratio:>8.2f}{budget:>8}{flag}")
+    return 1 if any(timing.over_budget for timing in timings) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,116 @@
+from functools import lru_cache
+from itertools import islice
 from jsonpath_ng import parse, JSONPath
-from typing import Any
+from jsonpath_ng.jsonpath import Child, Descendants, Fields, Index, Root, Slice, This
+from typing import Any, Iterator
 from utils.logger import logger
 
 
+@lru_cache(maxsize=1024)
+def compile_jsonpath(jsonpath: str) -> JSONPath:
+    """
+    编译JSONPath表达式并缓存编译结果
+
+    Args:
+        jsonpath (str): JSONPath表达式
+
+    Returns:
+        JSONPath: 编译后的表达式对象，相同表达式只会解析一次
+    """
+    logger.debug(f"编译JSONPath表达式: {jsonpath}")
+    return parse(jsonpath)
+
+
+def _is_streamable(expr: JSONPath) -> bool:
+    """判断表达式是否只由可惰性求值的节点组成"""
+    if isinstance(expr, (Child, Descendants)):
+        return _is_streamable(expr.left) and _is_streamable(expr.right)
+    return isinstance(expr, (Root, This, Fields, Index, Slice))
+
+
+def _iter_descendants(expr: JSONPath, data: Any) -> Iterator[Any]:
+    """在data自身及其所有后代节点上匹配expr（对应 `..` 运算）"""
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        yield from _iter_node(expr, node)
+        if isinstance(node, dict):
+            stack.extend(reversed(list(node.values())))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+
+
+def _iter_slice(expr: Slice, data: Any) -> Iterator[Any]:
+    if not isinstance(data, list):
+        # 与jsonpath_ng保持一致：对非列表使用 [*] 时视为单元素列表
+        if expr.start is None and expr.end is None and expr.step is None:
+            yield data
+        return
+    start, end, step = expr.start, expr.end, expr.step
+    if all(value is None or value >= 0 for value in (start, end, step)) and step != 0:
+        # 非负切片直接在原列表上迭代，不复制列表
+        yield from islice(data, start, end, step)
+    else:
+        yield from data[start:end:step]
+
+
+def _iter_node(expr: JSONPath, data: Any) -> Iterator[Any]:
+    if isinstance(expr, (Root, This)):
+        yield data
+    elif isinstance(expr, Child):
+        for value in _iter_node(expr.left, data):
+            yield from _iter_node(expr.right, value)
+    elif isinstance(expr, Descendants):
+        for value in _iter_node(expr.left, data):
+            yield from _iter_descendants(expr.right, value)
+    elif isinstance(expr, Fields):
+        if not isinstance(data, dict):
+            return
+        for name in expr.fields:
+            if name == "*":
+                yield from data.values()
+            elif name in data:
+                yield data[name]
+    elif isinstance(expr, Index):
+        if not isinstance(data, list):
+            return
+        indices = getattr(expr, "indices", None) or (expr.index,)
+        for index in indices:
+            if -len(data) <= index < len(data):
+                yield data[index]
+    elif isinstance(expr, Slice):
+        yield from _iter_slice(expr, data)
+
+
+def iter_jsonpath(json_data: Any, jsonpath: str) -> Iterator[Any]:
+    """
+    惰性迭代JSONPath匹配的值
+
+    对于只包含字段、下标、切片、通配符和 `..` 的表达式逐个产出匹配值，
+    调用方可以在找到目标后提前停止，无需构建完整的匹配列表；
+    包含过滤器等复杂语法的表达式回退到jsonpath_ng的完整匹配。
+
+    Args:
+        json_data (Any): JSON数据
+        jsonpath (str): JSONPath表达式
+
+    Returns:
+        Iterator[Any]: 匹配值迭代器
+
+    Raises:
+        Exception: JSONPath表达式不合法时
+    """
+    expr = compile_jsonpath(jsonpath)
+    return iter_compiled(expr, json_data)
+
+
+def iter_compiled(expr: JSONPath, json_data: Any) -> Iterator[Any]:
+    """使用已编译的JSONPath表达式惰性迭代匹配值"""
+    if _is_streamable(expr):
+        return _iter_node(expr, json_data)
+    return (match.value for match in expr.find(json_data))
+
+
 def jsonpath(json_data: dict, jsonpath: str) -> list[Any]:
     """
     解析JSON数据并返回匹配的节点列表
@@ -17,7 +125,7 @@ def jsonpath(json_data: dict, jsonpath: str) -> list[Any]:
     logger.debug(f"开始使用JSONPath表达式解析数据: {jsonpath}")
     
     try:
-        jsonpath_expr: JSONPath = parse(jsonpath)
+        jsonpath_expr: JSONPath = compile_jsonpath(jsonpath)
         matches = jsonpath_expr.find(json_data)
         result = [match.value for match in matches]
         
@@ -3,21 +3,31 @@ import os
 import time
 from logging.handlers import RotatingFileHandler
 
+class _DeferredRotatingFileHandler(RotatingFileHandler):
+    """首次写入日志时才创建日志目录并打开文件的轮转文件处理器"""
+
+    def __init__(self, filename, **kwargs):
+        super().__init__(filename, delay=True, **kwargs)
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
+
 class Logger:
     """日志工具类"""
     
-    def __init__(self, name=__name__, log_dir="logs"):
+    def __init__(self, name=__name__, log_dir=None):
         """
         初始化日志记录器
         
         Args:
             name: 日志记录器名称
-            log_dir: 日志文件目录
+            log_dir: 日志文件目录，默认为环境变量 API_TEST_LOG_DIR，未设置时为当前工作目录下的 logs
         """
-        # 创建日志目录
+        # 日志目录在首次写入文件时才创建
+        log_dir = log_dir or os.environ.get("API_TEST_LOG_DIR") or "logs"
         self.log_dir = log_dir
-        if not os.path.exists(log_dir):
-            os.makedirs(log_dir)
         
         # 创建日志记录器
         self.logger = logging.getLogger(name)
@@ -29,9 +39,9 @@ class Logger:
             console_handler = logging.StreamHandler()
             console_handler.setLevel(logging.INFO)
             
-            # 创建文件处理器（带轮转）
+            # 创建文件处理器（带轮转），首次写入时才打开文件
             log_file = os.path.join(log_dir, f"api_test_{time.strftime('%Y%m%d')}.log")
-            file_handler = RotatingFileHandler(
+            file_handler = _DeferredRotatingFileHandler(
                 log_file,
                 maxBytes=10 * 1024 * 1024,  # 10MB
                 backupCount=5,
@@ -1,11 +1,17 @@
+import os
 from pathlib import Path
 from collections import defaultdict
 from typing import Dict, List, Optional, Union
 from utils.logger import logger
 
-# 项目根目录（使用相对路径）
-# 获取当前文件的父目录的父目录作为项目根目录
-PROJECT_ROOT = Path(__file__).parent.parent
+# 源码目录，即当前文件的父目录的父目录，包含 core、data、utils 等包以及随包发布的默认配置
+PACKAGE_ROOT = Path(__file__).parent.parent
+# 项目根目录，配置文件、用例数据、运行状态与剖析结果等默认路径以此为基准：
+# 优先使用环境变量 API_TEST_HOME；在源码目录中运行（包括可编辑安装）时为源码目录；
+# 以wheel安装到site-packages时为当前工作目录，避免在site-packages中查找用例或写入文件
+PROJECT_ROOT = Path(
+    os.environ.get("API_TEST_HOME") or (PACKAGE_ROOT if (PACKAGE_ROOT / "pyproject.toml").exists() else Path.cwd())
+)
 
 
 def path_util(
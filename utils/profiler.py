@@ -0,0 +1,228 @@
+"""
+性能剖析模块
+为用例执行流水线的各个阶段提供低开销计时，以及可选的采样剖析（输出火焰图可用的collapsed格式）
+"""
+
+import contextlib
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from types import FrameType
+from typing import ContextManager, Dict, List, Optional
+from utils.logger import logger
+
+
+# 未启用剖析时返回的空上下文，避免每次调用都创建对象
+_NULL_STAGE = contextlib.nullcontext()
+
+
+@dataclass
+class StageStats:
+    """单个阶段的累计耗时（纳秒）
+
+    Attributes:
+        count: 执行次数
+        total_ns: 包含子阶段在内的总耗时
+        self_ns: 扣除子阶段后的自身耗时
+        max_ns: 单次最大耗时
+    """
+
+    count: int = 0
+    total_ns: int = 0
+    self_ns: int = 0
+    max_ns: int = 0
+
+
+class _Stage:
+    """阶段计时上下文，退出时将耗时累加到父阶段的子阶段耗时中"""
+
+    __slots__ = ("profiler", "name", "start", "child_ns")
+
+    def __init__(self, profiler: "StageProfiler", name: str):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0
+        self.child_ns = 0
+
+    def __enter__(self) -> "_Stage":
+        self.profiler._stack().append(self)
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        elapsed = time.perf_counter_ns() - self.start
+        stack = self.profiler._stack()
+        stack.pop()
+        if stack:
+            stack[-1].child_ns += elapsed
+        else:
+            self.profiler._release_stack()
+        self.profiler._add(self.name, elapsed, elapsed - self.child_ns)
+
+
+class StageProfiler:
+    """流水线阶段计时器
+
+    未启用时 stage() 直接返回空上下文，几乎没有额外开销；
+    启用后按阶段累计执行次数、总耗时与自身耗时（扣除嵌套的子阶段）。
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._stats: Dict[str, StageStats] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._thread_stacks: Dict[int, List[_Stage]] = {}
+        self._sampler: Optional["SamplingProfiler"] = None
+
+    def enable(self, sampling: bool = False, interval: float = 0.005) -> None:
+        """
+        启用阶段计时
+
+        Args:
+            sampling: 是否同时启用采样剖析
+            interval: 采样间隔（秒）
+        """
+        self.enabled = True
+        if sampling and self._sampler is None:
+            self._sampler = SamplingProfiler(self, interval)
+            self._sampler.start()
+        logger.info(f"已启用流水线剖析，采样剖析: {'启用' if sampling else '未启用'}")
+
+    def disable(self) -> None:
+        """停止计时与采样，已收集的数据保留"""
+        self.enabled = False
+        if self._sampler is not None:
+            self._sampler.stop()
+
+    def reset(self) -> None:
+        """停止采样并清空已收集的数据"""
+        self.disable()
+        with self._lock:
+            self._stats.clear()
+        self._sampler = None
+
+    def stage(self, name: str) -> ContextManager:
+        """返回阶段计时上下文"""
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name)
+
+    def current_stages(self, thread_id: int) -> List[str]:
+        """返回指定线程当前所在的阶段路径，供采样剖析使用"""
+        return [stage.name for stage in self._thread_stacks.get(thread_id, ())]
+
+    def _stack(self) -> List[_Stage]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+            with self._lock:
+                self._thread_stacks[threading.get_ident()] = stack
+        return stack
+
+    def _release_stack(self) -> None:
+        """线程退出最外层阶段后注销其调用栈，已结束的线程不会残留在 _thread_stacks 中"""
+        self._local.stack = None
+        with self._lock:
+            self._thread_stacks.pop(threading.get_ident(), None)
+
+    def _add(self, name: str, total_ns: int, self_ns: int) -> None:
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = StageStats()
+            stats.count += 1
+            stats.total_ns += total_ns
+            stats.self_ns += self_ns
+            if total_ns > stats.max_ns:
+                stats.max_ns = total_ns
+
+    def stats(self) -> Dict[str, StageStats]:
+        """返回各阶段统计的副本"""
+        with self._lock:
+            return {name: StageStats(**vars(stats)) for name, stats in self._stats.items()}
+
+    def format_report(self) -> str:
+        """生成按自身耗时降序排列的阶段耗时表"""
+        stats = self.stats()
+        total_self = sum(item.self_ns for item in stats.values()) or 1
+        lines = [f"{'stage':<18}{'count':>10}{'self(ms)':>14}{'self%':>8}{'total(ms)':>14}{'avg(ms)':>11}{'max(ms)':>11}"]
+        for name, item in sorted(stats.items(), key=lambda pair: pair[1].self_ns, reverse=True):
+            lines.append(
+                f"{name:<18}{item.count:>10}{item.self_ns / 1e6:>14.3f}{item.self_ns * 100 / total_self:>7.1f}%"
+                f"{item.total_ns / 1e6:>14.3f}{item.total_ns / item.count / 1e6:>11.3f}{item.max_ns / 1e6:>11.3f}"
+            )
+        return "\n".join(lines)
+
+    def write_report(self, output_dir: str | Path) -> Dict[str, Path]:
+        """
+        将阶段耗时表和采样结果写入目录
+
+        Returns:
+            Dict[str, Path]: 生成的文件，stages 为阶段耗时表，collapsed 为采样调用栈
+        """
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        files = {"stages": output_dir / "stages.txt"}
+        files["stages"].write_text(self.format_report() + "\n", encoding="utf-8")
+        if self._sampler is not None:
+            files["collapsed"] = output_dir / "stacks.collapsed"
+            self._sampler.write_collapsed(files["collapsed"])
+        logger.info(f"剖析结果已写入: {output_dir}")
+        return files
+
+
+def _frame_name(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """采样剖析器
+
+    后台线程按固定间隔采集其他线程的调用栈，调用栈前面附加当前所在的流水线阶段，
+    按 collapsed 格式（frame;frame;frame count）汇总，可直接交给 flamegraph.pl / speedscope 生成火焰图。
+    """
+
+    def __init__(self, stage_profiler: StageProfiler, interval: float = 0.005, max_depth: int = 64):
+        self.stage_profiler = stage_profiler
+        self.interval = interval
+        self.max_depth = max_depth
+        self.samples: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="api-test-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                names: List[str] = []
+                while frame is not None and len(names) < self.max_depth:
+                    names.append(_frame_name(frame))
+                    frame = frame.f_back
+                names.reverse()
+                stages = [f"[{name}]" for name in self.stage_profiler.current_stages(thread_id)]
+                self.samples[";".join(stages + names)] += 1
+
+    def write_collapsed(self, path: str | Path) -> None:
+        """写入collapsed格式的采样结果"""
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+# 创建全局实例
+profiler = StageProfiler()
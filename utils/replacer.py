@@ -1,14 +1,21 @@
 import re
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 from utils import config_reader, constant, logger
+from utils.constant import VariableCache
 
 
-def replace_url(url: str) -> str:
+def _scope(variables: Optional[VariableCache]) -> VariableCache:
+    # 未指定变量作用域时使用全局变量缓存
+    return constant.variable_cache if variables is None else variables
+
+
+def replace_url(url: str, variables: Optional[VariableCache] = None) -> str:
     """
     替换url中的变量
 
     Args:
         url (str): 需要替换变量的URL字符串
+        variables (Optional[VariableCache]): 变量作用域，为None时使用全局变量缓存
 
     Returns:
         str: 替换后的URL字符串
@@ -47,7 +54,7 @@ def replace_url(url: str) -> str:
 
         # 如果host配置中没找到，从variable_cache获取
         if not replacement_found:
-            cache_value = constant.get_variable(var_name)
+            cache_value = _scope(variables).get_value(var_name)
             if cache_value is not None:
                 replacements[f"${{{var_name}}}"] = str(cache_value)
                 logger.debug(f"从变量缓存中找到变量 '{var_name}' 的值: {cache_value}")
@@ -63,12 +70,13 @@ def replace_url(url: str) -> str:
     return result_url
 
 
-def replace_data(data: Dict[str, Any]) -> Dict[str, Any]:
+def replace_data(data: Dict[str, Any], variables: Optional[VariableCache] = None) -> Dict[str, Any]:
     """
     替换data中的变量，返回修改后的副本
 
     Args:
         data (Dict[str, Any]): 需要替换数据的字典
+        variables (Optional[VariableCache]): 变量作用域，为None时使用全局变量缓存
 
     Returns:
         Dict[str, Any]: 替换后的字典副本
@@ -91,6 +99,7 @@ def replace_data(data: Dict[str, Any]) -> Dict[str, Any]:
     for key in result:
         stack.append((result, key))
 
+    cache = _scope(variables)
     replaced_count = 0
     while stack:
         current_dict, key = stack.pop()
@@ -99,7 +108,7 @@ def replace_data(data: Dict[str, Any]) -> Dict[str, Any]:
         if isinstance(value, str) and value.startswith("${") and value.endswith("}"):
             var_name = value[2:-1]  # 提取变量名
             try:
-                replacement = constant.get_variable(var_name)
+                replacement = cache.get_value(var_name)
                 if replacement is not None:
                     current_dict[key] = replacement
                     replaced_count += 1
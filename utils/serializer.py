@@ -0,0 +1,128 @@
+"""
+JSON序列化模块
+请求体编码使用可替换的JSON序列化函数，默认在安装了orjson时使用orjson，否则使用标准库json。
+
+两种实现输出相同的字节（以orjson的输出为准）：紧凑分隔符、非ASCII字符按UTF-8原样输出、
+NaN/Infinity 输出为 null，切换实现不会改变请求体，也不会影响按请求体匹配的录制回放。
+"""
+
+import json
+import re
+import threading
+from typing import Any, Callable, Dict, Optional
+from utils import config_reader
+from utils.logger import logger
+
+
+# 序列化函数，输入Python对象，返回UTF-8编码的JSON字节串
+JsonSerializer = Callable[[Any], bytes]
+
+# 标准库输出中与orjson不同的片段：NaN/Infinity（orjson输出null），
+# 指数为-5到-9的浮点数（标准库 1e-05、1.5e-07，orjson 0.00001、1.5e-7）。
+# 字符串整体匹配后原样保留，避免改写字符串内容
+_STDLIB_DIVERGENT = re.compile(r'"(?:[^"\\]|\\.)*"|-?Infinity|NaN|(-?\d)(?:\.(\d+))?e-0([5-9])')
+
+
+def _orjson_token(match: re.Match) -> str:
+    token = match.group(0)
+    if token[0] == '"':
+        return token
+    if match.group(1) is None:
+        return "null"
+    if match.group(3) != "5":
+        return token.replace("e-0", "e-")
+    lead, fraction = match.group(1), match.group(2) or ""
+    sign = "-" if lead[0] == "-" else ""
+    return f"{sign}0.0000{lead[-1]}{fraction}"
+
+
+def stdlib_dumps(obj: Any) -> bytes:
+    """标准库json序列化，输出与orjson相同的字节"""
+    text = json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+    # 只有可能出现不同片段时才做改写，大多数请求体直接编码
+    if "e-0" in text or "NaN" in text or "Infinity" in text:
+        text = _STDLIB_DIVERGENT.sub(_orjson_token, text)
+    return text.encode("utf-8")
+
+
+def _orjson_dumps() -> JsonSerializer:
+    import orjson
+
+    # 标准库不支持的datetime、dataclass以及str/int/dict等的子类交给标准库处理，行为保持一致
+    option = (
+        orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+        | orjson.OPT_PASSTHROUGH_SUBCLASS
+    )
+
+    def dumps(obj: Any) -> bytes:
+        try:
+            return orjson.dumps(obj, option=option)
+        except TypeError:
+            # Decimal、超过64位的整数等orjson不支持的值回退到标准库
+            return stdlib_dumps(obj)
+
+    return dumps
+
+
+# 可选的序列化实现，值为创建序列化函数的工厂
+_FACTORIES: Dict[str, Callable[[], JsonSerializer]] = {
+    "json": lambda: stdlib_dumps,
+    "orjson": _orjson_dumps,
+}
+_LOCK = threading.Lock()
+_current: Optional[JsonSerializer] = None
+
+
+def register_serializer(name: str, factory: Callable[[], JsonSerializer]) -> None:
+    """注册自定义序列化实现"""
+    with _LOCK:
+        _FACTORIES[name] = factory
+    logger.debug(f"注册JSON序列化实现: {name}")
+
+
+def create_serializer(name: str = "auto") -> JsonSerializer:
+    """
+    创建序列化函数
+
+    Args:
+        name: 序列化实现名称，auto 表示优先使用orjson，未安装时使用标准库json
+
+    Raises:
+        ValueError: 名称未注册时
+        ImportError: 指定的实现依赖未安装时
+    """
+    if name == "auto":
+        try:
+            return _FACTORIES["orjson"]()
+        except ImportError:
+            return _FACTORIES["json"]()
+    factory = _FACTORIES.get(name)
+    if factory is None:
+        raise ValueError(f"不支持的JSON序列化实现: {name}，可选值为 {['auto', *_FACTORIES]}")
+    return factory()
+
+
+def set_serializer(name: str) -> JsonSerializer:
+    """切换全局使用的序列化实现"""
+    global _current
+    serializer = create_serializer(name)
+    with _LOCK:
+        _current = serializer
+    logger.info(f"JSON序列化实现: {name}")
+    return serializer
+
+
+def get_serializer() -> JsonSerializer:
+    """获取全局序列化函数，首次调用时按配置文件中 Http.json_serializer 创建"""
+    serializer = _current
+    if serializer is None:
+        name = (config_reader.get_config().get("Http") or {}).get("json_serializer", "auto")
+        serializer = set_serializer(name)
+    return serializer
+
+
+def dumps(obj: Any) -> bytes:
+    """使用全局序列化函数编码"""
+    return get_serializer()(obj)
@@ -0,0 +1,271 @@
+import io
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Iterator, Optional
+from xml.etree import ElementTree as ETree
+from utils.logger import logger
+
+
+@dataclass(frozen=True)
+class XPathExpr:
+    """编译后的XPath表达式
+
+    支持ElementTree的XPath子集，并额外支持结尾的 /@attr 与 /text()。
+    不带命名空间的节点名会匹配任意命名空间下的同名节点，便于直接断言SOAP报文。
+
+    Attributes:
+        expression: 原始表达式
+        steps: (轴, 节点名) 元组，轴为 child 或 descendant，第一个步骤相对于文档节点
+        attribute: 需要提取的属性名，为None时提取节点文本
+        streamable: 是否可以在增量解析时求值（不包含谓词等复杂语法）
+    """
+
+    expression: str
+    steps: tuple[tuple[str, str], ...]
+    attribute: Optional[str]
+    streamable: bool
+
+    @property
+    def element_path(self) -> str:
+        """转换为相对于根节点的ElementPath表达式（不含第一个根节点步骤）"""
+        parts = []
+        for axis, name in self.steps[1:]:
+            parts.append("//" if axis == "descendant" else "/")
+            parts.append(_any_namespace(name))
+        path = "".join(parts)
+        return "." + path if path else "."
+
+
+def _any_namespace(step: str) -> str:
+    """将不带命名空间的节点名转换为匹配任意命名空间的形式"""
+    if step.startswith("{") or step in ("*", ".", ".."):
+        return step
+    return "{*}" + step
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _split_steps(expr: str) -> list[tuple[str, str]]:
+    """
+    按 / 与 // 拆分步骤，谓词、引号和 {命名空间} 内的 / 不作为分隔符
+
+    Returns:
+        list[tuple[str, str]]: (轴, 步骤) 列表，轴为 child（/）或 descendant（//）
+
+    Raises:
+        ValueError: 引号或括号不匹配时
+    """
+    steps: list[tuple[str, str]] = []
+    axis, start, depth, quote = "child", 0, 0, None
+    index = 0
+    while index < len(expr):
+        char = expr[index]
+        if quote is not None:
+            if char == quote:
+                quote = None
+        elif char in "'\"":
+            quote = char
+        elif char in "[{":
+            depth += 1
+        elif char in "]}":
+            depth -= 1
+        elif char == "/" and depth == 0:
+            if index > start:
+                steps.append((axis, expr[start:index]))
+            if expr.startswith("//", index):
+                axis, index = "descendant", index + 2
+            else:
+                axis, index = "child", index + 1
+            start = index
+            continue
+        index += 1
+    if quote is not None or depth != 0:
+        raise ValueError(f"XPath表达式的引号或括号不匹配: {expr}")
+    if start < len(expr):
+        steps.append((axis, expr[start:]))
+    return steps
+
+
+@lru_cache(maxsize=1024)
+def compile_xpath(expression: str) -> XPathExpr:
+    """
+    编译XPath表达式
+
+    Args:
+        expression: XPath表达式，如 /Envelope/Body/Code、//Code、.//Item/@id、//Msg/text()
+
+    Returns:
+        XPathExpr: 编译后的表达式
+
+    Raises:
+        ValueError: 表达式为空或不合法时
+    """
+    expr = expression.strip()
+    if not expr:
+        raise ValueError("XPath表达式不能为空")
+
+    # 相对表达式以根节点为上下文，等价于在前面补充 /*
+    if expr.startswith("./"):
+        expr = "/*" + expr[1:]
+    elif expr == ".":
+        expr = "/*"
+    elif not expr.startswith("/"):
+        expr = "/*/" + expr
+
+    steps = _split_steps(expr)
+    attribute = None
+    if steps and steps[-1] == ("child", "text()"):
+        steps.pop()
+    elif steps and steps[-1][0] == "child" and steps[-1][1].startswith("@"):
+        attribute = steps.pop()[1][1:]
+    if not steps or attribute == "":
+        raise ValueError(f"XPath表达式不合法: {expression}")
+
+    streamable = all("[" not in name and name not in (".", "..") for _, name in steps)
+    return XPathExpr(expression, tuple(steps), attribute, streamable)
+
+
+def _name_matches(step: str, tag: str) -> bool:
+    if step == "*":
+        return True
+    if step.startswith("{*}"):
+        return _local_name(tag) == step[3:]
+    if step.startswith("{"):
+        return tag == step
+    return _local_name(tag) == step
+
+
+def _path_matches(steps: tuple[tuple[str, str], ...], tags: list[str]) -> bool:
+    """判断从根节点到当前节点的标签路径是否匹配表达式"""
+
+    def match(step_index: int, tag_index: int) -> bool:
+        axis, name = steps[step_index]
+        if not _name_matches(name, tags[tag_index]):
+            return False
+        if step_index == 0:
+            return tag_index == 0 if axis == "child" else True
+        if axis == "child":
+            return tag_index > 0 and match(step_index - 1, tag_index - 1)
+        return any(match(step_index - 1, index) for index in range(tag_index - 1, -1, -1))
+
+    return len(tags) >= len(steps) and match(len(steps) - 1, len(tags) - 1)
+
+
+def _value(element: ETree.Element, attribute: Optional[str]) -> Any:
+    if attribute is None:
+        return element.text
+    if ":" in attribute or attribute.startswith("{"):
+        return element.get(attribute)
+    value = element.get(attribute)
+    if value is None:
+        # 不带命名空间的属性名匹配任意命名空间下的同名属性
+        for key, candidate in element.attrib.items():
+            if _local_name(key) == attribute:
+                return candidate
+    return value
+
+
+def iter_xpath(root: ETree.Element, expression: str | XPathExpr) -> Iterator[Any]:
+    """
+    在已解析的XML树上按XPath迭代匹配值
+
+    Args:
+        root: XML根节点
+        expression: XPath表达式或编译后的表达式
+
+    Returns:
+        Iterator[Any]: 节点文本或属性值迭代器
+    """
+    expr = expression if isinstance(expression, XPathExpr) else compile_xpath(expression)
+    if expr.streamable:
+        # 与增量解析使用相同的匹配规则，结果按文档顺序且不重复
+        return (_value(element, expr.attribute) for element in _iter_matches(root, expr.steps))
+    axis, name = expr.steps[0]
+    if axis == "child":
+        if not _name_matches(name, root.tag):
+            return iter(())
+        elements = root.iterfind(expr.element_path) if len(expr.steps) > 1 else iter((root,))
+    else:
+        # 第一个步骤为 //name 时，根节点本身也可能匹配
+        path = ".//" + _any_namespace(name) + expr.element_path[1:]
+        elements = root.iterfind(path)
+        if _name_matches(name, root.tag):
+            elements = _prepend_root(root, expr, elements)
+    return (_value(element, expr.attribute) for element in elements)
+
+
+def _iter_matches(root: ETree.Element, steps: tuple[tuple[str, str], ...]) -> Iterator[ETree.Element]:
+    """按文档顺序（先序）遍历与步骤匹配的节点，只有 / 轴时不进入不可能匹配的子树"""
+    child_only = all(axis == "child" for axis, _ in steps)
+    tags: list[str] = []
+    stack = [(root, 0)]
+    while stack:
+        element, depth = stack.pop()
+        del tags[depth:]
+        tags.append(element.tag)
+        if _path_matches(steps, tags):
+            yield element
+        if child_only and (depth + 1 >= len(steps) or not _name_matches(steps[depth][1], element.tag)):
+            continue
+        stack.extend((child, depth + 1) for child in reversed(element))
+
+
+def _prepend_root(root: ETree.Element, expr: XPathExpr, elements: Iterator[ETree.Element]) -> Iterator[ETree.Element]:
+    if len(expr.steps) == 1:
+        yield root
+    else:
+        yield from root.iterfind(expr.element_path)
+    yield from elements
+
+
+def iter_xpath_stream(source: bytes | io.IOBase, expression: str | XPathExpr) -> Iterator[Any]:
+    """
+    使用iterparse增量解析XML并按XPath迭代匹配值
+
+    不会构建完整的XML树，已处理完的节点会被立即清理；
+    调用方拿到需要的值后停止迭代即可提前结束解析。
+
+    Args:
+        source: XML原始字节或二进制文件对象
+        expression: XPath表达式或编译后的表达式，不能包含谓词
+
+    Returns:
+        Iterator[Any]: 节点文本或属性值迭代器
+
+    Raises:
+        ValueError: 表达式不支持增量解析时
+        ETree.ParseError: XML格式错误时
+    """
+    expr = expression if isinstance(expression, XPathExpr) else compile_xpath(expression)
+    if not expr.streamable:
+        raise ValueError(f"XPath表达式不支持增量解析: {expr.expression}")
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+
+    logger.debug(f"开始增量解析XML，XPath: {expr.expression}")
+    tags: list[str] = []
+    # 按开始标签的顺序排队等待取值的匹配节点，与 iter_xpath 的文档顺序一致；
+    # 节点文本在结束标签时才完整，嵌套的匹配节点在外层节点结束前暂存
+    pending: deque[list[Any]] = deque()
+    slots: list[Optional[list[Any]]] = []
+    for event, element in ETree.iterparse(source, events=("start", "end")):
+        if event == "start":
+            tags.append(element.tag)
+            slot = None
+            if _path_matches(expr.steps, tags):
+                # 属性在开始标签中已经完整，不需要等待结束标签
+                done = expr.attribute is not None
+                slot = [_value(element, expr.attribute) if done else None, done]
+                pending.append(slot)
+            slots.append(slot)
+        else:
+            slot = slots.pop()
+            if slot is not None and not slot[1]:
+                slot[0], slot[1] = _value(element, expr.attribute), True
+            tags.pop()
+            element.clear()
+        while pending and pending[0][1]:
+            yield pending.popleft()[0]